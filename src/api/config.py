@@ -3,10 +3,12 @@ Configuration management using Pydantic Settings.
 Loads configuration from environment variables with validation.
 """
 
-from functools import lru_cache
+import logging
+from functools import cached_property, lru_cache
+from types import SimpleNamespace
 from typing import List, Optional
 
-from pydantic import Field, field_validator
+from pydantic import Field, computed_field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
 
@@ -43,6 +45,9 @@ class Settings(BaseSettings):
     db_pool_size: int = Field(default=20, description="Database pool size")
     db_max_overflow: int = Field(default=40, description="Max pool overflow")
     db_pool_timeout: int = Field(default=30, description="Pool timeout in seconds")
+    db_pool_prewarm: int = Field(default=5, description="Connections opened at startup (0 disables)")
+    db_pool_recycle: int = Field(default=1800, description="Seconds before a pooled connection is replaced")
+    db_statement_cache_size: int = Field(default=500, description="Prepared statements cached per connection (asyncpg)")
 
     # MongoDB
     mongodb_url: str = Field(
@@ -89,7 +94,18 @@ class Settings(BaseSettings):
     cache_ttl_product: int = Field(default=86400, description="Product cache TTL")
     cache_ttl_search: int = Field(default=3600, description="Search cache TTL")
     cache_ttl_intelligence: int = Field(default=21600, description="Intelligence cache TTL")
+    cache_ttl_reference: int = Field(default=3600, description="Reference data query cache TTL")
+    cache_ttl_live: int = Field(default=30, description="Live FSA establishment lookup cache TTL")
+    cache_ttl_metadata: int = Field(default=86400, description="Reference metadata (distinct values) cache TTL")
     cache_max_size_mb: int = Field(default=500, description="Max cache size in MB")
+    product_views_refresh_interval: int = Field(
+        default=600,
+        description="Seconds between product summary view refreshes (0 disables)"
+    )
+    establishment_views_refresh_interval: int = Field(
+        default=86400,
+        description="Seconds between postcode statistics view refreshes (0 disables)"
+    )
 
     # Security
     secret_key: str = Field(
@@ -123,6 +139,12 @@ class Settings(BaseSettings):
     max_concurrent_requests: int = Field(default=50, description="Max concurrent requests")
     request_timeout: int = Field(default=30, description="Request timeout in seconds")
     query_timeout: int = Field(default=5, description="Query timeout in seconds")
+    enable_gzip: bool = Field(
+        default=False,
+        description="Compress responses in-app (leave off behind a compressing proxy)"
+    )
+    gzip_minimum_size: int = Field(default=4096, description="Minimum response size to gzip")
+    gzip_compresslevel: int = Field(default=1, description="GZip compression level (1-9)")
 
     # Monitoring
     enable_metrics: bool = Field(default=True, description="Enable metrics collection")
@@ -193,6 +215,18 @@ class Settings(BaseSettings):
         """Get async database URL for SQLAlchemy."""
         return self.database_url.replace("postgresql://", "postgresql+asyncpg://")
 
+    @computed_field
+    @cached_property
+    def log_level_int(self) -> int:
+        """Get numeric logging level."""
+        return logging.getLevelName(self.log_level.upper())
+
+    @computed_field
+    @cached_property
+    def log_level_lower(self) -> str:
+        """Get lowercase logging level (uvicorn format)."""
+        return self.log_level.lower()
+
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -204,4 +238,9 @@ def get_settings() -> Settings:
 
 
 # Export settings instance
-settings = get_settings()
\ No newline at end of file
+settings = get_settings()
+
+# Plain-attribute snapshot of the settings for hot paths (middleware,
+# per-request handlers, client construction). Keep using `settings` for
+# properties and anything that needs validation.
+settings_fast = SimpleNamespace(**settings.model_dump())
\ No newline at end of file
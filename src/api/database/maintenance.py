@@ -0,0 +1,34 @@
+"""
+Off-peak database maintenance, run from cron next to the ETL jobs
+(not exposed over HTTP, as it locks tables while it works):
+
+    cd src && python -m api.database.maintenance
+"""
+
+import asyncio
+import logging
+import time
+
+from api.database.session import cluster_establishments, engine
+
+logger = logging.getLogger(__name__)
+
+
+async def run_maintenance():
+    """Cluster the establishments table by postcode area and refresh its statistics."""
+    try:
+        start_time = time.perf_counter()
+        if await cluster_establishments():
+            logger.info(f"Clustered establishments in {time.perf_counter() - start_time:.1f}s")
+        else:
+            logger.info("Skipping clustering: not a PostgreSQL database")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    )
+    asyncio.run(run_maintenance())
@@ -1,24 +1,50 @@
 """
 Redis client for caching.
-Provides connection management and caching utilities.
+Provides async connection management and caching utilities.
 """
 
-import json
 import logging
-from typing import Any, Optional
-from urllib.parse import urlparse
+import time
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
-import redis
-from redis.connection import ConnectionPool
+import orjson
+import redis.asyncio as redis
+from redis.asyncio import ConnectionPool
 
-from api.config import settings
+from api.config import settings_fast
 
 logger = logging.getLogger(__name__)
 
+# How long get_stats() results are reused before querying INFO again
+STATS_CACHE_TTL = 5.0
+
+# Serialized values at least this large are stored zlib-compressed behind
+# a NUL marker byte (JSON text never starts with NUL, so plain entries
+# written before compression still decode)
+COMPRESS_MIN_BYTES = 1024
+COMPRESSED_MARKER = b"\x00"
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a value for Redis, compressing large payloads."""
+    serialized = orjson.dumps(value)
+    if len(serialized) >= COMPRESS_MIN_BYTES:
+        return COMPRESSED_MARKER + zlib.compress(serialized, 1)
+    return serialized
+
+
+def _loads(raw: bytes) -> Any:
+    """Inverse of _dumps."""
+    if raw[:1] == COMPRESSED_MARKER:
+        raw = zlib.decompress(raw[1:])
+    return orjson.loads(raw)
+
 
 class RedisClient:
     """
-    Redis client wrapper with caching utilities.
+    Async Redis client wrapper with caching utilities.
     """
 
     def __init__(
@@ -37,34 +63,35 @@ class RedisClient:
             socket_timeout: Socket timeout in seconds (default from settings)
             socket_connect_timeout: Socket connect timeout (default from settings)
         """
-        self.url = url or settings.redis_url
-        self.max_connections = max_connections or settings.redis_max_connections
-        self.socket_timeout = socket_timeout or settings.redis_socket_timeout
+        self.url = url or settings_fast.redis_url
+        self.max_connections = max_connections or settings_fast.redis_max_connections
+        self.socket_timeout = socket_timeout or settings_fast.redis_socket_timeout
         self.socket_connect_timeout = (
-            socket_connect_timeout or settings.redis_socket_connect_timeout
+            socket_connect_timeout or settings_fast.redis_socket_connect_timeout
         )
         
-        # Parse Redis URL
-        parsed = urlparse(self.url)
-        
-        # Create connection pool
-        self.pool = ConnectionPool(
-            host=parsed.hostname or "localhost",
-            port=parsed.port or 6379,
-            db=int(parsed.path[1:]) if parsed.path else 0,
-            password=parsed.password,
+        # Create connection pool; from_url handles every scheme
+        # (redis://, rediss://, unix://) including username/password
+        self.pool = ConnectionPool.from_url(
+            self.url,
             max_connections=self.max_connections,
             socket_timeout=self.socket_timeout,
             socket_connect_timeout=self.socket_connect_timeout,
-            decode_responses=True,  # Decode bytes to strings
+            decode_responses=False,
         )
         
         # Create Redis client
         self.client = redis.Redis(connection_pool=self.pool)
+
+        # (expires_at, stats) memo for get_stats()
+        self._stats_cache: Optional[Tuple[float, dict]] = None
         
-        logger.info(f"Redis client initialized: {parsed.hostname}:{parsed.port}")
+        conn_kwargs = self.pool.connection_kwargs
+        logger.info(
+            f"Redis client initialized: {conn_kwargs.get('host')}:{conn_kwargs.get('port')}"
+        )
 
-    def get(self, key: str) -> Optional[Any]:
+    async def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache.
         
@@ -75,18 +102,18 @@ class RedisClient:
             Cached value or None if not found
         """
         try:
-            value = self.client.get(key)
+            value = await self.client.get(key)
             if value:
-                return json.loads(value)
+                return _loads(value)
             return None
         except redis.RedisError as e:
             logger.error(f"Redis GET error for key {key}: {str(e)}")
             return None
-        except json.JSONDecodeError as e:
+        except (orjson.JSONDecodeError, zlib.error) as e:
             logger.error(f"JSON decode error for key {key}: {str(e)}")
             return None
 
-    def set(
+    async def set(
         self,
         key: str,
         value: Any,
@@ -97,26 +124,145 @@ class RedisClient:
         
         Args:
             key: Cache key
-            value: Value to cache (will be JSON serialized)
+            value: Value to cache (JSON serialized; compressed if large)
             ttl: Time to live in seconds (optional)
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            serialized = json.dumps(value)
+            serialized = _dumps(value)
             if ttl:
-                return self.client.setex(key, ttl, serialized)
+                return await self.client.setex(key, ttl, serialized)
             else:
-                return self.client.set(key, serialized)
+                return await self.client.set(key, serialized)
         except redis.RedisError as e:
             logger.error(f"Redis SET error for key {key}: {str(e)}")
             return False
-        except (TypeError, ValueError) as e:
+        except orjson.JSONEncodeError as e:
             logger.error(f"JSON encode error for key {key}: {str(e)}")
             return False
 
-    def delete(self, key: str) -> bool:
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get multiple values from cache in a single round trip.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Cached values in the same order as keys (None for misses)
+        """
+        if not keys:
+            return []
+        try:
+            values = await self.client.mget(keys)
+        except redis.RedisError as e:
+            logger.error(f"Redis MGET error for {len(keys)} keys: {str(e)}")
+            return [None] * len(keys)
+
+        results = []
+        for key, value in zip(keys, values):
+            try:
+                results.append(_loads(value) if value else None)
+            except (orjson.JSONDecodeError, zlib.error) as e:
+                logger.error(f"JSON decode error for key {key}: {str(e)}")
+                results.append(None)
+        return results
+
+    async def mset(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> bool:
+        """
+        Set multiple values in cache in a single round trip.
+        
+        Args:
+            mapping: Cache key to value (JSON serialized; compressed if large)
+            ttl: Time to live in seconds applied to every key (optional)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not mapping:
+            return True
+        try:
+            async with self.pipeline() as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, _dumps(value), ex=ttl)
+                await pipe.execute()
+            return True
+        except redis.RedisError as e:
+            logger.error(f"Redis MSET error for {len(mapping)} keys: {str(e)}")
+            return False
+        except orjson.JSONEncodeError as e:
+            logger.error(f"JSON encode error in MSET: {str(e)}")
+            return False
+
+    async def mdelete(self, keys: List[str]) -> int:
+        """
+        Delete multiple keys from cache in a single round trip.
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Number of keys deleted
+        """
+        if not keys:
+            return 0
+        try:
+            return await self.client.delete(*keys)
+        except redis.RedisError as e:
+            logger.error(f"Redis DELETE error for {len(keys)} keys: {str(e)}")
+            return 0
+
+    async def delete_pattern(self, pattern: str, batch_size: int = 500) -> int:
+        """
+        Delete every key matching a glob pattern.
+        
+        Keys are found with SCAN (never KEYS, which blocks the server) and
+        removed with UNLINK in batches, so large namespaces are freed in
+        the background.
+        
+        Args:
+            pattern: Glob pattern, e.g. "food_balance:unique_*"
+            batch_size: Keys per SCAN page and per UNLINK call
+            
+        Returns:
+            Number of keys deleted
+        """
+        deleted = 0
+        batch: List[bytes] = []
+        try:
+            async for key in self.client.scan_iter(match=pattern, count=batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    deleted += await self.client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.client.unlink(*batch)
+        except redis.RedisError as e:
+            logger.error(f"Redis UNLINK error for pattern {pattern}: {str(e)}")
+        return deleted
+
+    def pipeline(self, transaction: bool = False):
+        """
+        Create a pipeline to batch several commands into one round trip.
+        
+        Commands queued on the pipeline take raw (already serialized)
+        values; use it as an async context manager and await execute().
+        
+        Args:
+            transaction: Wrap queued commands in MULTI/EXEC
+            
+        Returns:
+            Redis pipeline
+        """
+        return self.client.pipeline(transaction=transaction)
+
+    async def delete(self, key: str) -> bool:
         """
         Delete key from cache.
         
@@ -127,12 +273,12 @@ class RedisClient:
             True if deleted, False otherwise
         """
         try:
-            return bool(self.client.delete(key))
+            return bool(await self.client.delete(key))
         except redis.RedisError as e:
             logger.error(f"Redis DELETE error for key {key}: {str(e)}")
             return False
 
-    def exists(self, key: str) -> bool:
+    async def exists(self, key: str) -> bool:
         """
         Check if key exists in cache.
         
@@ -143,12 +289,12 @@ class RedisClient:
             True if exists, False otherwise
         """
         try:
-            return bool(self.client.exists(key))
+            return bool(await self.client.exists(key))
         except redis.RedisError as e:
             logger.error(f"Redis EXISTS error for key {key}: {str(e)}")
             return False
 
-    def ttl(self, key: str) -> int:
+    async def ttl(self, key: str) -> int:
         """
         Get remaining time to live for key.
         
@@ -159,12 +305,12 @@ class RedisClient:
             Seconds until expiry, -1 if no expiry, -2 if doesn't exist
         """
         try:
-            return self.client.ttl(key)
+            return await self.client.ttl(key)
         except redis.RedisError as e:
             logger.error(f"Redis TTL error for key {key}: {str(e)}")
             return -2
 
-    def flush(self) -> bool:
+    async def flush(self) -> bool:
         """
         Flush all keys in current database.
         WARNING: This deletes all cached data!
@@ -174,37 +320,52 @@ class RedisClient:
         """
         try:
             logger.warning("Flushing all Redis keys in current database")
-            return self.client.flushdb()
+            return await self.client.flushdb()
         except redis.RedisError as e:
             logger.error(f"Redis FLUSHDB error: {str(e)}")
             return False
 
-    def get_stats(self) -> dict:
+    async def get_stats(self) -> dict:
         """
         Get Redis statistics.
         
+        Only the stats, clients and memory INFO sections are requested, in a
+        single pipelined round trip, and the result is reused for
+        STATS_CACHE_TTL seconds so bursts of admin/status calls share it.
+        
         Returns:
             Dictionary with Redis stats
         """
+        now = time.monotonic()
+        if self._stats_cache and self._stats_cache[0] > now:
+            return self._stats_cache[1]
+
         try:
-            info = self.client.info()
-            return {
-                "connected_clients": info.get("connected_clients", 0),
-                "used_memory_human": info.get("used_memory_human", "0B"),
-                "total_connections_received": info.get("total_connections_received", 0),
-                "total_commands_processed": info.get("total_commands_processed", 0),
-                "keyspace_hits": info.get("keyspace_hits", 0),
-                "keyspace_misses": info.get("keyspace_misses", 0),
-                "hit_rate": self._calculate_hit_rate(
-                    info.get("keyspace_hits", 0),
-                    info.get("keyspace_misses", 0),
-                ),
-            }
+            async with self.pipeline() as pipe:
+                pipe.info("stats")
+                pipe.info("clients")
+                pipe.info("memory")
+                stats_info, clients_info, memory_info = await pipe.execute()
         except redis.RedisError as e:
             logger.error(f"Redis INFO error: {str(e)}")
             return {}
 
-    def check_connection(self) -> bool:
+        stats = {
+            "connected_clients": clients_info.get("connected_clients", 0),
+            "used_memory_human": memory_info.get("used_memory_human", "0B"),
+            "total_connections_received": stats_info.get("total_connections_received", 0),
+            "total_commands_processed": stats_info.get("total_commands_processed", 0),
+            "keyspace_hits": stats_info.get("keyspace_hits", 0),
+            "keyspace_misses": stats_info.get("keyspace_misses", 0),
+            "hit_rate": self._calculate_hit_rate(
+                stats_info.get("keyspace_hits", 0),
+                stats_info.get("keyspace_misses", 0),
+            ),
+        }
+        self._stats_cache = (now + STATS_CACHE_TTL, stats)
+        return stats
+
+    async def check_connection(self) -> bool:
         """
         Check if Redis connection is working.
         
@@ -212,7 +373,7 @@ class RedisClient:
             True if connected, False otherwise
         """
         try:
-            self.client.ping()
+            await self.client.ping()
             logger.info("Redis connection OK")
             return True
         except redis.RedisError as e:
@@ -225,16 +386,14 @@ class RedisClient:
         total = hits + misses
         return (hits / total * 100) if total > 0 else 0.0
 
-    def close(self):
-        """Close Redis connection pool."""
-        self.pool.disconnect()
+    async def close(self):
+        """Close Redis client and its connection pool."""
+        await self.client.aclose()
+        await self.pool.aclose()
         logger.info("Redis connection pool closed")
 
 
-# Singleton instance
-_redis_client: Optional[RedisClient] = None
-
-
+@lru_cache(maxsize=1)
 def get_redis_client() -> RedisClient:
     """
     Get singleton Redis client instance.
@@ -242,19 +401,22 @@ def get_redis_client() -> RedisClient:
     Returns:
         Redis client instance
     """
-    global _redis_client
-    if _redis_client is None:
-        _redis_client = RedisClient()
-    return _redis_client
+    return RedisClient()
 
 
-def get_redis() -> RedisClient:
+async def get_redis() -> RedisClient:
     """
     Dependency injection for Redis client.
     
     Usage:
         @app.get("/items")
-        def read_items(redis: RedisClient = Depends(get_redis)):
-            return redis.get("items")
+        async def read_items(redis: RedisClient = Depends(get_redis)):
+            return await redis.get("items")
+
+    When a request touches several keys, batch them instead of issuing
+    one round trip per key:
+        values = await redis.mget(["items:1", "items:2"])
+        await redis.mset({"items:1": a, "items:2": b}, ttl=300)
+        await redis.mdelete(["items:1", "items:2"])
     """
     return get_redis_client()
\ No newline at end of file
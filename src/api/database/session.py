@@ -1,143 +1,322 @@
 """
-PostgreSQL database session management using SQLAlchemy.
+PostgreSQL database session management using async SQLAlchemy (asyncpg).
 Provides database connection, session creation, and dependency injection.
 """
 
+import asyncio
 import logging
-from contextlib import contextmanager
-from typing import Generator
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncGenerator, Dict
 
-from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from api.config import settings
-from core.models.establishment import Base as EstablishmentBase
-from core.models.product_eco import Base as ProductEcoBase
+from core.models.establishment import Base as EstablishmentBase, ESTABLISHMENT_TRGM_INDEXES, ESTABLISHMENT_VIEWS
+from core.models.food import Base as FoodBase, DIMS_VIEWS, FOOD_TRGM_INDEXES
+from core.models.nutrition import Base as NutritionBase, NUTRITION_TRGM_INDEXES
+from core.models.product_eco import Base as ProductEcoBase, PRODUCT_TRGM_INDEXES, PRODUCT_VIEWS
 
 logger = logging.getLogger(__name__)
 
 
-# Create database engine with connection pooling
-engine = create_engine(
-    settings.database_url,
-    poolclass=QueuePool,
+# Create async database engine with connection pooling
+engine = create_async_engine(
+    settings.database_url_async,
     pool_size=settings.db_pool_size,
     max_overflow=settings.db_max_overflow,
     pool_timeout=settings.db_pool_timeout,
     pool_pre_ping=True,  # Test connections before using
+    # Replace connections before server/proxy idle timeouts drop them
+    pool_recycle=settings.db_pool_recycle,
+    # Reuse the most recently returned connection, so at low load a small
+    # warm set serves requests and the surplus ages out via recycle
+    pool_use_lifo=True,
     echo=settings.debug,  # Log SQL in debug mode
+    # Session parameters are sent in the startup packet, so no extra
+    # round trip is needed per new pooled connection. Filter values are
+    # always bound parameters, so each query shape is prepared once per
+    # connection and reused from the statement cache.
+    connect_args={
+        "server_settings": {"timezone": "UTC"},
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+    },
 )
 
-# Create session factory
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
+# Create session factory. expire_on_commit=False keeps loaded attributes
+# usable after commit without an implicit (and, under asyncio, illegal)
+# lazy refresh.
+SessionLocal = async_sessionmaker(
     bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
 )
 
 
-# Event listeners for connection management
-@event.listens_for(engine, "connect")
-def set_postgres_pragma(dbapi_connection, connection_record):
-    """Set PostgreSQL session parameters on connection."""
-    cursor = dbapi_connection.cursor()
-    cursor.execute("SET timezone='UTC'")
-    cursor.close()
-
-
-def init_db():
+async def init_db():
     """
     Initialize database schema.
     Creates all tables if they don't exist.
     """
     try:
         logger.info("Initializing database schema...")
-        
+
         # Import all models to ensure they're registered
         from core.models.establishment import Establishment
         from core.models.product_eco import ProductEco
-        
+
+        # Trigram indexes on search columns need pg_trgm; creating it
+        # requires privileges, so failure is logged and those indexes are
+        # skipped (see _create_trigram_indexes)
+        if engine.dialect.name == "postgresql":
+            try:
+                async with engine.begin() as conn:
+                    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            except Exception as e:
+                logger.warning(f"Could not create pg_trgm extension: {str(e)}")
+
         # Create all tables
-        EstablishmentBase.metadata.create_all(bind=engine)
-        ProductEcoBase.metadata.create_all(bind=engine)
-        
+        async with engine.begin() as conn:
+            await conn.run_sync(EstablishmentBase.metadata.create_all)
+            await conn.run_sync(ProductEcoBase.metadata.create_all)
+            # create_all skips existing tables; add any columns and
+            # indexes declared since (indexes also on the ETL-managed
+            # reference tables)
+            await conn.run_sync(_add_missing_columns)
+            await conn.run_sync(_create_missing_indexes)
+            if engine.dialect.name == "postgresql":
+                await conn.run_sync(_create_trigram_indexes)
+                await conn.run_sync(_create_dims_views)
+
         logger.info("Database schema initialized successfully")
-        
+
     except Exception as e:
         logger.error(f"Failed to initialize database: {str(e)}")
         raise
 
 
-def drop_db():
+def _add_missing_columns(sync_conn):
+    """Add declared columns that are missing on already existing app tables."""
+    tables = [
+        *EstablishmentBase.metadata.sorted_tables,
+        *ProductEcoBase.metadata.sorted_tables,
+    ]
+    db_inspector = inspect(sync_conn)
+    preparer = sync_conn.dialect.identifier_preparer
+    for table in tables:
+        if not db_inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in db_inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            logger.info(f"Adding column {table.name}.{column.name}")
+            column_ddl = CreateColumn(column).compile(dialect=sync_conn.dialect)
+            sync_conn.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {column_ddl}"))
+
+
+def _create_missing_indexes(sync_conn):
+    """Create declared indexes that are missing on already existing tables."""
+    tables = [
+        *EstablishmentBase.metadata.sorted_tables,
+        *ProductEcoBase.metadata.sorted_tables,
+        *FoodBase.metadata.sorted_tables,
+        *NutritionBase.metadata.sorted_tables,
+    ]
+    db_inspector = inspect(sync_conn)
+    for table in tables:
+        if not db_inspector.has_table(table.name):
+            continue
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
+def _create_trigram_indexes(sync_conn):
+    """Create the GIN trigram indexes on existing tables if pg_trgm is installed."""
+    installed = sync_conn.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    ).first()
+    if not installed:
+        logger.warning("pg_trgm is not installed; skipping trigram indexes")
+        return
+    db_inspector = inspect(sync_conn)
+    indexes = {
+        **ESTABLISHMENT_TRGM_INDEXES,
+        **PRODUCT_TRGM_INDEXES,
+        **FOOD_TRGM_INDEXES,
+        **NUTRITION_TRGM_INDEXES,
+    }
+    for index_name, (table_name, column_name) in indexes.items():
+        if not db_inspector.has_table(table_name):
+            continue
+        sync_conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS {index_name} "
+            f"ON {table_name} USING gin ({column_name} gin_trgm_ops)"
+        ))
+
+
+def _create_dims_views(sync_conn):
+    """Create the dimension and summary views whose source tables exist."""
+    db_inspector = inspect(sync_conn)
+    for view_name, (source_table, statements) in {**DIMS_VIEWS, **PRODUCT_VIEWS, **ESTABLISHMENT_VIEWS}.items():
+        if not db_inspector.has_table(source_table):
+            logger.info(f"Skipping {view_name}: table {source_table} does not exist yet")
+            continue
+        for statement in statements:
+            sync_conn.execute(text(statement))
+
+
+async def refresh_views(views: Dict[str, Any]):
+    """
+    Refresh summary views over app-written tables (PostgreSQL only).
+
+    Args:
+        views: View registry such as PRODUCT_VIEWS or ESTABLISHMENT_VIEWS
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    async with engine.begin() as conn:
+        for view_name in views:
+            await conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view_name}"))
+
+
+async def refresh_views_forever(views: Dict[str, Any], interval: int):
+    """
+    Refresh summary views every interval seconds until cancelled.
+
+    Args:
+        views: View registry such as PRODUCT_VIEWS or ESTABLISHMENT_VIEWS
+        interval: Seconds between refreshes
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await refresh_views(views)
+        except Exception as e:
+            logger.error(f"Failed to refresh views {', '.join(views)}: {str(e)}")
+
+
+async def cluster_establishments() -> bool:
+    """
+    Rewrite establishments in postcode-area order (PostgreSQL only).
+
+    Rows arrive in whatever order the FSA API returned them, so an area's
+    establishments end up scattered across the heap. Clustering on the
+    postcode prefix index stores them on adjacent pages, so postcode and
+    nearby lookups touch far fewer pages. The order decays as rows are
+    upserted, so it should be re-run periodically (nightly, via
+    api.database.maintenance). CLUSTER holds an ACCESS EXCLUSIVE lock
+    while it rewrites the table.
+
+    Returns:
+        True if the table was clustered, False if not on PostgreSQL
+    """
+    if engine.dialect.name != "postgresql":
+        return False
+    async with engine.begin() as conn:
+        await conn.execute(text("CLUSTER establishments USING idx_establishments_postcode_prefix"))
+        await conn.execute(text("ANALYZE establishments"))
+    return True
+
+
+async def drop_db():
     """
     Drop all database tables.
     WARNING: This will delete all data!
     """
     logger.warning("Dropping all database tables...")
-    EstablishmentBase.metadata.drop_all(bind=engine)
-    ProductEcoBase.metadata.drop_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(EstablishmentBase.metadata.drop_all)
+        await conn.run_sync(ProductEcoBase.metadata.drop_all)
     logger.info("All database tables dropped")
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency injection for database sessions.
-    
+
     Yields:
-        Database session
-        
+        Async database session
+
     Usage:
         @app.get("/items")
-        def read_items(db: Session = Depends(get_db)):
-            return db.query(Item).all()
+        async def read_items(db: AsyncSession = Depends(get_db)):
+            return (await db.scalars(select(Item))).all()
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-@contextmanager
-def get_db_context():
+@asynccontextmanager
+async def get_db_context():
     """
-    Context manager for database sessions.
-    
+    Async context manager for database sessions.
+
     Yields:
-        Database session
-        
+        Async database session
+
     Usage:
-        with get_db_context() as db:
-            db.query(Item).all()
+        async with get_db_context() as db:
+            (await db.scalars(select(Item))).all()
     """
-    db = SessionLocal()
-    try:
-        yield db
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    async with SessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
 
 
-def check_connection() -> bool:
+async def check_connection() -> bool:
     """Check if database connection is alive."""
     try:
-        from sqlalchemy import text
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))  # ✅ Fixed!
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         return True
     except Exception as e:
         logger.error(f"Database connection failed: {str(e)}")
         return False
 
 
+async def prewarm_pool(connections: int) -> int:
+    """
+    Open pooled connections up front.
+
+    The connections are held at the same time so the pool really opens
+    that many, then all are returned; the first requests after startup
+    then skip the TCP, TLS and authentication handshake.
+
+    Args:
+        connections: Number of connections to open (capped at the pool size)
+
+    Returns:
+        Number of connections opened
+    """
+    connections = min(connections, settings.db_pool_size)
+    if connections <= 0:
+        return 0
+    async with AsyncExitStack() as stack:
+        # return_exceptions: every attempt settles before the stack closes
+        results = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections)),
+            return_exceptions=True,
+        )
+    return sum(1 for result in results if not isinstance(result, BaseException))
+
+
+async def close_db():
+    """Dispose of the engine and close all pooled connections."""
+    await engine.dispose()
+    logger.info("Database connection pool closed")
+
+
 def get_db_stats() -> dict:
     """
     Get database connection pool statistics.
-    
+
     Returns:
         Dictionary with pool stats
     """
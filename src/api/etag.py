@@ -0,0 +1,51 @@
+"""
+Conditional GET support for rarely changing resources.
+A weak ETag is derived from the response data; a client that sends it
+back in If-None-Match gets an empty 304 instead of the payload.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+import orjson
+from fastapi import Request, Response
+
+
+def compute_etag(data: Any) -> str:
+    """
+    Build a weak ETag from a hash of JSON-serializable data.
+
+    Args:
+        data: Response data (without per-request fields such as timings)
+
+    Returns:
+        ETag header value
+    """
+    digest = hashlib.blake2b(
+        orjson.dumps(data, option=orjson.OPT_SORT_KEYS), digest_size=8
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def check_etag(request: Request, response: Response, data: Any) -> Optional[Response]:
+    """
+    Tag a response with the ETag of its data and honour If-None-Match.
+
+    Args:
+        request: Incoming request
+        response: Response the route will return (receives the header)
+        data: Data the ETag is computed from
+
+    Returns:
+        A 304 response if the client already has this version, else None
+    """
+    etag = compute_etag(data)
+    response.headers["ETag"] = etag
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Weak comparison: W/"x" and "x" name the same version
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in tags or etag.removeprefix("W/") in tags:
+            return Response(status_code=304, headers={"ETag": etag})
+    return None
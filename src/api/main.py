@@ -3,29 +3,60 @@ Main FastAPI application.
 Initializes the API with all routes, middleware, and configuration.
 """
 
+import asyncio
 import logging
+import sys
 import time
 from contextlib import asynccontextmanager
-from typing import Any
+from datetime import datetime, timezone
+from typing import Any, Optional, Tuple
 
-from fastapi import FastAPI, Request, status
+import orjson
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from api.config import settings
-from api.database.session import check_connection as check_postgres, init_db
+from api.config import settings, settings_fast
+from api.database.session import (
+    check_connection as check_postgres,
+    close_db,
+    init_db,
+    prewarm_pool,
+    refresh_views_forever,
+)
 from api.database.redis_client import get_redis_client
-
-# Configure logging
+from api.middleware import RequestLoggingMiddleware
+from collectors.external_apis.fsa_client import get_fsa_client
+from collectors.external_apis.off_client import get_off_client
+from core.models.establishment import ESTABLISHMENT_VIEWS
+from core.models.product_eco import PRODUCT_VIEWS
+
+# Configure logging. Process/thread bookkeeping is never formatted, so
+# skip collecting it for every record.
+logging.logProcesses = False
+logging.logThreads = False
+logging.logMultiprocessing = False
 logging.basicConfig(
-    level=getattr(logging, settings.log_level),
+    level=settings_fast.log_level_int,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
 )
 logger = logging.getLogger(__name__)
 
+# API paths, resolved once at import time
+API = settings_fast.api_prefix
+OPENAPI_URL = f"{API}/openapi.json"
+DOCS_PATH = f"{API}/docs"
+STATUS_PATH = f"{API}/status"
+
+# /status results are reused for this many seconds so frequent health
+# probes share one round of backend checks
+STATUS_CACHE_TTL = 2.0
+_status_cache: Optional[Tuple[float, dict]] = None
+_status_lock = asyncio.Lock()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -37,20 +68,44 @@ async def lifespan(app: FastAPI):
     
     # Initialize database
     try:
-        init_db()
+        await init_db()
         logger.info("Database initialized")
     except Exception as e:
         logger.error(f"Failed to initialize database: {str(e)}")
     
-    # Check connections
-    postgres_ok = check_postgres()
+    # Check connections concurrently
     redis_client = get_redis_client()
-    redis_ok = redis_client.check_connection()
+    postgres_ok, redis_ok, fsa_ok, off_ok = await asyncio.gather(
+        check_postgres(),
+        redis_client.check_connection(),
+        asyncio.to_thread(_fsa_probe),
+        asyncio.to_thread(_off_probe),
+    )
     
     if not postgres_ok:
         logger.warning("PostgreSQL connection failed")
+    else:
+        try:
+            opened = await prewarm_pool(settings.db_pool_prewarm)
+            logger.info(f"Database pool prewarmed with {opened} connections")
+        except Exception as e:
+            logger.warning(f"Database pool prewarm failed: {str(e)}")
     if not redis_ok:
         logger.warning("Redis connection failed")
+    if not fsa_ok:
+        logger.warning("FSA API client unavailable")
+    if not off_ok:
+        logger.warning("OFF API client unavailable")
+    
+    # Keep the summary views current
+    refresh_tasks = [
+        asyncio.create_task(refresh_views_forever(views, interval))
+        for views, interval in (
+            (PRODUCT_VIEWS, settings.product_views_refresh_interval),
+            (ESTABLISHMENT_VIEWS, settings.establishment_views_refresh_interval),
+        )
+        if interval > 0
+    ]
     
     logger.info("Application startup complete")
     
@@ -58,7 +113,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down EcoAPI application...")
-    redis_client.close()
+    for task in refresh_tasks:
+        task.cancel()
+    await redis_client.close()
+    await get_fsa_client().aclose()
+    await get_off_client().aclose()
+    await close_db()
     logger.info("Application shutdown complete")
 
 
@@ -78,7 +138,8 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url="/docs" if settings.show_docs else None,
     redoc_url="/redoc" if settings.show_redoc else None,
-    openapi_url=f"{settings.api_prefix}/openapi.json",
+    openapi_url=OPENAPI_URL,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -95,34 +156,19 @@ app.add_middleware(
     allow_headers=settings.cors_allow_headers,
 )
 
-# GZip Compression
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# GZip Compression (usually done by the TLS-terminating proxy instead).
+# Responses that already carry a Content-Encoding are passed through.
+if settings_fast.enable_gzip:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings_fast.gzip_minimum_size,
+        compresslevel=settings_fast.gzip_compresslevel,
+    )
 
 
-# Request Logging Middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all requests with timing information."""
-    start_time = time.time()
-    
-    # Log request
-    logger.info(f"Request: {request.method} {request.url.path}")
-    
-    # Process request
-    response = await call_next(request)
-    
-    # Calculate processing time
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    
-    # Log response
-    logger.info(
-        f"Response: {request.method} {request.url.path} "
-        f"- Status: {response.status_code} "
-        f"- Time: {process_time:.3f}s"
-    )
-    
-    return response
+# Request Logging Middleware (not registered at all when disabled)
+if settings_fast.enable_request_logging:
+    app.add_middleware(RequestLoggingMiddleware)
 
 
 # ============================================================================
@@ -132,7 +178,7 @@ async def log_requests(request: Request, call_next):
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle HTTP exceptions."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -147,10 +193,14 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    """Handle request validation errors."""
-    return JSONResponse(
-        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content={
+    """
+    Handle request validation errors.
+    
+    The error list is encoded with orjson in one pass; default=str covers
+    non-JSON values such as exceptions carried in an error's ctx.
+    """
+    content = orjson.dumps(
+        {
             "success": False,
             "error": {
                 "code": 422,
@@ -159,6 +209,12 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
                 "details": exc.errors(),
             },
         },
+        default=str,
+    )
+    return Response(
+        content=content,
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        media_type="application/json",
     )
 
 
@@ -166,7 +222,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle all other exceptions."""
     logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "success": False,
@@ -189,11 +245,11 @@ async def root() -> dict[str, Any]:
     Root endpoint with API information.
     """
     return {
-        "name": settings.app_name,
-        "version": settings.app_version,
-        "environment": settings.environment,
-        "docs": f"{settings.api_prefix}/docs" if settings.show_docs else None,
-        "status": f"{settings.api_prefix}/status",
+        "name": settings_fast.app_name,
+        "version": settings_fast.app_version,
+        "environment": settings_fast.environment,
+        "docs": DOCS_PATH if settings_fast.show_docs else None,
+        "status": STATUS_PATH,
     }
 
 
@@ -205,7 +261,7 @@ async def health_check() -> dict[str, str]:
     return {"status": "healthy"}
 
 
-@app.get(f"{settings.api_prefix}/status", tags=["Admin"])
+@app.get(STATUS_PATH, tags=["Admin"])
 async def get_status() -> dict[str, Any]:
     """
     Comprehensive system status check.
@@ -214,45 +270,62 @@ async def get_status() -> dict[str, Any]:
     - Database connections
     - External API availability
     - Cache status
-    """
-    from datetime import datetime
-    
-    # Check database connections
-    postgres_ok = check_postgres()
-    redis_client = get_redis_client()
-    redis_ok = redis_client.check_connection()
-    
-    # Check external APIs (simple check)
-    from collectors.external_apis.fsa_client import get_fsa_client
-    from collectors.external_apis.off_client import get_off_client
-    
-    fsa_ok = True
-    off_ok = True
     
+    Results are memoized for STATUS_CACHE_TTL seconds.
+    """
+    global _status_cache
+
+    if _status_cache and time.monotonic() - _status_cache[0] < STATUS_CACHE_TTL:
+        return _status_cache[1]
+
+    async with _status_lock:
+        # Another request may have refreshed the result while we waited
+        if _status_cache and time.monotonic() - _status_cache[0] < STATUS_CACHE_TTL:
+            return _status_cache[1]
+
+        result = await _check_status()
+        _status_cache = (time.monotonic(), result)
+        return result
+
+
+def _fsa_probe() -> bool:
+    """Check that the FSA API client can be created."""
     try:
-        fsa_client = get_fsa_client()
-        # Simple test request
-        fsa_ok = True
+        get_fsa_client()
+        return True
     except Exception as e:
         logger.error(f"FSA API check failed: {str(e)}")
-        fsa_ok = False
-    
+        return False
+
+
+def _off_probe() -> bool:
+    """Check that the Open Food Facts API client can be created."""
     try:
-        off_client = get_off_client()
-        # Simple test request
-        off_ok = True
+        get_off_client()
+        return True
     except Exception as e:
         logger.error(f"OFF API check failed: {str(e)}")
-        off_ok = False
+        return False
+
+
+async def _check_status() -> dict[str, Any]:
+    """Run the backend checks behind /status concurrently."""
+    redis_client = get_redis_client()
+    postgres_ok, redis_ok, fsa_ok, off_ok = await asyncio.gather(
+        check_postgres(),
+        redis_client.check_connection(),
+        asyncio.to_thread(_fsa_probe),
+        asyncio.to_thread(_off_probe),
+    )
     
     # Overall status
     all_ok = postgres_ok and redis_ok and fsa_ok and off_ok
     
     return {
         "status": "healthy" if all_ok else "degraded",
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": settings.app_version,
-        "environment": settings.environment,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "version": settings_fast.app_version,
+        "environment": settings_fast.environment,
         "databases": {
             "postgresql": "connected" if postgres_ok else "disconnected",
             "redis": "connected" if redis_ok else "disconnected",
@@ -274,22 +347,22 @@ from api.routes import establishments, products, intelligence, admin
 # Include routers
 app.include_router(
     establishments.router,
-    prefix=f"{settings.api_prefix}/establishments",
+    prefix=f"{API}/establishments",
     tags=["Establishments"]
 )
 app.include_router(
     products.router,
-    prefix=f"{settings.api_prefix}/products",
+    prefix=f"{API}/products",
     tags=["Products"]
 )
 app.include_router(
     intelligence.router,
-    prefix=f"{settings.api_prefix}/intelligence",
+    prefix=f"{API}/intelligence",
     tags=["Intelligence"]
 )
 app.include_router(
     admin.router,
-    prefix=f"{settings.api_prefix}",
+    prefix=API,
     tags=["Admin"]
 )
 
@@ -302,5 +375,10 @@ if __name__ == "__main__":
         host=settings.host,
         port=settings.port,
         reload=settings.reload,
-        log_level=settings.log_level.lower(),
+        log_level=settings_fast.log_level_lower,
+        # uvloop has no Windows build; both ship with uvicorn[standard]
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        backlog=2048,
+        timeout_keep_alive=5,
     )
@@ -0,0 +1,62 @@
+"""
+Pure ASGI middleware.
+Avoids the per-request Request/Response construction and extra task hop
+of BaseHTTPMiddleware (@app.middleware("http")).
+"""
+
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PROCESS_TIME_HEADER = b"x-process-time"
+
+
+class RequestLoggingMiddleware:
+    """
+    Log each HTTP request and add an X-Process-Time response header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        Initialize middleware.
+
+        Args:
+            app: Downstream ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        status_code = 500
+
+        # Log request
+        logger.info("Request: %s %s", method, path)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time = time.perf_counter() - start_time
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (PROCESS_TIME_HEADER, b"%.3f" % process_time),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Log response
+            logger.info(
+                "Response: %s %s - Status: %d - Time: %.3fs",
+                method, path, status_code, time.perf_counter() - start_time,
+            )
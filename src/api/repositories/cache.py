@@ -0,0 +1,213 @@
+"""
+Redis-backed query result caching shared by repositories.
+Provides the CachedRepository mixin and the @cached method decorator.
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import orjson
+from pydantic import BaseModel
+
+from api.config import settings
+from api.database.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Resolved once; repositories are constructed on every request
+CACHE_ENABLED = settings.enable_caching
+
+
+def _key_default(value: Any) -> Any:
+    """JSON fallback for cache key parameters (e.g. filter models)."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+class LocalTTLCache:
+    """
+    Bounded in-process LRU whose entries expire after ttl seconds.
+
+    Holds decoded values, so a hit skips both the Redis round trip and
+    deserialization. It is per-process and only touched from the event
+    loop (no awaits inside), so it needs no lock. Values are shared
+    between callers and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Entry lifetime in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the live value for key, or None."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store value under key, evicting the least recently used entry."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        """Drop key if present."""
+        self._data.pop(key, None)
+
+
+async def invalidate_namespace(namespace: str, prefix: str = "*") -> int:
+    """
+    Drop cached results stored under a repository cache namespace.
+
+    Args:
+        namespace: Repository cache_namespace
+        prefix: Key prefix (glob) passed to @cached; default all
+
+    Returns:
+        Number of keys deleted
+    """
+    return await get_redis_client().delete_pattern(f"{namespace}:{prefix}:*")
+
+
+class CachedRepository:
+    """
+    Mixin adding namespaced Redis caching to a repository.
+
+    Subclasses set cache_namespace (key prefix) and cache_ttl (default
+    TTL in seconds) and call _init_cache() from __init__.
+    """
+
+    cache_namespace: str = "repo"
+    cache_ttl: Optional[int] = None
+
+    def _init_cache(self, cache_enabled: Optional[bool] = None):
+        """
+        Attach the Redis client and resolve the cache switch.
+
+        Args:
+            cache_enabled: Override cache setting (default from config)
+        """
+        self.redis = get_redis_client()
+        self.cache_enabled = CACHE_ENABLED if cache_enabled is None else cache_enabled
+
+    @classmethod
+    async def invalidate(cls, prefix: str = "*") -> int:
+        """
+        Drop cached results of this repository.
+
+        Args:
+            prefix: Key prefix (glob) passed to @cached; default all
+
+        Returns:
+            Number of keys deleted
+        """
+        return await invalidate_namespace(cls.cache_namespace, prefix)
+
+    def _get_cache_key(self, prefix: str, **kwargs) -> str:
+        """Generate cache key from parameters."""
+        params = orjson.dumps(kwargs, default=_key_default, option=orjson.OPT_SORT_KEYS)
+        params_hash = hashlib.blake2b(params, digest_size=16).hexdigest()
+        return f"{self.cache_namespace}:{prefix}:{params_hash}"
+
+    async def _cache_get(self, key: str) -> Optional[Any]:
+        """Get from cache if enabled."""
+        if not self.cache_enabled:
+            return None
+        return await self.redis.get(key)
+
+    async def _cache_set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """Set to cache if enabled."""
+        if not self.cache_enabled:
+            return
+        ttl = ttl or self.cache_ttl
+        await self.redis.set(key, value, ttl=ttl)
+
+    async def _cache_get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several keys in one round trip (all None if disabled)."""
+        if not self.cache_enabled:
+            return [None] * len(keys)
+        return await self.redis.mget(keys)
+
+    async def _cache_set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None):
+        """Set several keys with one TTL in one pipelined round trip."""
+        if not self.cache_enabled:
+            return
+        await self.redis.mset(mapping, ttl=ttl or self.cache_ttl)
+
+
+def cached(
+    prefix: str,
+    ttl: Optional[int] = None,
+    model: Optional[type] = None,
+    paginated: bool = False,
+) -> Callable:
+    """
+    Cache the result of an async CachedRepository method in Redis.
+
+    The key is built from the method's bound arguments, so positional and
+    keyword calls share entries and pydantic filter models are hashed by
+    their full model_dump().
+
+    Args:
+        prefix: Key prefix within the repository's cache namespace
+        ttl: Time to live in seconds (default: the repository's cache_ttl)
+        model: ORM model of the returned rows. Rows are cached via
+            to_dict() and rebuilt as transient instances on a hit.
+        paginated: The method returns a (rows, total) tuple
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            if not self.cache_enabled:
+                return await func(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            params.pop("self", None)
+            cache_key = self._get_cache_key(prefix, **params)
+
+            cached_value = await self._cache_get(cache_key)
+            if cached_value is not None:
+                logger.debug(f"Cache hit for {cache_key}")
+                rows, total = cached_value if paginated else (cached_value, None)
+                if model is not None:
+                    rows = [model(**row) for row in rows]
+                return (rows, total) if paginated else rows
+
+            result = await func(self, *args, **kwargs)
+            rows, total = result if paginated else (result, None)
+            if model is not None:
+                rows = [row.to_dict() for row in rows]
+            await self._cache_set(cache_key, [rows, total] if paginated else rows, ttl=ttl)
+            return result
+
+        return wrapper
+
+    return decorator
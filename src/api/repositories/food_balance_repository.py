@@ -1,86 +1,137 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List, Optional
-from src.core.models.food import FoodBalance
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional, Tuple
+from src.core.models.food import FoodBalance, food_balance_dims
 from src.api.schemas.food_balance import FoodBalanceFilter
+from src.api.config import settings
+from src.api.repositories.cache import CachedRepository, cached
+from src.api.repositories.pagination import keyset_page, page_total
 
 
-class FoodBalanceRepository:
+class FoodBalanceRepository(CachedRepository):
     """Repository for FoodBalance data access"""
     
-    def __init__(self, db: Session):
+    cache_namespace = "food_balance"
+    cache_ttl = settings.cache_ttl_reference
+    
+    # Primary key, used for keyset pagination
+    page_key = (FoodBalance.food_label, FoodBalance.years, FoodBalance.unit)
+    
+    def __init__(self, db: AsyncSession, cache_enabled: bool = None):
         self.db = db
+        self._init_cache(cache_enabled)
+    
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[tuple] = None) -> List[FoodBalance]:
+        """Get all food balance records, paged by primary key (after) or by offset (skip)"""
+        query = keyset_page(select(FoodBalance), self.page_key, after)
+        if after is None:
+            query = query.offset(skip)
+        result = await self.db.scalars(query.limit(limit))
+        return result.all()
     
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[FoodBalance]:
-        """Get all food balance records with pagination"""
-        return self.db.query(FoodBalance).offset(skip).limit(limit).all()
+    async def stream_all(self, chunk_size: int = 1000) -> AsyncIterator[FoodBalance]:
+        """Yield every food balance record in primary key order, fetching chunk_size rows at a time"""
+        result = await self.db.stream_scalars(
+            select(FoodBalance).order_by(*self.page_key).execution_options(yield_per=chunk_size)
+        )
+        async for record in result:
+            yield record
     
-    def get_by_primary_key(self, food_label: str, year: int, unit: str) -> Optional[FoodBalance]:
+    async def get_by_primary_key(self, food_label: str, year: int, unit: str) -> Optional[FoodBalance]:
         """Get a specific food balance record by composite primary key (food_label, years, unit)"""
-        return self.db.query(FoodBalance).filter(
-            and_(
-                FoodBalance.food_label == food_label,
-                FoodBalance.years == year,
-                FoodBalance.unit == unit
-            )
-        ).first()
+        return await self.db.get(FoodBalance, (food_label, year, unit))
     
-    def get_by_food_label(self, food_label: str) -> List[FoodBalance]:
+    @cached(prefix="by_food_label", model=FoodBalance)
+    async def get_by_food_label(self, food_label: str) -> List[FoodBalance]:
         """Get all records for a specific food label"""
-        return self.db.query(FoodBalance).filter(
+        result = await self.db.scalars(select(FoodBalance).where(
             FoodBalance.food_label == food_label
-        ).all()
+        ))
+        return result.all()
     
-    def get_by_year(self, year: int) -> List[FoodBalance]:
+    async def get_by_year(self, year: int) -> List[FoodBalance]:
         """Get all records for a specific year"""
-        return self.db.query(FoodBalance).filter(
+        result = await self.db.scalars(select(FoodBalance).where(
             FoodBalance.years == year
-        ).all()
+        ))
+        return result.all()
     
-    def get_by_unit(self, unit: str) -> List[FoodBalance]:
+    async def stream_by_year(self, year: int, chunk_size: int = 1000) -> AsyncIterator[FoodBalance]:
+        """Yield the records for a specific year in primary key order, chunk_size rows at a time"""
+        result = await self.db.stream_scalars(
+            select(FoodBalance).where(FoodBalance.years == year)
+            .order_by(*self.page_key).execution_options(yield_per=chunk_size)
+        )
+        async for record in result:
+            yield record
+    
+    async def get_by_unit(self, unit: str) -> List[FoodBalance]:
         """Get all records for a specific unit"""
-        return self.db.query(FoodBalance).filter(
+        result = await self.db.scalars(select(FoodBalance).where(
             FoodBalance.unit == unit
-        ).all()
+        ))
+        return result.all()
+    
+    async def stream_by_unit(self, unit: str, chunk_size: int = 1000) -> AsyncIterator[FoodBalance]:
+        """Yield the records for a specific unit in primary key order, chunk_size rows at a time"""
+        result = await self.db.stream_scalars(
+            select(FoodBalance).where(FoodBalance.unit == unit)
+            .order_by(*self.page_key).execution_options(yield_per=chunk_size)
+        )
+        async for record in result:
+            yield record
     
-    def get_filtered(self, filters: FoodBalanceFilter, skip: int = 0, limit: int = 100) -> List[FoodBalance]:
-        """Get filtered food balance records"""
-        query = self.db.query(FoodBalance)
+    @cached(prefix="filtered", model=FoodBalance, paginated=True)
+    async def get_filtered(self, filters: FoodBalanceFilter, skip: int = 0, limit: int = 100) -> Tuple[List[FoodBalance], int]:
+        """
+        Get filtered food balance records with the total match count.
+
+        The total comes from count() OVER () on the same scan, so no
+        separate COUNT query is needed (except for a skip past the end).
+        """
+        query = select(FoodBalance, func.count().over().label("total"))
         
         if filters.food_label:
-            query = query.filter(FoodBalance.food_label.ilike(f"%{filters.food_label}%"))
+            query = query.where(FoodBalance.food_label.ilike(f"%{filters.food_label}%"))
         
         if filters.years:
-            query = query.filter(FoodBalance.years == filters.years)
+            query = query.where(FoodBalance.years == filters.years)
         
         if filters.min_year:
-            query = query.filter(FoodBalance.years >= filters.min_year)
+            query = query.where(FoodBalance.years >= filters.min_year)
         
         if filters.max_year:
-            query = query.filter(FoodBalance.years <= filters.max_year)
+            query = query.where(FoodBalance.years <= filters.max_year)
         
         if filters.unit:
-            query = query.filter(FoodBalance.unit == filters.unit)
+            query = query.where(FoodBalance.unit == filters.unit)
         
         if filters.min_amount is not None:
-            query = query.filter(FoodBalance.amount >= filters.min_amount)
+            query = query.where(FoodBalance.amount >= filters.min_amount)
         
         if filters.max_amount is not None:
-            query = query.filter(FoodBalance.amount <= filters.max_amount)
+            query = query.where(FoodBalance.amount <= filters.max_amount)
         
-        return query.offset(skip).limit(limit).all()
+        rows = (await self.db.execute(query.offset(skip).limit(limit))).all()
+        total = await page_total(self.db, query, rows, skip)
+        return [row[0] for row in rows], total
     
-    def get_unique_food_labels(self) -> List[str]:
+    @cached(prefix="unique_labels", ttl=settings.cache_ttl_metadata)
+    async def get_unique_food_labels(self) -> List[str]:
         """Get all unique food labels"""
-        results = self.db.query(FoodBalance.food_label).distinct().all()
-        return [r[0] for r in results]
+        results = await self.db.scalars(select(food_balance_dims.c.food_label).distinct())
+        return list(results)
     
-    def get_unique_years(self) -> List[int]:
+    @cached(prefix="unique_years", ttl=settings.cache_ttl_metadata)
+    async def get_unique_years(self) -> List[int]:
         """Get all unique years"""
-        results = self.db.query(FoodBalance.years).distinct().order_by(FoodBalance.years).all()
-        return [r[0] for r in results]
+        results = await self.db.scalars(
+            select(food_balance_dims.c.years).distinct().order_by(food_balance_dims.c.years)
+        )
+        return list(results)
     
-    def get_unique_units(self) -> List[str]:
+    @cached(prefix="unique_units", ttl=settings.cache_ttl_metadata)
+    async def get_unique_units(self) -> List[str]:
         """Get all unique units"""
-        results = self.db.query(FoodBalance.unit).distinct().all()
-        return [r[0] for r in results if r[0] is not None]
\ No newline at end of file
+        results = await self.db.scalars(select(food_balance_dims.c.unit).distinct())
+        return [r for r in results if r is not None]
\ No newline at end of file
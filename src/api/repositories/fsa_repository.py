@@ -3,59 +3,66 @@ Repository for FSA (Food Standards Agency) data with caching.
 Handles data access, caching, and persistence for establishment data.
 """
 
+import asyncio
+import heapq
 import logging
-import hashlib
-import json
-from typing import List, Optional, Dict, Any
+import math
+from typing import Callable, List, Optional, Dict, Any
 from datetime import datetime
 
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy import BigInteger, func, lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.config import settings
-from api.database.redis_client import get_redis_client
+from api.repositories.cache import CachedRepository, cached
 from collectors.external_apis.fsa_client import get_fsa_client, FSAAPIError
-from core.models.establishment import Establishment
+from core.models.establishment import Establishment, postcode_rating_stats
 
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LATITUDE = 69.0
 
-class FSARepository:
+
+def _haversine_from(latitude: float, longitude: float) -> Callable[[float, float], float]:
+    """
+    Build a great-circle distance function (in miles) from a fixed origin.
+
+    The origin's radians and cosine are computed once here rather than
+    for every candidate the returned function is applied to.
+    """
+    phi1 = math.radians(latitude)
+    cos_phi1 = math.cos(phi1)
+
+    def distance(lat2: float, lon2: float) -> float:
+        phi2 = math.radians(lat2)
+        d_lambda = math.radians(lon2 - longitude)
+        a = math.sin((phi2 - phi1) / 2) ** 2 + cos_phi1 * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+        return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
+
+    return distance
+
+
+class FSARepository(CachedRepository):
     """Repository for FSA establishment data."""
 
-    def __init__(self, db: Session, cache_enabled: bool = None):
+    cache_namespace = "fsa"
+    cache_ttl = settings.cache_ttl_establishment
+
+    def __init__(self, db: AsyncSession, cache_enabled: bool = None):
         """
         Initialize repository.
         
         Args:
-            db: Database session
+            db: Async database session
             cache_enabled: Override cache setting (default from config)
         """
         self.db = db
-        self.redis = get_redis_client()
         self.fsa_client = get_fsa_client()
-        self.cache_enabled = cache_enabled if cache_enabled is not None else settings.enable_caching
+        self._init_cache(cache_enabled)
 
-    def _get_cache_key(self, prefix: str, **kwargs) -> str:
-        """Generate cache key from parameters."""
-        params_str = json.dumps(kwargs, sort_keys=True)
-        params_hash = hashlib.md5(params_str.encode()).hexdigest()
-        return f"fsa:{prefix}:{params_hash}"
-
-    def _cache_get(self, key: str) -> Optional[Any]:
-        """Get from cache if enabled."""
-        if not self.cache_enabled:
-            return None
-        return self.redis.get(key)
-
-    def _cache_set(self, key: str, value: Any, ttl: Optional[int] = None):
-        """Set to cache if enabled."""
-        if not self.cache_enabled:
-            return
-        ttl = ttl or settings.cache_ttl_establishment
-        self.redis.set(key, value, ttl=ttl)
-
-    def get_establishment(self, fhrsid: int, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+    async def get_establishment(self, fhrsid: int, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
         """
         Get establishment by FHRSID.
         
@@ -66,38 +73,40 @@ class FSARepository:
         Returns:
             Establishment data or None if not found
         """
-        cache_key = f"fsa:establishment:{fhrsid}"
+        cache_key = self._establishment_cache_key(fhrsid)
 
         # Check cache first
         if not force_refresh:
-            cached = self._cache_get(cache_key)
+            cached = await self._cache_get(cache_key)
             if cached:
                 logger.debug(f"Cache hit for establishment {fhrsid}")
                 return cached
 
         # Check database
         if not force_refresh:
-            db_record = self.db.query(Establishment).filter(
-                Establishment.fhrsid == fhrsid
-            ).first()
+            # lambda_stmt: the statement is built once; fhrsid is bound per call
+            db_record = await self.db.scalar(
+                lambda_stmt(lambda: select(Establishment).where(Establishment.fhrsid == fhrsid))
+            )
             
-            if db_record and not db_record.is_stale():
+            if db_record and not db_record.is_stale:
                 data = db_record.to_dict()
-                self._cache_set(cache_key, data)
+                await self._cache_set(cache_key, data)
                 logger.debug(f"Database hit for establishment {fhrsid}")
                 return data
 
         # Fetch from API
         try:
             logger.info(f"Fetching establishment {fhrsid} from FSA API")
-            api_data = self.fsa_client.get_establishment(fhrsid)
+            api_data = await self.fsa_client.get_establishment_async(fhrsid)
             
             # Transform and save
-            establishment_data = self._transform_fsa_data(api_data)
-            self._save_establishment(establishment_data)
+            now = datetime.utcnow()
+            establishment_data = self._transform_fsa_data(api_data, now)
+            await self._save_establishments_bulk([establishment_data], now)
             
             # Cache result
-            self._cache_set(cache_key, establishment_data)
+            await self._cache_set(cache_key, establishment_data)
             
             return establishment_data
             
@@ -105,7 +114,57 @@ class FSARepository:
             logger.error(f"FSA API error for {fhrsid}: {str(e)}")
             return None
 
-    def search_establishments(
+    async def get_establishments(self, fhrsids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get several establishments by FHRSID.
+        
+        Each layer is resolved for all IDs at once: one MGET, one
+        IN (...) query, then concurrent API fetches for the remainder.
+        
+        Args:
+            fhrsids: Food Hygiene Rating Scheme IDs
+            
+        Returns:
+            Establishment data by FHRSID (IDs not found are omitted)
+        """
+        found = {}
+        cached = await self._cache_get_many([self._establishment_cache_key(f) for f in fhrsids])
+        for fhrsid, data in zip(fhrsids, cached):
+            if data:
+                found[fhrsid] = data
+        
+        missing = [f for f in dict.fromkeys(fhrsids) if f not in found]
+        if missing:
+            records = (await self.db.scalars(
+                select(Establishment).where(Establishment.fhrsid.in_(missing))
+            )).all()
+            from_db = {r.fhrsid: r.to_dict() for r in records if not r.is_stale}
+            await self._cache_establishments(list(from_db.values()))
+            found.update(from_db)
+        
+        missing = [f for f in missing if f not in found]
+        if missing:
+            logger.info(f"Fetching {len(missing)} establishments from FSA API")
+            responses = await asyncio.gather(
+                *(self.fsa_client.get_establishment_async(fhrsid) for fhrsid in missing),
+                return_exceptions=True
+            )
+            now = datetime.utcnow()
+            fetched = {}
+            for fhrsid, api_data in zip(missing, responses):
+                if isinstance(api_data, FSAAPIError):
+                    logger.error(f"FSA API error for {fhrsid}: {str(api_data)}")
+                    continue
+                if isinstance(api_data, BaseException):
+                    raise api_data
+                fetched[fhrsid] = self._transform_fsa_data(api_data, now)
+            await self._save_establishments_bulk(list(fetched.values()), now)
+            await self._cache_establishments(list(fetched.values()))
+            found.update(fetched)
+        
+        return found
+
+    async def search_establishments(
         self,
         name: Optional[str] = None,
         postcode: Optional[str] = None,
@@ -137,35 +196,35 @@ class FSARepository:
 
         # Check cache
         if not force_refresh:
-            cached = self._cache_get(cache_key)
+            cached = await self._cache_get(cache_key)
             if cached:
                 logger.debug("Cache hit for search")
                 return cached
 
         # Try database first for performance
         if not force_refresh:
-            query = self.db.query(Establishment)
+            query = select(Establishment)
             
             if name:
-                query = query.filter(Establishment.business_name.ilike(f"%{name}%"))
+                query = query.where(Establishment.business_name.ilike(f"%{name}%"))
             if postcode:
                 clean_postcode = postcode.replace(" ", "")
-                query = query.filter(Establishment.postcode.ilike(f"%{clean_postcode}%"))
+                query = query.where(Establishment.postcode.ilike(f"%{clean_postcode}%"))
             if rating_value:
-                query = query.filter(Establishment.rating_value == rating_value)
+                query = query.where(Establishment.rating_value == rating_value)
             
-            results = query.limit(limit).all()
+            results = (await self.db.scalars(query.limit(limit))).all()
             
             if results:
                 data = [r.to_dict() for r in results]
-                self._cache_set(cache_key, data, ttl=settings.cache_ttl_search)
+                await self._cache_set(cache_key, data, ttl=settings.cache_ttl_search)
                 logger.debug(f"Database hit for search, found {len(data)} results")
                 return data
 
         # Fetch from API
         try:
             logger.info("Fetching search results from FSA API")
-            api_response = self.fsa_client.search_establishments(
+            api_response = await self.fsa_client.search_establishments_async(
                 name=name,
                 postcode=postcode,
                 rating_key=rating_value,
@@ -174,15 +233,14 @@ class FSARepository:
             
             establishments = api_response.get("establishments", [])
             
-            # Transform and save
-            results = []
-            for est_data in establishments:
-                transformed = self._transform_fsa_data(est_data)
-                self._save_establishment(transformed)
-                results.append(transformed)
+            # Transform and save (one timestamp for the whole batch)
+            now = datetime.utcnow()
+            results = [self._transform_fsa_data(est_data, now) for est_data in establishments]
+            await self._save_establishments_bulk(results, now)
             
-            # Cache results
-            self._cache_set(cache_key, results, ttl=settings.cache_ttl_search)
+            # Cache results, and warm the per-establishment entries
+            await self._cache_set(cache_key, results, ttl=settings.cache_ttl_search)
+            await self._cache_establishments(results)
             
             return results
             
@@ -190,7 +248,7 @@ class FSARepository:
             logger.error(f"FSA API search error: {str(e)}")
             return []
 
-    def get_nearby_establishments(
+    async def get_nearby_establishments(
         self,
         latitude: float,
         longitude: float,
@@ -209,11 +267,12 @@ class FSARepository:
             force_refresh: Force API refresh
             
         Returns:
-            List of nearby establishments
+            List of nearby establishments, nearest first, each with
+            distance_miles
         """
         try:
             logger.info(f"Searching nearby establishments at {latitude},{longitude}")
-            api_response = self.fsa_client.get_nearby_establishments(
+            api_response = await self.fsa_client.get_nearby_establishments_async(
                 latitude=latitude,
                 longitude=longitude,
                 max_distance_limit=radius_miles,
@@ -222,19 +281,71 @@ class FSARepository:
             
             establishments = api_response.get("establishments", [])
             
-            results = []
-            for est_data in establishments:
-                transformed = self._transform_fsa_data(est_data)
-                self._save_establishment(transformed)
-                results.append(transformed)
+            now = datetime.utcnow()
+            results = [self._transform_fsa_data(est_data, now) for est_data in establishments]
+            await self._save_establishments_bulk(results, now)
+            await self._cache_establishments(results)
             
-            return results
+            # Distance is relative to this query, so it is added after the
+            # per-establishment entries are cached
+            return [
+                {**result, "distance_miles": est_data.get("Distance")}
+                for result, est_data in zip(results, establishments)
+            ]
             
         except FSAAPIError as e:
             logger.error(f"FSA API nearby search error: {str(e)}")
-            return []
+            logger.info("Serving nearby search from stored establishments")
+            return await self._get_nearby_stored(latitude, longitude, radius_miles, limit)
 
-    def get_statistics_by_postcode(self, postcode: str) -> Dict[str, Any]:
+    async def _get_nearby_stored(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_miles: int,
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Find nearby establishments among the rows already stored locally.
+
+        A latitude/longitude bounding box, served by idx_location, narrows
+        the rows before the exact haversine distance is computed for the
+        few candidates left.
+        
+        Args:
+            latitude: Latitude
+            longitude: Longitude
+            radius_miles: Search radius in miles
+            limit: Maximum results
+            
+        Returns:
+            Stored establishments within the radius, nearest first, each
+            with distance_miles
+        """
+        lat_delta = radius_miles / MILES_PER_DEGREE_LATITUDE
+        lon_delta = lat_delta / max(math.cos(math.radians(latitude)), 0.01)
+        candidates = await self.db.scalars(
+            select(Establishment).where(
+                Establishment.latitude.between(latitude - lat_delta, latitude + lat_delta),
+                Establishment.longitude.between(longitude - lon_delta, longitude + lon_delta),
+            )
+        )
+        
+        distance_from_origin = _haversine_from(latitude, longitude)
+        within = []
+        for record in candidates:
+            distance = distance_from_origin(record.latitude, record.longitude)
+            if distance <= radius_miles:
+                within.append((distance, record))
+        
+        nearest = heapq.nsmallest(limit, within, key=lambda item: item[0])
+        return [
+            {**record.to_dict(), "distance_miles": round(distance, 2)}
+            for distance, record in nearest
+        ]
+
+    @cached(prefix="postcode_stats", ttl=settings.cache_ttl_search)
+    async def get_statistics_by_postcode(self, postcode: str) -> Dict[str, Any]:
         """
         Get hygiene statistics for a postcode area.
         
@@ -244,15 +355,44 @@ class FSARepository:
         Returns:
             Statistics dictionary
         """
-        # Clean postcode
-        clean_postcode = postcode.replace(" ", "")[:4]  # Get first 4 chars
+        # Clean postcode the way postcode_normalized is computed
+        clean_postcode = postcode.replace(" ", "")[:4].upper()  # Get first 4 chars
         
-        # Query database
-        query = self.db.query(Establishment).filter(
-            Establishment.postcode.ilike(f"{clean_postcode}%")
-        )
+        # Read the per-prefix rollup view (refreshed daily); areas not in
+        # it yet (and databases without the view) fall back to one grouped
+        # pass over establishments. Either way each row is rating, count,
+        # hygiene sum and hygiene count.
+        rows = []
+        if self.db.bind.dialect.name == "postgresql":
+            stats = postcode_rating_stats.c
+            rows = (await self.db.execute(
+                select(
+                    stats.rating_value,
+                    # sum() of bigint is numeric in PostgreSQL; keep plain ints
+                    func.sum(stats.establishments).cast(BigInteger),
+                    func.sum(stats.hygiene_sum).cast(BigInteger),
+                    func.sum(stats.hygiene_count).cast(BigInteger),
+                ).where(
+                    stats.postcode_prefix == clean_postcode
+                    if len(clean_postcode) == 4
+                    else stats.postcode_prefix.like(f"{clean_postcode}%")
+                ).group_by(stats.rating_value)
+            )).all()
+        if not rows:
+            if len(clean_postcode) == 4:
+                postcode_filter = Establishment.postcode_prefix == clean_postcode
+            else:
+                postcode_filter = Establishment.postcode_normalized.like(f"{clean_postcode}%")
+            rows = (await self.db.execute(
+                select(
+                    Establishment.rating_value,
+                    func.count(Establishment.id),
+                    func.sum(Establishment.hygiene_score),
+                    func.count(Establishment.hygiene_score),
+                ).where(postcode_filter).group_by(Establishment.rating_value)
+            )).all()
         
-        total = query.count()
+        total = sum(row[1] for row in rows)
         
         if total == 0:
             return {
@@ -263,19 +403,17 @@ class FSARepository:
             }
         
         # Rating distribution
+        counts = {rating: count for rating, count, _, _ in rows}
         rating_dist = {}
         for rating in ["5", "4", "3", "2", "1", "0"]:
-            count = query.filter(Establishment.rating_value == rating).count()
+            count = counts.get(rating, 0)
             if count > 0:
                 rating_dist[rating] = count
         
         # Average scores
-        avg_hygiene = self.db.query(
-            func.avg(Establishment.hygiene_score)
-        ).filter(
-            Establishment.postcode.ilike(f"{clean_postcode}%"),
-            Establishment.hygiene_score.isnot(None)
-        ).scalar()
+        hygiene_sum = sum(row[2] or 0 for row in rows)
+        hygiene_count = sum(row[3] for row in rows)
+        avg_hygiene = hygiene_sum / hygiene_count if hygiene_count else None
         
         return {
             "postcode": postcode,
@@ -284,8 +422,21 @@ class FSARepository:
             "average_hygiene_score": float(avg_hygiene) if avg_hygiene else None
         }
 
-    def _transform_fsa_data(self, api_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Transform FSA API data to standard format."""
+    @staticmethod
+    def _establishment_cache_key(fhrsid: int) -> str:
+        """Cache key used by get_establishment."""
+        return f"fsa:establishment:{fhrsid}"
+
+    async def _cache_establishments(self, establishments: List[Dict[str, Any]]):
+        """Cache freshly fetched establishments under their get_establishment keys."""
+        await self._cache_set_many({
+            self._establishment_cache_key(data["fhrsid"]): data
+            for data in establishments
+            if data.get("fhrsid") is not None
+        })
+
+    def _transform_fsa_data(self, api_data: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        """Transform FSA API data to standard format (now: cached_at timestamp)."""
         return {
             "fhrsid": api_data.get("FHRSID"),
             "business_name": api_data.get("BusinessName"),
@@ -318,69 +469,71 @@ class FSARepository:
             "scheme_type": api_data.get("SchemeType"),
             "new_rating_pending": api_data.get("NewRatingPending"),
             "right_to_reply": api_data.get("RightToReply"),
-            "cached_at": datetime.utcnow().isoformat()
+            "cached_at": now
         }
 
-    def _save_establishment(self, data: Dict[str, Any]) -> Establishment:
-        """Save or update establishment in database."""
-        fhrsid = data.get("fhrsid")
-        
-        # Check if exists
-        existing = self.db.query(Establishment).filter(
-            Establishment.fhrsid == fhrsid
-        ).first()
-        
-        if existing:
-            # Update
-            for key, value in data.items():
-                if key == "address":
-                    existing.address_line_1 = value.get("line1")
-                    existing.address_line_2 = value.get("line2")
-                    existing.address_line_3 = value.get("line3")
-                    existing.address_line_4 = value.get("line4")
-                elif key == "scores":
-                    existing.hygiene_score = value.get("hygiene")
-                    existing.structural_score = value.get("structural")
-                    existing.confidence_in_management_score = value.get("confidence_in_management")
-                elif key == "location":
-                    existing.latitude = value.get("latitude")
-                    existing.longitude = value.get("longitude")
-                elif hasattr(existing, key):
-                    setattr(existing, key, value)
-            
-            existing.updated_at = datetime.utcnow()
-            establishment = existing
-        else:
-            # Create new
-            establishment = Establishment(
-                fhrsid=fhrsid,
-                business_name=data.get("business_name"),
-                business_type=data.get("business_type"),
-                business_type_id=data.get("business_type_id"),
-                address_line_1=data.get("address", {}).get("line1"),
-                address_line_2=data.get("address", {}).get("line2"),
-                address_line_3=data.get("address", {}).get("line3"),
-                address_line_4=data.get("address", {}).get("line4"),
-                postcode=data.get("postcode"),
-                rating_value=data.get("rating_value"),
-                rating_key=data.get("rating_key"),
-                hygiene_score=data.get("scores", {}).get("hygiene"),
-                structural_score=data.get("scores", {}).get("structural"),
-                confidence_in_management_score=data.get("scores", {}).get("confidence_in_management"),
-                latitude=data.get("location", {}).get("latitude"),
-                longitude=data.get("location", {}).get("longitude"),
-                local_authority_code=data.get("local_authority_code"),
-                local_authority_name=data.get("local_authority_name"),
-                local_authority_website=data.get("local_authority_website"),
-                local_authority_email=data.get("local_authority_email"),
-                scheme_type=data.get("scheme_type"),
-                new_rating_pending=data.get("new_rating_pending"),
-                right_to_reply=data.get("right_to_reply"),
-                cached_at=datetime.utcnow()
-            )
-            self.db.add(establishment)
-        
-        self.db.commit()
-        self.db.refresh(establishment)
+    @staticmethod
+    def _establishment_row(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Flatten transformed FSA data into establishments column values."""
+        address = data.get("address", {})
+        scores = data.get("scores", {})
+        location = data.get("location", {})
+        return {
+            "fhrsid": data.get("fhrsid"),
+            "business_name": data.get("business_name"),
+            "business_type": data.get("business_type"),
+            "business_type_id": data.get("business_type_id"),
+            "address_line_1": address.get("line1"),
+            "address_line_2": address.get("line2"),
+            "address_line_3": address.get("line3"),
+            "address_line_4": address.get("line4"),
+            "postcode": data.get("postcode"),
+            "rating_value": data.get("rating_value"),
+            "rating_key": data.get("rating_key"),
+            "hygiene_score": scores.get("hygiene"),
+            "structural_score": scores.get("structural"),
+            "confidence_in_management_score": scores.get("confidence_in_management"),
+            "latitude": location.get("latitude"),
+            "longitude": location.get("longitude"),
+            "local_authority_code": data.get("local_authority_code"),
+            "local_authority_name": data.get("local_authority_name"),
+            "local_authority_website": data.get("local_authority_website"),
+            "local_authority_email": data.get("local_authority_email"),
+            "scheme_type": data.get("scheme_type"),
+            "new_rating_pending": data.get("new_rating_pending"),
+            "right_to_reply": data.get("right_to_reply"),
+        }
+
+    async def _save_establishments_bulk(self, establishments: List[Dict[str, Any]], now: datetime):
+        """
+        Upsert many establishments with one INSERT ... ON CONFLICT statement.
         
-        return establishment
\ No newline at end of file
+        Args:
+            establishments: Transformed FSA establishment data
+            now: Timestamp for cached_at/updated_at
+        """
+        # ON CONFLICT cannot touch the same row twice in one statement
+        rows = {}
+        for data in establishments:
+            row = self._establishment_row(data)
+            if row["fhrsid"] is not None:
+                rows[row["fhrsid"]] = row
+        if not rows:
+            return
+
+        for row in rows.values():
+            row["cached_at"] = now
+            row["updated_at"] = now
+
+        stmt = pg_insert(Establishment).values(list(rows.values()))
+        update_columns = {
+            name: stmt.excluded[name]
+            for name in next(iter(rows.values()))
+            if name != "fhrsid"
+        }
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Establishment.fhrsid],
+            set_=update_columns
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
@@ -1,77 +1,118 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List, Optional
-from src.core.models.food import HouseholdSpending
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional, Tuple
+from src.core.models.food import HouseholdSpending, household_spending_dims
 from src.api.schemas.household_spending import HouseholdSpendingFilter
+from src.api.config import settings
+from src.api.repositories.cache import CachedRepository, cached
+from src.api.repositories.pagination import keyset_page, page_total
 
 
-class HouseholdSpendingRepository:
+class HouseholdSpendingRepository(CachedRepository):
     """Repository for HouseholdSpending data access"""
     
-    def __init__(self, db: Session):
+    cache_namespace = "household_spending"
+    cache_ttl = settings.cache_ttl_reference
+    
+    # Primary key, used for keyset pagination
+    page_key = (HouseholdSpending.food_code, HouseholdSpending.years)
+    
+    def __init__(self, db: AsyncSession, cache_enabled: bool = None):
         self.db = db
+        self._init_cache(cache_enabled)
+    
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[tuple] = None) -> List[HouseholdSpending]:
+        """Get all household spending records, paged by primary key (after) or by offset (skip)"""
+        query = keyset_page(select(HouseholdSpending), self.page_key, after)
+        if after is None:
+            query = query.offset(skip)
+        result = await self.db.scalars(query.limit(limit))
+        return result.all()
     
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[HouseholdSpending]:
-        """Get all household spending records with pagination"""
-        return self.db.query(HouseholdSpending).offset(skip).limit(limit).all()
+    async def stream_all(self, chunk_size: int = 1000) -> AsyncIterator[HouseholdSpending]:
+        """Yield every household spending record in primary key order, fetching chunk_size rows at a time"""
+        result = await self.db.stream_scalars(
+            select(HouseholdSpending).order_by(*self.page_key).execution_options(yield_per=chunk_size)
+        )
+        async for record in result:
+            yield record
     
-    def get_by_food_code_and_year(self, food_code: str, year: int) -> Optional[HouseholdSpending]:
+    async def get_by_food_code_and_year(self, food_code: str, year: int) -> Optional[HouseholdSpending]:
         """Get a specific household spending record by primary key"""
-        return self.db.query(HouseholdSpending).filter(
-            and_(
-                HouseholdSpending.food_code == food_code,
-                HouseholdSpending.years == year
-            )
-        ).first()
+        return await self.db.get(HouseholdSpending, (food_code, year))
     
-    def get_by_food_code(self, food_code: str) -> List[HouseholdSpending]:
+    @cached(prefix="by_food_code", model=HouseholdSpending)
+    async def get_by_food_code(self, food_code: str) -> List[HouseholdSpending]:
         """Get all records for a specific food code"""
-        return self.db.query(HouseholdSpending).filter(
+        result = await self.db.scalars(select(HouseholdSpending).where(
             HouseholdSpending.food_code == food_code
-        ).all()
+        ))
+        return result.all()
     
-    def get_by_year(self, year: int) -> List[HouseholdSpending]:
+    async def get_by_year(self, year: int) -> List[HouseholdSpending]:
         """Get all records for a specific year"""
-        return self.db.query(HouseholdSpending).filter(
+        result = await self.db.scalars(select(HouseholdSpending).where(
             HouseholdSpending.years == year
-        ).all()
+        ))
+        return result.all()
     
-    def get_filtered(self, filters: HouseholdSpendingFilter, skip: int = 0, limit: int = 100) -> List[HouseholdSpending]:
-        """Get filtered household spending records"""
-        query = self.db.query(HouseholdSpending)
+    async def stream_by_year(self, year: int, chunk_size: int = 1000) -> AsyncIterator[HouseholdSpending]:
+        """Yield the records for a specific year in primary key order, chunk_size rows at a time"""
+        result = await self.db.stream_scalars(
+            select(HouseholdSpending).where(HouseholdSpending.years == year)
+            .order_by(*self.page_key).execution_options(yield_per=chunk_size)
+        )
+        async for record in result:
+            yield record
+    
+    @cached(prefix="filtered", model=HouseholdSpending, paginated=True)
+    async def get_filtered(self, filters: HouseholdSpendingFilter, skip: int = 0, limit: int = 100) -> Tuple[List[HouseholdSpending], int]:
+        """
+        Get filtered household spending records with the total match count.
+
+        The total comes from count() OVER () on the same scan, so no
+        separate COUNT query is needed (except for a skip past the end).
+        """
+        query = select(HouseholdSpending, func.count().over().label("total"))
         
         if filters.food_code:
-            query = query.filter(HouseholdSpending.food_code.ilike(f"%{filters.food_code}%"))
+            query = query.where(HouseholdSpending.food_code.ilike(f"%{filters.food_code}%"))
         
         if filters.years:
-            query = query.filter(HouseholdSpending.years == filters.years)
+            query = query.where(HouseholdSpending.years == filters.years)
         
         if filters.min_year:
-            query = query.filter(HouseholdSpending.years >= filters.min_year)
+            query = query.where(HouseholdSpending.years >= filters.min_year)
         
         if filters.max_year:
-            query = query.filter(HouseholdSpending.years <= filters.max_year)
+            query = query.where(HouseholdSpending.years <= filters.max_year)
         
         if filters.units:
-            query = query.filter(HouseholdSpending.units == filters.units)
+            query = query.where(HouseholdSpending.units == filters.units)
         
         if filters.rse_indicator:
-            query = query.filter(HouseholdSpending.rse_indicator == filters.rse_indicator)
+            query = query.where(HouseholdSpending.rse_indicator == filters.rse_indicator)
         
         if filters.min_amount is not None:
-            query = query.filter(HouseholdSpending.amount >= filters.min_amount)
+            query = query.where(HouseholdSpending.amount >= filters.min_amount)
         
         if filters.max_amount is not None:
-            query = query.filter(HouseholdSpending.amount <= filters.max_amount)
+            query = query.where(HouseholdSpending.amount <= filters.max_amount)
         
-        return query.offset(skip).limit(limit).all()
+        rows = (await self.db.execute(query.offset(skip).limit(limit))).all()
+        total = await page_total(self.db, query, rows, skip)
+        return [row[0] for row in rows], total
     
-    def get_unique_food_codes(self) -> List[str]:
+    @cached(prefix="unique_food_codes", ttl=settings.cache_ttl_metadata)
+    async def get_unique_food_codes(self) -> List[str]:
         """Get all unique food codes"""
-        results = self.db.query(HouseholdSpending.food_code).distinct().all()
-        return [r[0] for r in results]
+        results = await self.db.scalars(select(household_spending_dims.c.food_code).distinct())
+        return list(results)
     
-    def get_unique_years(self) -> List[int]:
+    @cached(prefix="unique_years", ttl=settings.cache_ttl_metadata)
+    async def get_unique_years(self) -> List[int]:
         """Get all unique years"""
-        results = self.db.query(HouseholdSpending.years).distinct().order_by(HouseholdSpending.years).all()
-        return [r[0] for r in results]
\ No newline at end of file
+        results = await self.db.scalars(
+            select(household_spending_dims.c.years).distinct().order_by(household_spending_dims.c.years)
+        )
+        return list(results)
\ No newline at end of file
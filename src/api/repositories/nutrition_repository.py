@@ -1,72 +1,124 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, List, Optional, Tuple
 from src.core.models.nutrition import Nutrition
 from src.api.schemas.nutrition import NutritionFilter
+from src.api.config import settings
+from src.api.repositories.cache import CachedRepository, cached
+from src.api.repositories.pagination import keyset_page, page_total, project
 
 
-class NutritionRepository:
+class NutritionRepository(CachedRepository):
     """Repository for Nutrition data access"""
     
-    def __init__(self, db: Session):
+    cache_namespace = "nutrition"
+    cache_ttl = settings.cache_ttl_reference
+    
+    # Primary key, used for keyset pagination
+    page_key = (Nutrition.food_name,)
+    # Sort keys (made unique by food_name) for the ranked listings
+    high_protein_key = (Nutrition.protein_g, Nutrition.food_name)
+    low_calorie_key = (Nutrition.energy_kcal, Nutrition.food_name)
+    # Narrow projection for search result lists
+    summary_columns = (Nutrition.food_name, Nutrition.energy_kcal, Nutrition.protein_g)
+    
+    def __init__(self, db: AsyncSession, cache_enabled: bool = None):
         self.db = db
+        self._init_cache(cache_enabled)
     
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[Nutrition]:
-        """Get all nutrition records with pagination"""
-        return self.db.query(Nutrition).offset(skip).limit(limit).all()
+    async def get_all(self, skip: int = 0, limit: int = 100, after: Optional[tuple] = None) -> List[Nutrition]:
+        """Get all nutrition records, paged by primary key (after) or by offset (skip)"""
+        query = keyset_page(select(Nutrition), self.page_key, after)
+        if after is None:
+            query = query.offset(skip)
+        result = await self.db.scalars(query.limit(limit))
+        return result.all()
     
-    def get_by_food_name(self, food_name: str) -> Optional[Nutrition]:
+    async def stream_all(self, chunk_size: int = 1000) -> AsyncIterator[Nutrition]:
+        """Yield every nutrition record in primary key order, fetching chunk_size rows at a time"""
+        result = await self.db.stream_scalars(
+            select(Nutrition).order_by(*self.page_key).execution_options(yield_per=chunk_size)
+        )
+        async for record in result:
+            yield record
+    
+    async def get_by_food_name(self, food_name: str) -> Optional[Nutrition]:
         """Get a specific nutrition record by food name (primary key)"""
-        return self.db.query(Nutrition).filter(
-            Nutrition.food_name == food_name
-        ).first()
+        return await self.db.get(Nutrition, food_name)
     
-    def search_by_name(self, search_term: str) -> List[Nutrition]:
-        """Search nutrition records by food name"""
-        return self.db.query(Nutrition).filter(
+    async def search_by_name(self, search_term: str, columns: Optional[tuple] = None) -> List[Any]:
+        """Search nutrition records by food name (columns: project to dicts of just these)"""
+        if not columns:
+            result = await self.db.scalars(select(Nutrition).where(
+                Nutrition.food_name.ilike(f"%{search_term}%")
+            ))
+            return result.all()
+        result = await self.db.execute(select(*columns).where(
             Nutrition.food_name.ilike(f"%{search_term}%")
-        ).all()
+        ))
+        return [project(row, columns) for row in result]
     
-    def get_filtered(self, filters: NutritionFilter, skip: int = 0, limit: int = 100) -> List[Nutrition]:
-        """Get filtered nutrition records"""
-        query = self.db.query(Nutrition)
+    @cached(prefix="filtered", model=Nutrition, paginated=True)
+    async def get_filtered(self, filters: NutritionFilter, skip: int = 0, limit: int = 100) -> Tuple[List[Nutrition], int]:
+        """
+        Get filtered nutrition records with the total match count.
+
+        The total comes from count() OVER () on the same scan, so no
+        separate COUNT query is needed (except for a skip past the end).
+        """
+        query = select(Nutrition, func.count().over().label("total"))
         
         if filters.food_name:
-            query = query.filter(Nutrition.food_name.ilike(f"%{filters.food_name}%"))
+            query = query.where(Nutrition.food_name.ilike(f"%{filters.food_name}%"))
         
         # Energy filters
         if filters.min_energy_kcal is not None:
-            query = query.filter(Nutrition.energy_kcal >= filters.min_energy_kcal)
+            query = query.where(Nutrition.energy_kcal >= filters.min_energy_kcal)
         if filters.max_energy_kcal is not None:
-            query = query.filter(Nutrition.energy_kcal <= filters.max_energy_kcal)
+            query = query.where(Nutrition.energy_kcal <= filters.max_energy_kcal)
         
         # Protein filters
         if filters.min_protein_g is not None:
-            query = query.filter(Nutrition.protein_g >= filters.min_protein_g)
+            query = query.where(Nutrition.protein_g >= filters.min_protein_g)
         if filters.max_protein_g is not None:
-            query = query.filter(Nutrition.protein_g <= filters.max_protein_g)
+            query = query.where(Nutrition.protein_g <= filters.max_protein_g)
         
         # Fat filters
         if filters.min_fat_g is not None:
-            query = query.filter(Nutrition.fat_g >= filters.min_fat_g)
+            query = query.where(Nutrition.fat_g >= filters.min_fat_g)
         if filters.max_fat_g is not None:
-            query = query.filter(Nutrition.fat_g <= filters.max_fat_g)
+            query = query.where(Nutrition.fat_g <= filters.max_fat_g)
         
         # Carbohydrate filters
         if filters.min_carbohydrate_g is not None:
-            query = query.filter(Nutrition.carbohydrate_g >= filters.min_carbohydrate_g)
+            query = query.where(Nutrition.carbohydrate_g >= filters.min_carbohydrate_g)
         if filters.max_carbohydrate_g is not None:
-            query = query.filter(Nutrition.carbohydrate_g <= filters.max_carbohydrate_g)
+            query = query.where(Nutrition.carbohydrate_g <= filters.max_carbohydrate_g)
         
-        return query.offset(skip).limit(limit).all()
+        rows = (await self.db.execute(query.offset(skip).limit(limit))).all()
+        total = await page_total(self.db, query, rows, skip)
+        return [row[0] for row in rows], total
     
-    def get_high_protein_foods(self, min_protein: float = 10.0, skip: int = 0, limit: int = 100) -> List[Nutrition]:
-        """Get foods with high protein content"""
-        return self.db.query(Nutrition).filter(
-            Nutrition.protein_g >= min_protein
-        ).order_by(Nutrition.protein_g.desc()).offset(skip).limit(limit).all()
+    @cached(prefix="high_protein", model=Nutrition)
+    async def get_high_protein_foods(self, min_protein: float = 10.0, skip: int = 0, limit: int = 100, after: Optional[tuple] = None) -> List[Nutrition]:
+        """Get foods with high protein content, highest first (after: keyset cursor)"""
+        query = keyset_page(
+            select(Nutrition).where(Nutrition.protein_g >= min_protein),
+            self.high_protein_key, after, descending=True
+        )
+        if after is None:
+            query = query.offset(skip)
+        result = await self.db.scalars(query.limit(limit))
+        return result.all()
     
-    def get_low_calorie_foods(self, max_calories: float = 100.0, skip: int = 0, limit: int = 100) -> List[Nutrition]:
-        """Get low calorie foods"""
-        return self.db.query(Nutrition).filter(
-            Nutrition.energy_kcal <= max_calories
-        ).order_by(Nutrition.energy_kcal.asc()).offset(skip).limit(limit).all()
\ No newline at end of file
+    @cached(prefix="low_calorie", model=Nutrition)
+    async def get_low_calorie_foods(self, max_calories: float = 100.0, skip: int = 0, limit: int = 100, after: Optional[tuple] = None) -> List[Nutrition]:
+        """Get low calorie foods, lowest first (after: keyset cursor)"""
+        query = keyset_page(
+            select(Nutrition).where(Nutrition.energy_kcal <= max_calories),
+            self.low_calorie_key, after
+        )
+        if after is None:
+            query = query.offset(skip)
+        result = await self.db.scalars(query.limit(limit))
+        return result.all()
\ No newline at end of file
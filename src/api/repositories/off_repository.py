@@ -3,27 +3,49 @@ Repository for Open Food Facts data with caching.
 Handles data access, caching, and persistence for product eco-score data.
 """
 
+import asyncio
 import logging
-import hashlib
-import json
-from typing import List, Optional, Dict, Any
+from typing import Any, Dict, Iterable, List, Optional
 from datetime import datetime
 
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, lambda_stmt, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.config import settings
-from api.database.redis_client import get_redis_client
+from api.repositories.cache import CachedRepository, LocalTTLCache, cached
 from collectors.external_apis.off_client import get_off_client, OFFAPIError
-from core.models.product_eco import ProductEco
+from core.models.product_eco import ProductEco, product_category_stats
 
 logger = logging.getLogger(__name__)
 
+# Decoded get_product results for hot barcodes, checked before Redis.
+# Short-lived because other workers' refreshes do not invalidate it.
+_local_products = LocalTTLCache(maxsize=2048, ttl=60)
 
-class OFFRepository:
+# The only OFF product keys _transform_off_data reads (plus "code" for
+# search hits). Sent as fields= so OFF omits the hundreds of other keys
+# and the response is a fraction of the size to transfer and decode.
+OFF_PRODUCT_FIELDS = [
+    "code", "product_name", "generic_name", "brands", "categories", "main_category",
+    "ecoscore_grade", "ecoscore_score", "ecoscore_data",
+    "nutriscore_grade", "nutriscore_score",
+    "carbon_footprint_100g", "manufacturing_impact", "packaging_impact", "transportation_impact",
+    "packaging", "manufacturing_places", "origins", "labels", "quantity", "serving_size",
+    "image_url", "image_small_url", "image_ingredients_url", "image_nutrition_url",
+    "energy_100g", "fat_100g", "saturated-fat_100g", "carbohydrates_100g",
+    "sugars_100g", "fiber_100g", "proteins_100g", "salt_100g",
+    "ingredients_text", "ingredients_count", "completeness",
+]
+
+
+class OFFRepository(CachedRepository):
     """Repository for Open Food Facts product data."""
 
-    def __init__(self, db: Session, cache_enabled: bool = None):
+    cache_namespace = "off"
+    cache_ttl = settings.cache_ttl_product
+
+    def __init__(self, db: AsyncSession, cache_enabled: bool = None):
         """
         Initialize repository.
         
@@ -32,30 +54,10 @@ class OFFRepository:
             cache_enabled: Override cache setting
         """
         self.db = db
-        self.redis = get_redis_client()
         self.off_client = get_off_client()
-        self.cache_enabled = cache_enabled if cache_enabled is not None else settings.enable_caching
-
-    def _get_cache_key(self, prefix: str, **kwargs) -> str:
-        """Generate cache key from parameters."""
-        params_str = json.dumps(kwargs, sort_keys=True)
-        params_hash = hashlib.md5(params_str.encode()).hexdigest()
-        return f"off:{prefix}:{params_hash}"
+        self._init_cache(cache_enabled)
 
-    def _cache_get(self, key: str) -> Optional[Any]:
-        """Get from cache if enabled."""
-        if not self.cache_enabled:
-            return None
-        return self.redis.get(key)
-
-    def _cache_set(self, key: str, value: Any, ttl: Optional[int] = None):
-        """Set to cache if enabled."""
-        if not self.cache_enabled:
-            return
-        ttl = ttl or settings.cache_ttl_product
-        self.redis.set(key, value, ttl=ttl)
-
-    def get_product(self, barcode: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+    async def get_product(self, barcode: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
         """
         Get product by barcode.
         
@@ -66,38 +68,47 @@ class OFFRepository:
         Returns:
             Product data or None if not found
         """
-        cache_key = f"off:product:{barcode}"
+        cache_key = self._product_cache_key(barcode)
 
-        # Check cache
-        if not force_refresh:
-            cached = self._cache_get(cache_key)
+        # Check the in-process cache, then Redis
+        if force_refresh:
+            _local_products.pop(barcode)
+        elif self.cache_enabled:
+            local = _local_products.get(barcode)
+            if local is not None:
+                return local
+            cached = await self._cache_get(cache_key)
             if cached:
                 logger.debug(f"Cache hit for product {barcode}")
+                _local_products.set(barcode, cached)
                 return cached
 
         # Check database
         if not force_refresh:
-            db_record = self.db.query(ProductEco).filter(
-                ProductEco.barcode == barcode
-            ).first()
+            # lambda_stmt: the statement is built once; barcode is bound per call
+            db_record = await self.db.scalar(
+                lambda_stmt(lambda: select(ProductEco).where(ProductEco.barcode == barcode))
+            )
             
-            if db_record and not db_record.is_stale():
+            if db_record and not db_record.is_stale:
                 data = db_record.to_dict()
-                self._cache_set(cache_key, data)
+                await self._cache_set(cache_key, data)
+                self._local_set(barcode, data)
                 logger.debug(f"Database hit for product {barcode}")
                 return data
 
         # Fetch from API
         try:
             logger.info(f"Fetching product {barcode} from OFF API")
-            api_data = self.off_client.get_product(barcode)
+            api_data = await self.off_client.get_product_async(barcode, fields=OFF_PRODUCT_FIELDS)
             
             # Transform and save
             product_data = self._transform_off_data(api_data, barcode)
-            self._save_product(product_data)
+            await self._save_products_bulk([product_data])
             
             # Cache result
-            self._cache_set(cache_key, product_data)
+            await self._cache_set(cache_key, product_data)
+            self._local_set(barcode, product_data)
             
             return product_data
             
@@ -105,7 +116,7 @@ class OFFRepository:
             logger.error(f"OFF API error for {barcode}: {str(e)}")
             return None
 
-    def search_products(
+    async def search_products(
         self,
         search_terms: Optional[str] = None,
         category: Optional[str] = None,
@@ -137,37 +148,41 @@ class OFFRepository:
 
         # Check cache
         if not force_refresh:
-            cached = self._cache_get(cache_key)
+            cached = await self._cache_get(cache_key)
             if cached:
                 logger.debug("Cache hit for product search")
                 return cached
 
         # Try database first
         if not force_refresh and not search_terms:
-            query = self.db.query(ProductEco)
+            query = select(ProductEco)
             
             if category:
-                query = query.filter(ProductEco.categories.ilike(f"%{category}%"))
+                query = query.where(ProductEco.categories.ilike(f"%{category}%"))
             if ecoscore_grade:
-                query = query.filter(ProductEco.ecoscore_grade == ecoscore_grade.lower())
+                query = query.where(ProductEco.ecoscore_grade == ecoscore_grade.lower())
             
-            results = query.order_by(desc(ProductEco.ecoscore_score)).limit(limit).all()
+            results = (await self.db.scalars(
+                query.order_by(desc(ProductEco.ecoscore_score)).limit(limit)
+            )).all()
             
             if results:
                 data = [r.to_dict() for r in results]
-                self._cache_set(cache_key, data, ttl=settings.cache_ttl_search)
+                await self._cache_set(cache_key, data, ttl=settings.cache_ttl_search)
                 logger.debug(f"Database hit for search, found {len(data)} results")
                 return data
 
         # Fetch from API
         try:
             logger.info("Fetching search results from OFF API")
-            api_response = self.off_client.search_products(
+            api_response = await asyncio.to_thread(
+                self.off_client.search_products,
                 search_terms=search_terms,
                 category=category,
                 ecoscore_grade=ecoscore_grade,
                 page_size=limit,
-                sort_by="ecoscore_score"
+                sort_by="ecoscore_score",
+                fields=OFF_PRODUCT_FIELDS,
             )
             
             products = api_response.get("products", [])
@@ -176,12 +191,12 @@ class OFFRepository:
             for prod_data in products:
                 barcode = prod_data.get("code", "")
                 if barcode:
-                    transformed = self._transform_off_data(prod_data, barcode)
-                    self._save_product(transformed)
-                    results.append(transformed)
+                    results.append(self._transform_off_data(prod_data, barcode))
+            await self._save_products_bulk(results)
             
-            # Cache results
-            self._cache_set(cache_key, results, ttl=settings.cache_ttl_search)
+            # Cache results, and warm the per-product entries
+            await self._cache_set(cache_key, results, ttl=settings.cache_ttl_search)
+            await self._cache_products(results)
             
             return results
             
@@ -189,7 +204,7 @@ class OFFRepository:
             logger.error(f"OFF API search error: {str(e)}")
             return []
 
-    def compare_products(self, barcodes: List[str]) -> List[Dict[str, Any]]:
+    async def compare_products(self, barcodes: List[str]) -> List[Dict[str, Any]]:
         """
         Get multiple products for comparison.
         
@@ -202,9 +217,30 @@ class OFFRepository:
         if len(barcodes) > 5:
             barcodes = barcodes[:5]
         
+        # Resolve each layer for all barcodes at once: one MGET, one
+        # IN (...) query, then concurrent API fetches for the remainder
+        found = {}
+        cached = await self._cache_get_many([self._product_cache_key(b) for b in barcodes])
+        for barcode, data in zip(barcodes, cached):
+            if data:
+                found[barcode] = data
+        
+        missing = [b for b in dict.fromkeys(barcodes) if b not in found]
+        if missing:
+            records = (await self.db.scalars(
+                select(ProductEco).where(ProductEco.barcode.in_(missing))
+            )).all()
+            from_db = {r.barcode: r.to_dict() for r in records if not r.is_stale}
+            await self._cache_products(from_db.values())
+            found.update(from_db)
+        
+        missing = [b for b in missing if b not in found]
+        if missing:
+            found.update(await self._fetch_products(missing))
+        
         results = []
         for barcode in barcodes:
-            product = self.get_product(barcode)
+            product = found.get(barcode)
             if product:
                 results.append(product)
             else:
@@ -216,7 +252,38 @@ class OFFRepository:
         
         return results
 
-    def get_top_eco_products(
+    async def _fetch_products(self, barcodes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch products from the OFF API concurrently, then save and cache them.
+        
+        Args:
+            barcodes: Barcodes to fetch
+            
+        Returns:
+            Transformed product data by barcode (failed fetches omitted)
+        """
+        logger.info(f"Fetching {len(barcodes)} products from OFF API")
+        responses = await asyncio.gather(
+            *(self.off_client.get_product_async(barcode, fields=OFF_PRODUCT_FIELDS) for barcode in barcodes),
+            return_exceptions=True
+        )
+        
+        fetched = {}
+        for barcode, api_data in zip(barcodes, responses):
+            if isinstance(api_data, OFFAPIError):
+                logger.error(f"OFF API error for {barcode}: {str(api_data)}")
+                continue
+            if isinstance(api_data, BaseException):
+                raise api_data
+            fetched[barcode] = self._transform_off_data(api_data, barcode)
+        
+        await self._save_products_bulk(list(fetched.values()))
+        await self._cache_products(fetched.values())
+        
+        return fetched
+
+    @cached(prefix="top_eco", ttl=settings.cache_ttl_search)
+    async def get_top_eco_products(
         self,
         category: Optional[str] = None,
         limit: int = 10,
@@ -225,6 +292,9 @@ class OFFRepository:
         """
         Get products with best eco-scores.
         
+        The ranking does not depend on the caller's location, so district
+        and establishment intelligence share one cached list.
+        
         Args:
             category: Category filter
             limit: Maximum results
@@ -233,37 +303,52 @@ class OFFRepository:
         Returns:
             List of top products
         """
-        query = self.db.query(ProductEco).filter(
+        query = select(ProductEco).where(
             ProductEco.ecoscore_score >= min_ecoscore,
             ProductEco.ecoscore_score.isnot(None)
         )
         
         if category:
-            query = query.filter(ProductEco.categories.ilike(f"%{category}%"))
+            query = query.where(ProductEco.categories.ilike(f"%{category}%"))
         
-        results = query.order_by(
-            desc(ProductEco.ecoscore_score)
-        ).limit(limit).all()
+        results = (await self.db.scalars(
+            query.order_by(desc(ProductEco.ecoscore_score)).limit(limit)
+        )).all()
         
         return [r.to_dict() for r in results]
 
-    def get_category_statistics(self, category: str) -> Dict[str, Any]:
+    @cached(prefix="category_stats", ttl=settings.cache_ttl_search)
+    async def get_category_statistics(self, category: str) -> Dict[str, Any]:
         """
         Get eco-score statistics for a category.
         
+        The category is matched exactly (trimmed, case-insensitive) against
+        the comma-separated entries of each product's categories; partial
+        names such as "milk" do not include "chocolate milk". On PostgreSQL
+        the counts come from the product_category_stats view and can lag
+        recent product upserts by up to one refresh interval.
+        
         Args:
             category: Product category
             
         Returns:
             Statistics dictionary
         """
-        from sqlalchemy import func
-        
-        query = self.db.query(ProductEco).filter(
-            ProductEco.categories.ilike(f"%{category}%")
-        )
+        # Each row is grade, count, score sum and score count
+        name = category.strip().lower()
+        if self.db.bind.dialect.name == "postgresql":
+            rows = (await self.db.execute(
+                select(
+                    product_category_stats.c.ecoscore_grade,
+                    product_category_stats.c.products,
+                    product_category_stats.c.score_sum,
+                    product_category_stats.c.score_count,
+                ).where(product_category_stats.c.category == name)
+            )).all()
+        else:
+            rows = await self._category_rows(name)
         
-        total = query.count()
+        total = sum(row[1] for row in rows)
         
         if total == 0:
             return {
@@ -274,19 +359,16 @@ class OFFRepository:
             }
         
         # Eco-score distribution
+        counts = {grade: count for grade, count, _, _ in rows}
         ecoscore_dist = {}
         for grade in ["a", "b", "c", "d", "e"]:
-            count = query.filter(ProductEco.ecoscore_grade == grade).count()
+            count = counts.get(grade, 0)
             if count > 0:
                 ecoscore_dist[grade] = count
         
         # Average eco-score
-        avg_score = self.db.query(
-            func.avg(ProductEco.ecoscore_score)
-        ).filter(
-            ProductEco.categories.ilike(f"%{category}%"),
-            ProductEco.ecoscore_score.isnot(None)
-        ).scalar()
+        score_count = sum(row[3] for row in rows)
+        avg_score = sum(row[2] or 0 for row in rows) / score_count if score_count else None
         
         return {
             "category": category,
@@ -295,6 +377,50 @@ class OFFRepository:
             "average_ecoscore": float(avg_score) if avg_score else None
         }
 
+    async def _category_rows(self, name: str) -> List[tuple]:
+        """
+        Aggregate one category like product_category_stats, for databases without the view.
+        
+        ILIKE narrows the scan; the exact entry match is done here.
+        """
+        candidates = (await self.db.execute(
+            select(
+                ProductEco.categories,
+                ProductEco.ecoscore_grade,
+                ProductEco.ecoscore_score,
+            ).where(ProductEco.categories.ilike(f"%{name}%"))
+        )).all()
+        
+        stats = {}
+        for categories, grade, score in candidates:
+            entries = [entry.strip(" ").lower() for entry in categories.split(",")]
+            if name not in entries:
+                continue
+            count, score_sum, score_count = stats.get(grade, (0, 0, 0))
+            if score is None:
+                stats[grade] = (count + 1, score_sum, score_count)
+            else:
+                stats[grade] = (count + 1, score_sum + score, score_count + 1)
+        return [(grade, *values) for grade, values in stats.items()]
+
+    def _local_set(self, barcode: str, data: Dict[str, Any]):
+        """Keep a decoded product in the in-process cache if caching is on."""
+        if self.cache_enabled:
+            _local_products.set(barcode, data)
+
+    @staticmethod
+    def _product_cache_key(barcode: str) -> str:
+        """Cache key used by get_product."""
+        return f"off:product:{barcode}"
+
+    async def _cache_products(self, products: Iterable[Dict[str, Any]]):
+        """Cache products under their get_product keys in one pipelined round trip."""
+        await self._cache_set_many({
+            self._product_cache_key(data["barcode"]): data
+            for data in products
+            if data.get("barcode")
+        })
+
     def _transform_off_data(self, api_data: Dict[str, Any], barcode: str) -> Dict[str, Any]:
         """Transform OFF API data to standard format."""
         return {
@@ -346,77 +472,73 @@ class OFFRepository:
                 "count": api_data.get("ingredients_count")
             },
             "completeness": api_data.get("completeness"),
-            "cached_at": datetime.utcnow().isoformat()
+            "cached_at": datetime.utcnow()
         }
 
-    def _save_product(self, data: Dict[str, Any]) -> ProductEco:
-        """Save or update product in database."""
-        barcode = data.get("barcode")
-        
-        # Check if exists
-        existing = self.db.query(ProductEco).filter(
-            ProductEco.barcode == barcode
-        ).first()
+    @staticmethod
+    def _product_row(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Flatten transformed OFF data into product_eco column values."""
+        ecoscore = data.get("ecoscore", {})
+        nutriscore = data.get("nutriscore", {})
+        impact = data.get("environmental_impact", {})
+        images = data.get("images", {})
+        return {
+            "barcode": data.get("barcode"),
+            "product_name": data.get("product_name"),
+            "generic_name": data.get("generic_name"),
+            "brands": data.get("brands"),
+            "categories": data.get("categories"),
+            "main_category": data.get("main_category"),
+            "ecoscore_grade": ecoscore.get("grade"),
+            "ecoscore_score": ecoscore.get("score"),
+            "ecoscore_data": ecoscore.get("data"),
+            "nutriscore_grade": nutriscore.get("grade"),
+            "nutriscore_score": nutriscore.get("score"),
+            "carbon_footprint_100g": impact.get("carbon_footprint_100g"),
+            "manufacturing_impact": impact.get("manufacturing_impact"),
+            "packaging_impact": impact.get("packaging_impact"),
+            "packaging": data.get("packaging"),
+            "manufacturing_places": data.get("manufacturing_places"),
+            "origins": data.get("origins"),
+            "labels": data.get("labels"),
+            "quantity": data.get("quantity"),
+            "serving_size": data.get("serving_size"),
+            "image_url": images.get("url"),
+            "image_small_url": images.get("small"),
+            "ingredients_text": data.get("ingredients", {}).get("text"),
+            "completeness": data.get("completeness"),
+        }
+
+    async def _save_products_bulk(self, products: List[Dict[str, Any]]):
+        """
+        Upsert many products with one INSERT ... ON CONFLICT statement.
         
-        if existing:
-            # Update
-            existing.product_name = data.get("product_name")
-            existing.generic_name = data.get("generic_name")
-            existing.brands = data.get("brands")
-            existing.categories = data.get("categories")
-            existing.main_category = data.get("main_category")
-            existing.ecoscore_grade = data.get("ecoscore", {}).get("grade")
-            existing.ecoscore_score = data.get("ecoscore", {}).get("score")
-            existing.ecoscore_data = data.get("ecoscore", {}).get("data")
-            existing.nutriscore_grade = data.get("nutriscore", {}).get("grade")
-            existing.nutriscore_score = data.get("nutriscore", {}).get("score")
-            existing.carbon_footprint_100g = data.get("environmental_impact", {}).get("carbon_footprint_100g")
-            existing.manufacturing_impact = data.get("environmental_impact", {}).get("manufacturing_impact")
-            existing.packaging_impact = data.get("environmental_impact", {}).get("packaging_impact")
-            existing.packaging = data.get("packaging")
-            existing.manufacturing_places = data.get("manufacturing_places")
-            existing.origins = data.get("origins")
-            existing.labels = data.get("labels")
-            existing.quantity = data.get("quantity")
-            existing.serving_size = data.get("serving_size")
-            existing.image_url = data.get("images", {}).get("url")
-            existing.image_small_url = data.get("images", {}).get("small")
-            existing.ingredients_text = data.get("ingredients", {}).get("text")
-            existing.completeness = data.get("completeness")
-            existing.updated_at = datetime.utcnow()
-            product = existing
-        else:
-            # Create new
-            product = ProductEco(
-                barcode=barcode,
-                product_name=data.get("product_name"),
-                generic_name=data.get("generic_name"),
-                brands=data.get("brands"),
-                categories=data.get("categories"),
-                main_category=data.get("main_category"),
-                ecoscore_grade=data.get("ecoscore", {}).get("grade"),
-                ecoscore_score=data.get("ecoscore", {}).get("score"),
-                ecoscore_data=data.get("ecoscore", {}).get("data"),
-                nutriscore_grade=data.get("nutriscore", {}).get("grade"),
-                nutriscore_score=data.get("nutriscore", {}).get("score"),
-                carbon_footprint_100g=data.get("environmental_impact", {}).get("carbon_footprint_100g"),
-                manufacturing_impact=data.get("environmental_impact", {}).get("manufacturing_impact"),
-                packaging_impact=data.get("environmental_impact", {}).get("packaging_impact"),
-                packaging=data.get("packaging"),
-                manufacturing_places=data.get("manufacturing_places"),
-                origins=data.get("origins"),
-                labels=data.get("labels"),
-                quantity=data.get("quantity"),
-                serving_size=data.get("serving_size"),
-                image_url=data.get("images", {}).get("url"),
-                image_small_url=data.get("images", {}).get("small"),
-                ingredients_text=data.get("ingredients", {}).get("text"),
-                completeness=data.get("completeness"),
-                cached_at=datetime.utcnow()
-            )
-            self.db.add(product)
+        Args:
+            products: Transformed OFF product data
+        """
+        # ON CONFLICT cannot touch the same row twice in one statement
+        rows = {}
+        for data in products:
+            row = self._product_row(data)
+            if row["barcode"]:
+                rows[row["barcode"]] = row
+        if not rows:
+            return
         
-        self.db.commit()
-        self.db.refresh(product)
+        now = datetime.utcnow()
+        for row in rows.values():
+            row["cached_at"] = now
+            row["updated_at"] = now
         
-        return product
\ No newline at end of file
+        stmt = pg_insert(ProductEco).values(list(rows.values()))
+        update_columns = {
+            name: stmt.excluded[name]
+            for name in next(iter(rows.values()))
+            if name not in ("barcode", "cached_at")
+        }
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProductEco.barcode],
+            set_=update_columns
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
@@ -0,0 +1,146 @@
+"""
+Keyset (cursor) pagination helpers.
+Seek past the last row of the previous page on an indexed key instead of
+making the database read and discard OFFSET rows. Also counts the total
+matches of offset-paged filter queries.
+"""
+
+import base64
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import orjson
+from sqlalchemy import Select, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(key: Optional[Sequence[Any]]) -> Optional[str]:
+    """
+    Encode a row key as an opaque URL-safe cursor.
+
+    Args:
+        key: Sort key values of the last row on the page
+
+    Returns:
+        Cursor string, or None when there is no next page
+    """
+    if key is None:
+        return None
+    return base64.urlsafe_b64encode(orjson.dumps(list(key))).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> Tuple[Any, ...]:
+    """
+    Decode a cursor produced by encode_cursor for the given key columns.
+
+    The values are checked against the columns' Python types, so a cursor
+    from another listing (or a tampered one) is rejected here instead of
+    failing in the database.
+
+    Args:
+        cursor: Cursor string
+        columns: Key columns of the listing the cursor is used with
+
+    Returns:
+        Sort key values
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match columns
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = orjson.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, orjson.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(key, list) or len(key) != len(columns):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return tuple(_key_value(value, column, cursor) for value, column in zip(key, columns))
+
+
+def _key_value(value: Any, column: Any, cursor: str) -> Any:
+    """Check one decoded cursor value against its column's Python type."""
+    python_type = column.type.python_type
+    # JSON has no separate float syntax for whole numbers
+    if python_type is float and type(value) is int:
+        return float(value)
+    if type(value) is not python_type:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return value
+
+
+def keyset_page(
+    query: Select,
+    columns: Sequence[Any],
+    after: Optional[Sequence[Any]] = None,
+    descending: bool = False,
+) -> Select:
+    """
+    Order a query by a unique key and seek past a previous page.
+
+    Args:
+        query: Select statement to paginate
+        columns: Key columns; together they must be unique
+        after: Key of the last row already returned (None for page one)
+        descending: Walk the key from high to low
+
+    Returns:
+        Ordered (and filtered) select statement; apply .limit() after
+    """
+    if after is not None:
+        if len(after) != len(columns):
+            raise ValueError("Cursor does not match this listing")
+        key = tuple_(*columns)
+        query = query.where(key < tuple(after) if descending else key > tuple(after))
+    order = [column.desc() for column in columns] if descending else list(columns)
+    return query.order_by(*order)
+
+
+def row_key(row: Any, columns: Sequence[Any]) -> Tuple[Any, ...]:
+    """
+    Extract the pagination key of an ORM row.
+
+    Args:
+        row: ORM instance
+        columns: Key columns passed to keyset_page
+
+    Returns:
+        Key values in column order
+    """
+    return tuple(getattr(row, column.key) for column in columns)
+
+
+def project(row: Any, columns: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Map a projected result row to {column key: value}.
+
+    Args:
+        row: Result row whose leading entries are the selected columns
+        columns: Columns passed to select()
+
+    Returns:
+        Dict of the projected values
+    """
+    return {column.key: row[i] for i, column in enumerate(columns)}
+
+
+async def page_total(db: AsyncSession, query: Select, rows: Sequence[Any], skip: int) -> int:
+    """
+    Total match count of a page fetched with a count() OVER () "total" column.
+
+    Past the last page there is no row to carry the window count, so the
+    filtered query is counted separately; that only happens for
+    out-of-range skips.
+
+    Args:
+        db: Session the page was read with
+        query: Filtered query, before offset/limit
+        rows: Rows of the page
+        skip: Offset the page was read at
+
+    Returns:
+        Number of rows matching the filters
+    """
+    if rows:
+        return rows[0].total
+    if not skip:
+        return 0
+    return await db.scalar(query.with_only_columns(func.count(), maintain_column_froms=True))
@@ -2,16 +2,18 @@
 API routes for admin/metrics endpoints.
 """
 
+import asyncio
 import logging
 import time
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import bindparam, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.database.session import get_db, get_db_stats
+from api.database.session import check_connection, get_db, get_db_stats
 from api.database.redis_client import get_redis_client
+from api.repositories.cache import invalidate_namespace
 from core.models.establishment import Establishment
 from core.models.product_eco import ProductEco
 
@@ -19,42 +21,67 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# cache_namespace of the food balance, household spending and nutrition
+# repositories, whose tables the government data ETL reloads
+REFERENCE_CACHE_NAMESPACES = ("food_balance", "household_spending", "nutrition")
+
+# Fixed-shape statements, built once at import rather than per request.
+# Totals and today's counts per table (count FILTER), joined as single rows
+_establishment_counts = select(
+    func.count(Establishment.id).label("establishments_total"),
+    func.count(Establishment.id).filter(Establishment.cached_at >= bindparam("today")).label("establishments_today"),
+).subquery()
+_product_counts = select(
+    func.count(ProductEco.id).label("products_total"),
+    func.count(ProductEco.id).filter(ProductEco.cached_at >= bindparam("today")).label("products_today"),
+).subquery()
+METRICS_COUNTS = select(_establishment_counts, _product_counts).select_from(
+    _establishment_counts.join(_product_counts, true())
+)
+
+# Per-bucket count plus sum/count of the score, for distribution and average.
+# count(*) rather than count(id) keeps them index-only scans of
+# idx_establishments_rating_hygiene and idx_ecoscore.
+RATING_SUMMARY = select(
+    Establishment.rating_value,
+    func.count(),
+    func.sum(Establishment.hygiene_score),
+    func.count(Establishment.hygiene_score),
+).group_by(Establishment.rating_value)
+GRADE_SUMMARY = select(
+    ProductEco.ecoscore_grade,
+    func.count(),
+    func.sum(ProductEco.ecoscore_score),
+    func.count(ProductEco.ecoscore_score),
+).group_by(ProductEco.ecoscore_grade)
+
 
 @router.get("/metrics")
-async def get_metrics(db: Session = Depends(get_db)):
+async def get_metrics(db: AsyncSession = Depends(get_db)):
     """
     Get system metrics and statistics.
     
     Returns performance metrics, cache statistics, and data counts.
     """
     try:
-        # Database metrics
-        establishment_count = db.query(func.count(Establishment.id)).scalar()
-        product_count = db.query(func.count(ProductEco.id)).scalar()
+        # Database counts (one statement, only the day cut-off is bound)
+        # and Redis INFO go to different servers, so await them together
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        counts_result, redis_stats = await asyncio.gather(
+            db.execute(METRICS_COUNTS, {"today": today}),
+            get_redis_client().get_stats(),
+        )
+        counts = counts_result.one()
         db_pool_stats = get_db_stats()
         
-        # Redis metrics
-        redis = get_redis_client()
-        redis_stats = redis.get_stats()
-        
-        # Recent establishments
-        recent_establishments = db.query(func.count(Establishment.id)).filter(
-            Establishment.cached_at >= datetime.utcnow().replace(hour=0, minute=0, second=0)
-        ).scalar()
-        
-        # Recent products
-        recent_products = db.query(func.count(ProductEco.id)).filter(
-            ProductEco.cached_at >= datetime.utcnow().replace(hour=0, minute=0, second=0)
-        ).scalar()
-        
         return {
             "success": True,
             "data": {
                 "database": {
-                    "establishments_total": establishment_count,
-                    "products_total": product_count,
-                    "establishments_today": recent_establishments,
-                    "products_today": recent_products,
+                    "establishments_total": counts.establishments_total,
+                    "products_total": counts.products_total,
+                    "establishments_today": counts.establishments_today,
+                    "products_today": counts.products_today,
                     "pool_stats": db_pool_stats
                 },
                 "cache": {
@@ -79,7 +106,7 @@ async def clear_cache():
     """
     try:
         redis = get_redis_client()
-        redis.flush()
+        await redis.flush()
         
         return {
             "success": True,
@@ -91,26 +118,49 @@ async def clear_cache():
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/cache/invalidate/reference")
+async def invalidate_reference_cache():
+    """
+    Drop every cached reference data result (metadata, lookups, filters).
+    
+    Called by the government data ETL after it reloads the tables; the
+    entries would otherwise keep serving the previous load until they
+    expire.
+    """
+    try:
+        deleted = 0
+        for namespace in REFERENCE_CACHE_NAMESPACES:
+            deleted += await invalidate_namespace(namespace)
+        
+        return {
+            "success": True,
+            "message": "Reference data cache invalidated",
+            "keys_deleted": deleted,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Reference cache invalidation error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.get("/health/detailed")
-async def detailed_health(db: Session = Depends(get_db)):
+async def detailed_health(db: AsyncSession = Depends(get_db)):
     """
     Detailed health check with component status.
     
     Returns health status of all system components.
     """
     try:
-        from api.database.session import check_connection
-        
         # Check PostgreSQL
-        postgres_ok = check_connection()
+        postgres_ok = await check_connection()
         
         # Check Redis
         redis = get_redis_client()
-        redis_ok = redis.check_connection()
+        redis_ok = await redis.check_connection()
         
         # Check database queries
         try:
-            db.query(func.count(Establishment.id)).scalar()
+            await db.scalar(select(func.count(Establishment.id)))
             db_query_ok = True
         except Exception as e:
             logger.error(f"Database query failed: {str(e)}")
@@ -145,43 +195,42 @@ async def detailed_health(db: Session = Depends(get_db)):
 
 
 @router.get("/stats/summary")
-async def get_summary_stats(db: Session = Depends(get_db)):
+async def get_summary_stats(db: AsyncSession = Depends(get_db)):
     """
     Get summary statistics across all data sources.
     
     Returns aggregated statistics for quick overview.
     """
     try:
-        # Establishment stats
-        total_establishments = db.query(func.count(Establishment.id)).scalar()
+        # Establishment stats: one grouped pass yields the total, the
+        # rating distribution and the sum/count for the average
+        rating_rows = (await db.execute(RATING_SUMMARY)).all()
         
+        total_establishments = sum(row[1] for row in rating_rows)
+        rating_counts = {rating: count for rating, count, _, _ in rating_rows}
         rating_dist = {}
         for rating in ["5", "4", "3", "2", "1", "0"]:
-            count = db.query(func.count(Establishment.id)).filter(
-                Establishment.rating_value == rating
-            ).scalar()
+            count = rating_counts.get(rating, 0)
             if count > 0:
                 rating_dist[rating] = count
         
-        # Product stats
-        total_products = db.query(func.count(ProductEco.id)).scalar()
+        # Product stats, same shape
+        grade_rows = (await db.execute(GRADE_SUMMARY)).all()
         
+        total_products = sum(row[1] for row in grade_rows)
+        grade_counts = {grade: count for grade, count, _, _ in grade_rows}
         ecoscore_dist = {}
         for grade in ["a", "b", "c", "d", "e"]:
-            count = db.query(func.count(ProductEco.id)).filter(
-                ProductEco.ecoscore_grade == grade
-            ).scalar()
+            count = grade_counts.get(grade, 0)
             if count > 0:
                 ecoscore_dist[grade] = count
         
         # Average scores
-        avg_hygiene = db.query(func.avg(Establishment.hygiene_score)).filter(
-            Establishment.hygiene_score.isnot(None)
-        ).scalar()
+        hygiene_count = sum(row[3] for row in rating_rows)
+        avg_hygiene = sum(row[2] or 0 for row in rating_rows) / hygiene_count if hygiene_count else None
         
-        avg_ecoscore = db.query(func.avg(ProductEco.ecoscore_score)).filter(
-            ProductEco.ecoscore_score.isnot(None)
-        ).scalar()
+        ecoscore_count = sum(row[3] for row in grade_rows)
+        avg_ecoscore = sum(row[2] or 0 for row in grade_rows) / ecoscore_count if ecoscore_count else None
         
         return {
             "success": True,
@@ -6,10 +6,11 @@ import logging
 import time
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.database.session import get_db
+from api.etag import check_etag
 from api.repositories.fsa_repository import FSARepository
 # ADD THIS IMPORT:
 from src.api.services.fsa_service import get_fsa_service, FSAAPIError
@@ -24,25 +25,25 @@ async def get_nearby_establishments(
     lon: float = Query(..., description="Longitude", ge=-180, le=180),
     radius: int = Query(1, description="Search radius in miles", ge=1, le=10),
     limit: int = Query(20, ge=1, le=100, description="Maximum results"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Find establishments near geographic coordinates.
     
     Returns establishments within the specified radius sorted by distance.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         repo = FSARepository(db)
-        results = repo.get_nearby_establishments(
+        results = await repo.get_nearby_establishments(
             latitude=lat,
             longitude=lon,
             radius_miles=radius,
             limit=limit
         )
         
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "success": True,
@@ -65,25 +66,25 @@ async def search_establishments(
     postcode: Optional[str] = Query(None, description="UK postcode"),
     rating_value: Optional[str] = Query(None, description="Rating filter (0-5)"),
     limit: int = Query(20, ge=1, le=100, description="Maximum results"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Search for food establishments by name, postcode, or rating.
     
     Returns establishment hygiene rating data from the FSA.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         repo = FSARepository(db)
-        results = repo.search_establishments(
+        results = await repo.search_establishments(
             name=name,
             postcode=postcode,
             rating_value=rating_value,
             limit=limit
         )
         
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "success": True,
@@ -115,7 +116,7 @@ async def search_establishments_live(
     This endpoint fetches fresh data directly from the FSA API.
     Use this when you need the most up-to-date information.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         fsa_service = get_fsa_service()
@@ -123,7 +124,7 @@ async def search_establishments_live(
         # Choose search method based on parameters
         if postcode and not local_authority:
             # Search by postcode (with automatic local authority lookup)
-            results = fsa_service.search_establishments_by_postcode(
+            results = await fsa_service.search_establishments_by_postcode(
                 postcode=postcode,
                 name=name,
                 rating_key=rating_key,
@@ -132,7 +133,7 @@ async def search_establishments_live(
             )
         elif local_authority:
             # Search by local authority name
-            results = fsa_service.search_establishments_by_area(
+            results = await fsa_service.search_establishments_by_area(
                 local_authority_name=local_authority,
                 name=name,
                 postcode=postcode,
@@ -147,7 +148,7 @@ async def search_establishments_live(
             )
         
         establishments = results.get('establishments', [])
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "success": True,
@@ -175,20 +176,20 @@ async def search_establishments_live(
 @router.get("/statistics/{postcode}")
 async def get_postcode_statistics(
     postcode: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get hygiene rating statistics for a postcode area.
     
     Returns aggregated statistics including rating distribution and averages.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         repo = FSARepository(db)
-        stats = repo.get_statistics_by_postcode(postcode)
+        stats = await repo.get_statistics_by_postcode(postcode)
         
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "success": True,
@@ -204,24 +205,32 @@ async def get_postcode_statistics(
     
 @router.get("/{fhrsid}")
 async def get_establishment(
+    request: Request,
+    response: Response,
     fhrsid: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get detailed information for a specific establishment by FHRSID.
     
     Returns comprehensive hygiene rating data including scores and location.
+    The ETag covers the establishment data (not the timing meta); a
+    matching If-None-Match is answered with 304.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         repo = FSARepository(db)
-        result = repo.get_establishment(fhrsid)
+        result = await repo.get_establishment(fhrsid)
         
         if not result:
             raise HTTPException(status_code=404, detail="Establishment not found")
         
-        process_time = (time.time() - start_time) * 1000
+        not_modified = check_etag(request, response, result)
+        if not_modified:
+            return not_modified
+        
+        process_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "success": True,
@@ -247,13 +256,13 @@ async def get_establishment_live(
     
     Use this when you need the most current information for an establishment.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         fsa_service = get_fsa_service()
-        result = fsa_service.get_establishment_details(fhrsid)
+        result = await fsa_service.get_establishment_details(fhrsid)
         
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "success": True,
@@ -1,68 +1,110 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from src.api.database.session import get_db
-from src.api.services.food_service import FoodService
+from src.api.etag import check_etag
+from src.api.repositories.pagination import decode_cursor, encode_cursor
+from src.api.repositories.food_balance_repository import FoodBalanceRepository
+from src.api.services.food_service import FoodService, construct_list, get_food_service, export_ndjson, has_records, session_scope, stream_json_array
 from src.api.schemas.food_balance import FoodBalanceResponse, FoodBalanceFilter
 
 router = APIRouter(prefix="/food-balance", tags=["Food Balance"])
 
 
 @router.get("/", response_model=List[FoodBalanceResponse])
-def get_food_balance_data(
+async def get_food_balance_data(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page (replaces skip)"),
+    service: FoodService = Depends(get_food_service)
 ):
     """
     Get all food balance data with pagination
+    
+    Pass the X-Next-Cursor response header back as cursor to fetch the
+    next page; keyset paging stays fast at any depth, unlike skip.
     """
-    service = FoodService(db)
-    return service.get_food_balance_data(skip=skip, limit=limit)
+    try:
+        after = decode_cursor(cursor, service.food_balance_repo.page_key) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    results, next_key = await service.get_food_balance_data(skip=skip, limit=limit, after=after)
+    if next_key is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_key)
+    return results
+
+
+@router.get("/export")
+async def export_food_balance_data(request: Request):
+    """
+    Stream every food balance record as newline-delimited JSON
+    
+    Rows are fetched and written in chunks, so memory stays bounded
+    regardless of table size.
+    """
+    return StreamingResponse(
+        export_ndjson(session_scope(request), FoodBalanceRepository, FoodBalanceResponse),
+        media_type="application/x-ndjson"
+    )
 
 
 @router.post("/filter", response_model=List[FoodBalanceResponse])
-def filter_food_balance_data(
+async def filter_food_balance_data(
+    response: Response,
     filters: FoodBalanceFilter,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    service: FoodService = Depends(get_food_service)
 ):
     """
     Filter food balance data based on criteria
+    
+    The total number of matches is returned in the X-Total-Count header.
     """
-    service = FoodService(db)
-    return service.get_food_balance_by_filters(filters=filters, skip=skip, limit=limit)
+    results, total = await service.get_food_balance_by_filters(filters=filters, skip=skip, limit=limit)
+    response.headers["X-Total-Count"] = str(total)
+    return results
 
 
 @router.get("/metadata")
-def get_food_balance_metadata(db: Session = Depends(get_db)):
+async def get_food_balance_metadata(
+    request: Request,
+    response: Response,
+    service: FoodService = Depends(get_food_service)
+):
     """
     Get metadata about available food labels, years, and units
+    
+    Supports If-None-Match; an unchanged result is answered with 304.
     """
-    service = FoodService(db)
-    metadata = service.get_food_balance_metadata()
+    metadata = await service.get_food_balance_metadata()
+    metadata['unique_units'] = await service.food_balance_repo.get_unique_units()
     
-    from src.api.repositories.food_balance_repository import FoodBalanceRepository
-    repo = FoodBalanceRepository(db)
-    metadata['unique_units'] = repo.get_unique_units()
+    not_modified = check_etag(request, response, metadata)
+    if not_modified:
+        return not_modified
     
     return metadata
 
 
 @router.get("/by-primary-key", response_model=FoodBalanceResponse)
-def get_by_primary_key(
+async def get_by_primary_key(
+    request: Request,
+    response: Response,
     food_label: str = Query(..., description="Food label"),
     year: int = Query(..., description="Year"),
     unit: str = Query(..., description="Unit"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get a specific record by composite primary key (food_label, year, unit)
+    
+    Supports If-None-Match; an unchanged record is answered with 304.
     """
-    from src.api.repositories.food_balance_repository import FoodBalanceRepository
     repo = FoodBalanceRepository(db)
-    record = repo.get_by_primary_key(food_label, year, unit)
+    record = await repo.get_by_primary_key(food_label, year, unit)
     
     if not record:
         raise HTTPException(
@@ -70,58 +112,71 @@ def get_by_primary_key(
             detail=f"No record found for food_label='{food_label}', year={year}, unit='{unit}'"
         )
     
-    return FoodBalanceResponse.from_orm(record)
+    not_modified = check_etag(request, response, record.to_dict())
+    if not_modified:
+        return not_modified
+    
+    return FoodBalanceResponse.model_validate(record)
 
 
 @router.get("/by-food-label/{food_label}", response_model=List[FoodBalanceResponse])
-def get_by_food_label(
+async def get_by_food_label(
     food_label: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all records for a specific food label
     """
-    from src.api.repositories.food_balance_repository import FoodBalanceRepository
     repo = FoodBalanceRepository(db)
-    records = repo.get_by_food_label(food_label)
+    records = await repo.get_by_food_label(food_label)
     
     if not records:
         raise HTTPException(status_code=404, detail=f"No records found for food label: {food_label}")
     
-    return [FoodBalanceResponse.from_orm(record) for record in records]
+    return construct_list(FoodBalanceResponse, records)
 
 
 @router.get("/by-year/{year}", response_model=List[FoodBalanceResponse])
-def get_by_year(
+async def get_by_year(
     year: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all records for a specific year
+    
+    The array is streamed in chunks rather than built in memory first.
     """
-    from src.api.repositories.food_balance_repository import FoodBalanceRepository
-    repo = FoodBalanceRepository(db)
-    records = repo.get_by_year(year)
+    def records(session: AsyncSession, chunk_size: int):
+        return FoodBalanceRepository(session, cache_enabled=False).stream_by_year(year, chunk_size)
     
-    if not records:
+    if not await has_records(db, records):
         raise HTTPException(status_code=404, detail=f"No records found for year: {year}")
     
-    return [FoodBalanceResponse.from_orm(record) for record in records]
+    return StreamingResponse(
+        stream_json_array(session_scope(request), records, FoodBalanceResponse),
+        media_type="application/json"
+    )
 
 
 @router.get("/by-unit/{unit}", response_model=List[FoodBalanceResponse])
-def get_by_unit(
+async def get_by_unit(
     unit: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all records for a specific unit
+    
+    The array is streamed in chunks rather than built in memory first.
     """
-    from src.api.repositories.food_balance_repository import FoodBalanceRepository
-    repo = FoodBalanceRepository(db)
-    records = repo.get_by_unit(unit)
+    def records(session: AsyncSession, chunk_size: int):
+        return FoodBalanceRepository(session, cache_enabled=False).stream_by_unit(unit, chunk_size)
     
-    if not records:
+    if not await has_records(db, records):
         raise HTTPException(status_code=404, detail=f"No records found for unit: {unit}")
     
-    return [FoodBalanceResponse.from_orm(record) for record in records]
\ No newline at end of file
+    return StreamingResponse(
+        stream_json_array(session_scope(request), records, FoodBalanceResponse),
+        media_type="application/json"
+    )
\ No newline at end of file
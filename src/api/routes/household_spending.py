@@ -1,80 +1,127 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from src.api.database.session import get_db
-from src.api.services.food_service import FoodService
+from src.api.etag import check_etag
+from src.api.repositories.pagination import decode_cursor, encode_cursor
+from src.api.repositories.household_spending_repository import HouseholdSpendingRepository
+from src.api.services.food_service import FoodService, construct_list, get_food_service, export_ndjson, has_records, session_scope, stream_json_array
 from src.api.schemas.household_spending import HouseholdSpendingResponse, HouseholdSpendingFilter
 
 router = APIRouter(prefix="/household-spending", tags=["Household Spending"])
 
 
 @router.get("/", response_model=List[HouseholdSpendingResponse])
-def get_household_spending_data(
+async def get_household_spending_data(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page (replaces skip)"),
+    service: FoodService = Depends(get_food_service)
 ):
     """
     Get all household spending data with pagination
+    
+    Pass the X-Next-Cursor response header back as cursor to fetch the
+    next page; keyset paging stays fast at any depth, unlike skip.
     """
-    service = FoodService(db)
-    return service.get_household_spending_data(skip=skip, limit=limit)
+    try:
+        after = decode_cursor(cursor, service.household_spending_repo.page_key) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    results, next_key = await service.get_household_spending_data(skip=skip, limit=limit, after=after)
+    if next_key is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_key)
+    return results
+
+
+@router.get("/export")
+async def export_household_spending_data(request: Request):
+    """
+    Stream every household spending record as newline-delimited JSON
+    
+    Rows are fetched and written in chunks, so memory stays bounded
+    regardless of table size.
+    """
+    return StreamingResponse(
+        export_ndjson(session_scope(request), HouseholdSpendingRepository, HouseholdSpendingResponse),
+        media_type="application/x-ndjson"
+    )
 
 
 @router.post("/filter", response_model=List[HouseholdSpendingResponse])
-def filter_household_spending_data(
+async def filter_household_spending_data(
+    response: Response,
     filters: HouseholdSpendingFilter,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    service: FoodService = Depends(get_food_service)
 ):
     """
     Filter household spending data based on criteria
+    
+    The total number of matches is returned in the X-Total-Count header.
     """
-    service = FoodService(db)
-    return service.get_household_spending_by_filters(filters=filters, skip=skip, limit=limit)
+    results, total = await service.get_household_spending_by_filters(filters=filters, skip=skip, limit=limit)
+    response.headers["X-Total-Count"] = str(total)
+    return results
 
 
 @router.get("/metadata")
-def get_household_spending_metadata(db: Session = Depends(get_db)):
+async def get_household_spending_metadata(
+    request: Request,
+    response: Response,
+    service: FoodService = Depends(get_food_service)
+):
     """
     Get metadata about available food codes and years
+    
+    Supports If-None-Match; an unchanged result is answered with 304.
     """
-    service = FoodService(db)
-    return service.get_household_spending_metadata()
+    metadata = await service.get_household_spending_metadata()
+    not_modified = check_etag(request, response, metadata)
+    if not_modified:
+        return not_modified
+    
+    return metadata
 
 
 @router.get("/by-food-code/{food_code}", response_model=List[HouseholdSpendingResponse])
-def get_by_food_code(
+async def get_by_food_code(
     food_code: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all records for a specific food code
     """
-    from src.api.repositories.household_spending_repository import HouseholdSpendingRepository
     repo = HouseholdSpendingRepository(db)
-    records = repo.get_by_food_code(food_code)
+    records = await repo.get_by_food_code(food_code)
     
     if not records:
         raise HTTPException(status_code=404, detail=f"No records found for food code: {food_code}")
     
-    return [HouseholdSpendingResponse.from_orm(record) for record in records]
+    return construct_list(HouseholdSpendingResponse, records)
 
 
 @router.get("/by-year/{year}", response_model=List[HouseholdSpendingResponse])
-def get_by_year(
+async def get_by_year(
     year: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get all records for a specific year
+    
+    The array is streamed in chunks rather than built in memory first.
     """
-    from src.api.repositories.household_spending_repository import HouseholdSpendingRepository
-    repo = HouseholdSpendingRepository(db)
-    records = repo.get_by_year(year)
+    def records(session: AsyncSession, chunk_size: int):
+        return HouseholdSpendingRepository(session, cache_enabled=False).stream_by_year(year, chunk_size)
     
-    if not records:
+    if not await has_records(db, records):
         raise HTTPException(status_code=404, detail=f"No records found for year: {year}")
     
-    return [HouseholdSpendingResponse.from_orm(record) for record in records]
\ No newline at end of file
+    return StreamingResponse(
+        stream_json_array(session_scope(request), records, HouseholdSpendingResponse),
+        media_type="application/json"
+    )
\ No newline at end of file
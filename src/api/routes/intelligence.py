@@ -4,23 +4,67 @@ API routes for intelligence endpoints (aggregated insights).
 
 import logging
 import time
-from typing import List
+from typing import Annotated, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi.exceptions import RequestValidationError
+from pydantic import Field, TypeAdapter, ValidationError
 
-from api.database.session import get_db
-from api.services.intelligence_service import IntelligenceService
+from api.services.intelligence_service import IntelligenceService, get_intelligence_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Validators for the comma-separated /compare lists, built once
+FHRSID_LIST = TypeAdapter(Annotated[List[int], Field(max_length=5)])
+BARCODE_LIST = TypeAdapter(Annotated[List[str], Field(max_length=5)])
+
+
+def _parse_csv(adapter: TypeAdapter, name: str, value: Optional[str]) -> list:
+    """
+    Validate a comma-separated query parameter as a list.
+    
+    Args:
+        adapter: Validator for the resulting list
+        name: Query parameter name, used in error locations
+        value: Raw parameter value
+        
+    Returns:
+        Validated items (empty if the parameter is absent)
+        
+    Raises:
+        RequestValidationError: If an item or the item count is invalid (422)
+    """
+    if not value:
+        return []
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    try:
+        return adapter.validate_python(items)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("query", name, *error["loc"])} for error in e.errors()]
+        )
+
+
+def parse_fhrsids(
+    fhrsids: Optional[str] = Query(None, description="Comma-separated establishment IDs (max 5)")
+) -> List[int]:
+    """Parse the fhrsids query parameter."""
+    return _parse_csv(FHRSID_LIST, "fhrsids", fhrsids)
+
+
+def parse_barcodes(
+    barcodes: Optional[str] = Query(None, description="Comma-separated product barcodes (max 5)")
+) -> List[str]:
+    """Parse the barcodes query parameter."""
+    return _parse_csv(BARCODE_LIST, "barcodes", barcodes)
+
 
 @router.get("/district/{postcode}")
 async def get_district_intelligence(
     postcode: str,
-    db: Session = Depends(get_db)
+    service: IntelligenceService = Depends(get_intelligence_service)
 ):
     """
     Get comprehensive district intelligence by postcode.
@@ -28,13 +72,12 @@ async def get_district_intelligence(
     Combines FSA hygiene data with eco-score insights to provide
     a complete picture of sustainability and food safety in the area.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
-        service = IntelligenceService(db)
-        result = service.get_district_intelligence(postcode)
+        result = await service.get_district_intelligence(postcode)
         
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "success": True,
@@ -52,18 +95,17 @@ async def get_district_intelligence(
 async def get_establishment_with_products(
     fhrsid: int,
     category: str = Query(None, description="Product category filter"),
-    db: Session = Depends(get_db)
+    service: IntelligenceService = Depends(get_intelligence_service)
 ):
     """
     Get establishment with nearby sustainable product options.
     
     Returns establishment details along with recommended eco-friendly products.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
-        service = IntelligenceService(db)
-        result = service.get_establishment_with_nearby_products(
+        result = await service.get_establishment_with_nearby_products(
             fhrsid=fhrsid,
             product_category=category
         )
@@ -71,7 +113,7 @@ async def get_establishment_with_products(
         if "error" in result:
             raise HTTPException(status_code=404, detail=result["error"])
         
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "success": True,
@@ -89,40 +131,30 @@ async def get_establishment_with_products(
 
 @router.get("/compare")
 async def compare_establishments_and_products(
-    fhrsids: str = Query(None, description="Comma-separated establishment IDs (max 5)"),
-    barcodes: str = Query(None, description="Comma-separated product barcodes (max 5)"),
-    db: Session = Depends(get_db)
+    fhrsid_list: List[int] = Depends(parse_fhrsids),
+    barcode_list: List[str] = Depends(parse_barcodes),
+    service: IntelligenceService = Depends(get_intelligence_service)
 ):
     """
     Compare multiple establishments and products.
     
     Provides side-by-side comparison of hygiene ratings and eco-scores.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
-        # Parse IDs
-        fhrsid_list = []
-        if fhrsids:
-            fhrsid_list = [int(f.strip()) for f in fhrsids.split(",") if f.strip()]
-        
-        barcode_list = []
-        if barcodes:
-            barcode_list = [b.strip() for b in barcodes.split(",") if b.strip()]
-        
         if not fhrsid_list and not barcode_list:
             raise HTTPException(
                 status_code=400,
                 detail="Must provide at least one establishment ID or product barcode"
             )
         
-        service = IntelligenceService(db)
-        result = service.compare_establishments_and_products(
+        result = await service.compare_establishments_and_products(
             fhrsids=fhrsid_list,
             barcodes=barcode_list
         )
         
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "success": True,
@@ -133,8 +165,6 @@ async def compare_establishments_and_products(
         }
     except HTTPException:
         raise
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid ID format: {str(e)}")
     except Exception as e:
         logger.error(f"Comparison error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -143,20 +173,19 @@ async def compare_establishments_and_products(
 @router.get("/category/{category}/insights")
 async def get_category_insights(
     category: str,
-    db: Session = Depends(get_db)
+    service: IntelligenceService = Depends(get_intelligence_service)
 ):
     """
     Get comprehensive insights for a product category.
     
     Returns statistics, top products, and eco-friendly recommendations.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
-        service = IntelligenceService(db)
-        result = service.get_category_insights(category)
+        result = await service.get_category_insights(category)
         
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "success": True,
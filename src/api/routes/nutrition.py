@@ -1,50 +1,83 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
 from src.api.database.session import get_db
-from src.api.services.food_service import FoodService
-from src.api.schemas.nutrition import NutritionResponse, NutritionFilter
+from src.api.repositories.pagination import decode_cursor, encode_cursor, row_key
+from src.api.repositories.nutrition_repository import NutritionRepository
+from src.api.services.food_service import FoodService, construct_list, get_food_service, export_ndjson, session_scope
+from src.api.schemas.nutrition import NutritionResponse, NutritionFilter, NutritionSummary
 
 router = APIRouter(prefix="/nutrition", tags=["Nutrition"])
 
 
 @router.get("/", response_model=List[NutritionResponse])
-def get_nutrition_data(
+async def get_nutrition_data(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page (replaces skip)"),
+    service: FoodService = Depends(get_food_service)
 ):
     """
     Get all nutrition data with pagination
+    
+    Pass the X-Next-Cursor response header back as cursor to fetch the
+    next page; keyset paging stays fast at any depth, unlike skip.
     """
-    service = FoodService(db)
-    return service.get_nutrition_data(skip=skip, limit=limit)
+    try:
+        after = decode_cursor(cursor, service.nutrition_repo.page_key) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    results, next_key = await service.get_nutrition_data(skip=skip, limit=limit, after=after)
+    if next_key is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(next_key)
+    return results
+
+
+@router.get("/export")
+async def export_nutrition_data(request: Request):
+    """
+    Stream every nutrition record as newline-delimited JSON
+    
+    Rows are fetched and written in chunks, so memory stays bounded
+    regardless of table size.
+    """
+    return StreamingResponse(
+        export_ndjson(session_scope(request), NutritionRepository, NutritionResponse),
+        media_type="application/x-ndjson"
+    )
 
 
 @router.post("/filter", response_model=List[NutritionResponse])
-def filter_nutrition_data(
+async def filter_nutrition_data(
+    response: Response,
     filters: NutritionFilter,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    service: FoodService = Depends(get_food_service)
 ):
     """
     Filter nutrition data based on criteria
+    
+    The total number of matches is returned in the X-Total-Count header.
     """
-    service = FoodService(db)
-    return service.get_nutrition_by_filters(filters=filters, skip=skip, limit=limit)
+    results, total = await service.get_nutrition_by_filters(filters=filters, skip=skip, limit=limit)
+    response.headers["X-Total-Count"] = str(total)
+    return results
 
 
-@router.get("/search/{search_term}", response_model=List[NutritionResponse])
-def search_nutrition(
+# Summary first: a summary row fits both, a full row sets more NutritionResponse fields
+@router.get("/search/{search_term}", response_model=Union[List[NutritionSummary], List[NutritionResponse]])
+async def search_nutrition(
     search_term: str,
-    db: Session = Depends(get_db)
+    summary: bool = Query(False, description="Return only food_name, energy_kcal and protein_g"),
+    service: FoodService = Depends(get_food_service)
 ):
     """
     Search nutrition data by food name
     """
-    service = FoodService(db)
-    results = service.search_nutrition(search_term)
+    results = await service.search_nutrition(search_term, summary)
     
     if not results:
         raise HTTPException(status_code=404, detail=f"No nutrition data found matching: {search_term}")
@@ -53,15 +86,14 @@ def search_nutrition(
 
 
 @router.get("/by-name/{food_name}", response_model=NutritionResponse)
-def get_by_food_name(
+async def get_by_food_name(
     food_name: str,
-    db: Session = Depends(get_db)
+    service: FoodService = Depends(get_food_service)
 ):
     """
     Get nutrition data for a specific food item
     """
-    service = FoodService(db)
-    result = service.get_nutrition_by_name(food_name)
+    result = await service.get_nutrition_by_name(food_name)
     
     if not result:
         raise HTTPException(status_code=404, detail=f"Nutrition data not found for: {food_name}")
@@ -70,34 +102,48 @@ def get_by_food_name(
 
 
 @router.get("/high-protein", response_model=List[NutritionResponse])
-def get_high_protein_foods(
+async def get_high_protein_foods(
+    response: Response,
     min_protein: float = Query(10.0, ge=0, description="Minimum protein content in grams"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page (replaces skip)"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get foods with high protein content
     """
-    from src.api.repositories.nutrition_repository import NutritionRepository
     repo = NutritionRepository(db)
-    records = repo.get_high_protein_foods(min_protein=min_protein, skip=skip, limit=limit)
+    try:
+        after = decode_cursor(cursor, repo.high_protein_key) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    records = await repo.get_high_protein_foods(min_protein=min_protein, skip=skip, limit=limit, after=after)
+    if len(records) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(row_key(records[-1], repo.high_protein_key))
     
-    return [NutritionResponse.from_orm(record) for record in records]
+    return construct_list(NutritionResponse, records)
 
 
 @router.get("/low-calorie", response_model=List[NutritionResponse])
-def get_low_calorie_foods(
+async def get_low_calorie_foods(
+    response: Response,
     max_calories: float = Query(100.0, ge=0, description="Maximum calorie content in kcal"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page (replaces skip)"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get low calorie foods
     """
-    from src.api.repositories.nutrition_repository import NutritionRepository
     repo = NutritionRepository(db)
-    records = repo.get_low_calorie_foods(max_calories=max_calories, skip=skip, limit=limit)
+    try:
+        after = decode_cursor(cursor, repo.low_calorie_key) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    records = await repo.get_low_calorie_foods(max_calories=max_calories, skip=skip, limit=limit, after=after)
+    if len(records) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(row_key(records[-1], repo.low_calorie_key))
     
-    return [NutritionResponse.from_orm(record) for record in records]
\ No newline at end of file
+    return construct_list(NutritionResponse, records)
\ No newline at end of file
@@ -7,7 +7,7 @@ import time
 from typing import Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.database.session import get_db
 from api.repositories.off_repository import OFFRepository
@@ -16,35 +16,37 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+VALID_ECOSCORES = frozenset("abcde")
+
 @router.get("/search")
 async def search_products(
     query: Optional[str] = Query(None, description="Search terms"),
     category: Optional[str] = Query(None, description="Product category"),
     ecoscore: Optional[str] = Query(None, description="Eco-score grade (a-e)"),
     limit: int = Query(20, ge=1, le=100, description="Maximum results"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Search for products by name, category, or eco-score.
     
     Returns products with eco-score and nutrition information.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         # Validate ecoscore if provided
-        if ecoscore and ecoscore.lower() not in ['a', 'b', 'c', 'd', 'e']:
+        if ecoscore and ecoscore.lower() not in VALID_ECOSCORES:
             raise HTTPException(status_code=400, detail="Invalid ecoscore. Must be a, b, c, d, or e")
         
         repo = OFFRepository(db)
-        results = repo.search_products(
+        results = await repo.search_products(
             search_terms=query,
             category=category,
             ecoscore_grade=ecoscore.lower() if ecoscore else None,
             limit=limit
         )
         
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "success": True,
@@ -69,14 +71,14 @@ async def search_products(
 @router.get("/compare")
 async def compare_products(
     barcodes: str = Query(..., description="Comma-separated barcodes (max 5)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Compare multiple products by barcode.
     
     Returns comparison data for eco-scores and nutrition across products.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         # Parse barcodes
@@ -89,9 +91,9 @@ async def compare_products(
             raise HTTPException(status_code=400, detail="Maximum 5 products can be compared")
         
         repo = OFFRepository(db)
-        results = repo.compare_products(barcode_list)
+        results = await repo.compare_products(barcode_list)
         
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         # Calculate comparison metrics
         valid_products = [p for p in results if "error" not in p]
@@ -131,24 +133,24 @@ async def get_category_top_eco(
     category: str,
     limit: int = Query(10, ge=1, le=50, description="Maximum results"),
     min_score: int = Query(70, ge=0, le=100, description="Minimum eco-score"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get top eco-friendly products in a category.
     
     Returns products with the highest eco-scores in the specified category.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         repo = OFFRepository(db)
-        results = repo.get_top_eco_products(
+        results = await repo.get_top_eco_products(
             category=category,
             limit=limit,
             min_ecoscore=min_score
         )
         
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "success": True,
@@ -168,20 +170,24 @@ async def get_category_top_eco(
 @router.get("/categories/{category}/statistics")
 async def get_category_statistics(
     category: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get eco-score statistics for a product category.
     
     Returns distribution and averages of eco-scores in the category.
+    The category must match one of a product's categories exactly
+    (case-insensitive); partial names are not supported, so "milk" does
+    not count products only in "chocolate milk". Counts are refreshed
+    periodically and may lag recent product updates by a few minutes.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         repo = OFFRepository(db)
-        stats = repo.get_category_statistics(category)
+        stats = await repo.get_category_statistics(category)
         
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "success": True,
@@ -197,23 +203,23 @@ async def get_category_statistics(
 @router.get("/{barcode}")
 async def get_product(
     barcode: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get product information by barcode.
     
     Returns eco-score, nutri-score, and environmental impact data.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         repo = OFFRepository(db)
-        result = repo.get_product(barcode)
+        result = await repo.get_product(barcode)
         
         if not result:
             raise HTTPException(status_code=404, detail="Product not found")
         
-        process_time = (time.time() - start_time) * 1000
+        process_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "success": True,
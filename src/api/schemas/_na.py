@@ -0,0 +1,27 @@
+"""
+Shared handling of NA markers in imported food data.
+Validators of the food schemas map these strings to None.
+"""
+
+from typing import Any, FrozenSet
+
+NA_TOKENS: FrozenSet[str] = frozenset(("NA", "NULL", ""))
+
+# Numeric columns also treat NaN as missing
+NUMERIC_NA_TOKENS: FrozenSet[str] = NA_TOKENS | {"NAN"}
+
+
+def na_to_none(value: Any, tokens: FrozenSet[str] = NA_TOKENS) -> Any:
+    """
+    Map None and NA marker strings to None, pass anything else through.
+
+    Args:
+        value: Raw field value
+        tokens: Upper-case markers that mean "missing"
+
+    Returns:
+        None or the unchanged value
+    """
+    if type(value) is str and value.upper() in tokens:
+        return None
+    return value
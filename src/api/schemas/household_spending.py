@@ -1,22 +1,20 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional
-from decimal import Decimal
+from ._na import na_to_none
 
 
 class HouseholdSpendingBase(BaseModel):
     food_code: str = Field(..., description="Food category code (text)")
     units: Optional[str] = Field(None, description="Unit of measurement (text)")
     years: int = Field(..., ge=1900, le=2100, description="Year of the data (integer)")
-    amount: Optional[Decimal] = Field(None, description="Spending amount (numeric)")
+    amount: Optional[float] = Field(None, description="Spending amount (numeric)")
     rse_indicator: Optional[str] = Field(None, description="RSE indicator (text)")
     
     @field_validator('units', 'rse_indicator', 'amount', mode='before')
     @classmethod
     def handle_na_values(cls, v):
         """Handle NA/None values"""
-        if v is None or (isinstance(v, str) and v.upper() in ['NA', 'NULL', '']):
-            return None
-        return v
+        return na_to_none(v)
 
 
 class HouseholdSpendingCreate(HouseholdSpendingBase):
@@ -27,11 +25,8 @@ class HouseholdSpendingCreate(HouseholdSpendingBase):
 class HouseholdSpendingResponse(HouseholdSpendingBase):
     """Schema for household spending response"""
     
-    class Config:
-        from_attributes = True
-        json_encoders = {
-            Decimal: float
-        }
+    model_config = ConfigDict(from_attributes=True)
+
 
 
 class HouseholdSpendingFilter(BaseModel):
@@ -42,10 +37,5 @@ class HouseholdSpendingFilter(BaseModel):
     max_year: Optional[int] = Field(None, description="Filter by maximum year")
     units: Optional[str] = Field(None, description="Filter by units (exact match)")
     rse_indicator: Optional[str] = Field(None, description="Filter by RSE indicator (exact match)")
-    min_amount: Optional[Decimal] = Field(None, description="Filter by minimum amount")
-    max_amount: Optional[Decimal] = Field(None, description="Filter by maximum amount")
-    
-    class Config:
-        json_encoders = {
-            Decimal: float
-        }
\ No newline at end of file
+    min_amount: Optional[float] = Field(None, description="Filter by minimum amount")
+    max_amount: Optional[float] = Field(None, description="Filter by maximum amount")
\ No newline at end of file
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional
+from ._na import NUMERIC_NA_TOKENS, na_to_none
 
 
 class NutritionBase(BaseModel):
@@ -22,9 +23,7 @@ class NutritionBase(BaseModel):
     @classmethod
     def handle_na_values(cls, v):
         """Handle NA/None values for all numeric fields"""
-        if v is None or (isinstance(v, str) and v.upper() in ['NA', 'NULL', '', 'NAN']):
-            return None
-        return v
+        return na_to_none(v, NUMERIC_NA_TOKENS)
 
 
 class NutritionCreate(NutritionBase):
@@ -35,8 +34,16 @@ class NutritionCreate(NutritionBase):
 class NutritionResponse(NutritionBase):
     """Schema for nutrition response"""
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NutritionSummary(BaseModel):
+    """Schema for summary search results (name, energy and protein only)"""
+    food_name: str = Field(..., description="Name of the food item (text)")
+    energy_kcal: Optional[float] = Field(None, description="Energy in kcal per 100g (double precision)")
+    protein_g: Optional[float] = Field(None, description="Protein in grams per 100g (double precision)")
+    
+    model_config = ConfigDict(from_attributes=True)
 
 
 class NutritionFilter(BaseModel):
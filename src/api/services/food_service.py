@@ -1,75 +1,254 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from fastapi import Depends, Request
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+from src.api.database.session import get_db
 from src.api.repositories.food_balance_repository import FoodBalanceRepository
 from src.api.repositories.household_spending_repository import HouseholdSpendingRepository
 from src.api.repositories.nutrition_repository import NutritionRepository
+from src.api.repositories.pagination import row_key
 from src.api.schemas.food_balance import FoodBalanceFilter, FoodBalanceResponse
 from src.api.schemas.household_spending import HouseholdSpendingFilter, HouseholdSpendingResponse
-from src.api.schemas.nutrition import NutritionFilter, NutritionResponse
+from src.api.schemas.nutrition import NutritionFilter, NutritionResponse, NutritionSummary
+from src.core.models.food import FoodBalance, HouseholdSpending
+from src.core.models.nutrition import Nutrition
+
+ResponseT = TypeVar("ResponseT")
+
+# Column attribute names of the ORM models whose rows are built with construct_list
+_COLUMNS = {
+    model: tuple(column.key for column in model.__table__.columns)
+    for model in (FoodBalance, HouseholdSpending, Nutrition)
+}
+
+
+def construct_list(schema: Type[ResponseT], records: Sequence[Any]) -> List[ResponseT]:
+    """
+    Build response models from ORM rows without running validators.
+
+    Rows come from typed columns, so the NA validators have nothing to
+    clean; model_construct skips them and pydantic's per-field checks.
+
+    Args:
+        schema: Response model class
+        records: ORM instances of one model registered in _COLUMNS
+
+    Returns:
+        List of schema instances
+    """
+    if not records:
+        return []
+    columns = _COLUMNS[type(records[0])]
+    return [
+        schema.model_construct(**{column: getattr(record, column) for column in columns})
+        for record in records
+    ]
 
 
 class FoodService:
     """Service layer for food-related operations"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.food_balance_repo = FoodBalanceRepository(db)
         self.household_spending_repo = HouseholdSpendingRepository(db)
         self.nutrition_repo = NutritionRepository(db)
     
     # Food Balance Methods
-    def get_food_balance_data(self, skip: int = 0, limit: int = 100) -> List[FoodBalanceResponse]:
-        """Get all food balance data"""
-        records = self.food_balance_repo.get_all(skip, limit)
-        return [FoodBalanceResponse.from_orm(record) for record in records]
+    async def get_food_balance_data(self, skip: int = 0, limit: int = 100, after: Optional[tuple] = None) -> Tuple[List[FoodBalanceResponse], Optional[tuple]]:
+        """Get all food balance data and the key to resume after (None on the last page)"""
+        records = await self.food_balance_repo.get_all(skip, limit, after)
+        next_key = row_key(records[-1], self.food_balance_repo.page_key) if len(records) == limit else None
+        return construct_list(FoodBalanceResponse, records), next_key
     
-    def get_food_balance_by_filters(self, filters: FoodBalanceFilter, skip: int = 0, limit: int = 100) -> List[FoodBalanceResponse]:
-        """Get filtered food balance data"""
-        records = self.food_balance_repo.get_filtered(filters, skip, limit)
-        return [FoodBalanceResponse.from_orm(record) for record in records]
+    async def get_food_balance_by_filters(self, filters: FoodBalanceFilter, skip: int = 0, limit: int = 100) -> Tuple[List[FoodBalanceResponse], int]:
+        """Get filtered food balance data and the total number of matches"""
+        records, total = await self.food_balance_repo.get_filtered(filters, skip, limit)
+        return construct_list(FoodBalanceResponse, records), total
     
-    def get_food_balance_metadata(self) -> Dict[str, Any]:
+    async def get_food_balance_metadata(self) -> Dict[str, Any]:
         """Get metadata about food balance data"""
         return {
-            "unique_food_labels": self.food_balance_repo.get_unique_food_labels(),
-            "unique_years": self.food_balance_repo.get_unique_years()
+            "unique_food_labels": await self.food_balance_repo.get_unique_food_labels(),
+            "unique_years": await self.food_balance_repo.get_unique_years()
         }
     
     # Household Spending Methods
-    def get_household_spending_data(self, skip: int = 0, limit: int = 100) -> List[HouseholdSpendingResponse]:
-        """Get all household spending data"""
-        records = self.household_spending_repo.get_all(skip, limit)
-        return [HouseholdSpendingResponse.from_orm(record) for record in records]
+    async def get_household_spending_data(self, skip: int = 0, limit: int = 100, after: Optional[tuple] = None) -> Tuple[List[HouseholdSpendingResponse], Optional[tuple]]:
+        """Get all household spending data and the key to resume after (None on the last page)"""
+        records = await self.household_spending_repo.get_all(skip, limit, after)
+        next_key = row_key(records[-1], self.household_spending_repo.page_key) if len(records) == limit else None
+        return construct_list(HouseholdSpendingResponse, records), next_key
     
-    def get_household_spending_by_filters(self, filters: HouseholdSpendingFilter, skip: int = 0, limit: int = 100) -> List[HouseholdSpendingResponse]:
-        """Get filtered household spending data"""
-        records = self.household_spending_repo.get_filtered(filters, skip, limit)
-        return [HouseholdSpendingResponse.from_orm(record) for record in records]
+    async def get_household_spending_by_filters(self, filters: HouseholdSpendingFilter, skip: int = 0, limit: int = 100) -> Tuple[List[HouseholdSpendingResponse], int]:
+        """Get filtered household spending data and the total number of matches"""
+        records, total = await self.household_spending_repo.get_filtered(filters, skip, limit)
+        return construct_list(HouseholdSpendingResponse, records), total
     
-    def get_household_spending_metadata(self) -> Dict[str, Any]:
+    async def get_household_spending_metadata(self) -> Dict[str, Any]:
         """Get metadata about household spending data"""
         return {
-            "unique_food_codes": self.household_spending_repo.get_unique_food_codes(),
-            "unique_years": self.household_spending_repo.get_unique_years()
+            "unique_food_codes": await self.household_spending_repo.get_unique_food_codes(),
+            "unique_years": await self.household_spending_repo.get_unique_years()
         }
     
     # Nutrition Methods
-    def get_nutrition_data(self, skip: int = 0, limit: int = 100) -> List[NutritionResponse]:
-        """Get all nutrition data"""
-        records = self.nutrition_repo.get_all(skip, limit)
-        return [NutritionResponse.from_orm(record) for record in records]
+    async def get_nutrition_data(self, skip: int = 0, limit: int = 100, after: Optional[tuple] = None) -> Tuple[List[NutritionResponse], Optional[tuple]]:
+        """Get all nutrition data and the key to resume after (None on the last page)"""
+        records = await self.nutrition_repo.get_all(skip, limit, after)
+        next_key = row_key(records[-1], self.nutrition_repo.page_key) if len(records) == limit else None
+        return construct_list(NutritionResponse, records), next_key
     
-    def get_nutrition_by_filters(self, filters: NutritionFilter, skip: int = 0, limit: int = 100) -> List[NutritionResponse]:
-        """Get filtered nutrition data"""
-        records = self.nutrition_repo.get_filtered(filters, skip, limit)
-        return [NutritionResponse.from_orm(record) for record in records]
+    async def get_nutrition_by_filters(self, filters: NutritionFilter, skip: int = 0, limit: int = 100) -> Tuple[List[NutritionResponse], int]:
+        """Get filtered nutrition data and the total number of matches"""
+        records, total = await self.nutrition_repo.get_filtered(filters, skip, limit)
+        return construct_list(NutritionResponse, records), total
     
-    def get_nutrition_by_name(self, food_name: str) -> Optional[NutritionResponse]:
+    async def get_nutrition_by_name(self, food_name: str) -> Optional[NutritionResponse]:
         """Get nutrition data by food name"""
-        record = self.nutrition_repo.get_by_food_name(food_name)
-        return NutritionResponse.from_orm(record) if record else None
+        record = await self.nutrition_repo.get_by_food_name(food_name)
+        return NutritionResponse.model_validate(record) if record else None
     
-    def search_nutrition(self, search_term: str) -> List[NutritionResponse]:
-        """Search nutrition data by food name"""
-        records = self.nutrition_repo.search_by_name(search_term)
-        return [NutritionResponse.from_orm(record) for record in records]
\ No newline at end of file
+    async def search_nutrition(self, search_term: str, summary: bool = False) -> Union[List[NutritionResponse], List[NutritionSummary]]:
+        """Search nutrition data by food name (summary: load only name, energy and protein)"""
+        if summary:
+            records = await self.nutrition_repo.search_by_name(search_term, self.nutrition_repo.summary_columns)
+            return [NutritionSummary.model_construct(**record) for record in records]
+        records = await self.nutrition_repo.search_by_name(search_term)
+        return construct_list(NutritionResponse, records)
+
+
+def get_food_service(db: AsyncSession = Depends(get_db)) -> FoodService:
+    """
+    Dependency providing a FoodService bound to the request's session.
+
+    Returns:
+        FoodService instance
+    """
+    return FoodService(db)
+
+
+async def export_ndjson(
+    sessions: Callable[[], AsyncContextManager[AsyncSession]],
+    repository: type,
+    schema: type,
+    chunk_size: int = 1000,
+) -> AsyncIterator[bytes]:
+    """
+    Stream every record of a food repository as NDJSON, one chunk at a time.
+
+    Records are serialized through the response schema, so each line has
+    the same shape as the JSON endpoints. The session is opened only once
+    the body is iterated (see session_scope).
+
+    Args:
+        sessions: Session factory (see session_scope)
+        repository: Food repository class providing stream_all
+        schema: Response model of the records
+        chunk_size: Records per yielded chunk
+
+    Yields:
+        NDJSON bytes
+    """
+    async with sessions() as db:
+        chunk = []
+        async for record in repository(db, cache_enabled=False).stream_all(chunk_size):
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                yield _ndjson_lines(schema, chunk)
+                chunk = []
+        if chunk:
+            yield _ndjson_lines(schema, chunk)
+
+
+def _ndjson_lines(schema: type, records: List[Any]) -> bytes:
+    """Serialize ORM rows through schema as newline-terminated JSON lines."""
+    return "".join(f"{item.model_dump_json()}\n" for item in construct_list(schema, records)).encode()
+
+
+def session_scope(request: Request) -> Callable[[], AsyncContextManager[AsyncSession]]:
+    """
+    Session factory for response bodies that outlive the request's session.
+
+    FastAPI closes yield dependencies before a StreamingResponse body is
+    sent, so streamed bodies open their own session. This uses the get_db
+    provider in effect for the app, so dependency overrides (e.g. a test
+    database) apply to streamed bodies too.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Callable returning an async context manager that yields a session
+    """
+    return asynccontextmanager(request.app.dependency_overrides.get(get_db, get_db))
+
+
+async def has_records(db: AsyncSession, open_stream: Callable[[AsyncSession, int], AsyncIterator[Any]]) -> bool:
+    """
+    Check whether a record stream yields anything, reading at most one row.
+
+    Args:
+        db: Session to probe with (typically the request's own)
+        open_stream: Called with a session and chunk size; returns the
+            record iterator (e.g. a repository's stream_by_* method)
+
+    Returns:
+        True if there is at least one record
+    """
+    records = open_stream(db, 1)
+    try:
+        async for _ in records:
+            return True
+        return False
+    finally:
+        await records.aclose()
+
+
+@lru_cache()
+def _list_adapter(schema: type) -> TypeAdapter:
+    """TypeAdapter serializing a list of schema instances, built once per schema."""
+    return TypeAdapter(List[schema])
+
+
+async def stream_json_array(
+    sessions: Callable[[], AsyncContextManager[AsyncSession]],
+    open_stream: Callable[[AsyncSession, int], AsyncIterator[Any]],
+    schema: type,
+    chunk_size: int = 1000,
+) -> AsyncIterator[bytes]:
+    """
+    Stream food records as one JSON array, chunk_size records per write.
+
+    Records are serialized through the response schema, so the output
+    matches the non-streamed endpoints. The session is opened only once
+    the body is iterated and is closed when it finishes; probe with
+    has_records first to answer 404 for an empty result.
+
+    Args:
+        sessions: Session factory (see session_scope)
+        open_stream: Called with a session and chunk size; returns the
+            record iterator
+        schema: Response model of the records
+        chunk_size: Records per yielded chunk
+
+    Yields:
+        JSON bytes
+    """
+    adapter = _list_adapter(schema)
+    async with sessions() as db:
+        yield b"["
+        separator = b""
+        chunk = []
+        async for record in open_stream(db, chunk_size):
+            chunk.append(record)
+            if len(chunk) == chunk_size:
+                # dump_json gives "[...]"; keep just the items
+                yield separator + adapter.dump_json(construct_list(schema, chunk))[1:-1]
+                separator, chunk = b",", []
+        if chunk:
+            yield separator + adapter.dump_json(construct_list(schema, chunk))[1:-1]
+        yield b"]"
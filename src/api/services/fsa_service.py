@@ -3,21 +3,61 @@ FSA Service Layer.
 Provides business logic for Food Standards Agency data.
 """
 
+import asyncio
+import functools
+import inspect
 import logging
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Optional
 
+from api.config import settings
+from api.database.redis_client import get_redis_client
 from collectors.external_apis.fsa_client import get_fsa_client, FSAAPIError
 
 logger = logging.getLogger(__name__)
 
 
+def single_flight(func: Callable) -> Callable:
+    """
+    Share one upstream call among concurrent callers with equal arguments.
+
+    The first caller starts the call as a task; callers arriving while it
+    is in flight await the same task, and everyone gets its result or
+    exception. The task is shielded, so one caller disconnecting does not
+    cancel it for the others. Nothing is kept once it finishes.
+
+    Keys ignore self; FSAService is a process-wide singleton.
+    """
+    signature = inspect.signature(func)
+    inflight: Dict[Hashable, asyncio.Task] = {}
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(bound.arguments.values())[1:]
+
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(self, *args, **kwargs))
+            inflight[key] = task
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        else:
+            logger.debug(f"Joining in-flight {func.__name__} call")
+        return await asyncio.shield(task)
+
+    return wrapper
+
+
 class FSAService:
     """Service for FSA establishment operations."""
     
     def __init__(self):
         self.client = get_fsa_client()
+        self.redis = get_redis_client()
     
-    def search_establishments_by_postcode(
+    @single_flight
+    async def search_establishments_by_postcode(
         self,
         postcode: str,
         name: Optional[str] = None,
@@ -41,7 +81,7 @@ class FSAService:
             Dictionary with establishments and metadata
         """
         # Get local authority for the postcode
-        local_authority = self.client.get_local_authority_from_postcode(postcode)
+        local_authority = await self.client.get_local_authority_from_postcode_async(postcode)
         
         local_authority_id = None
         if local_authority:
@@ -52,7 +92,7 @@ class FSAService:
             )
         
         # Search with local authority filter
-        return self.client.search_establishments(
+        return await self.client.search_establishments_async(
             postcode=postcode,
             name=name or '',  # Use empty string if no name provided
             local_authority_id=local_authority_id,
@@ -62,7 +102,8 @@ class FSAService:
             page_size=page_size,
         )
     
-    def search_establishments_by_area(
+    @single_flight
+    async def search_establishments_by_area(
         self,
         local_authority_name: str,
         name: Optional[str] = None,
@@ -88,14 +129,14 @@ class FSAService:
             Dictionary with establishments and metadata
         """
         # Look up local authority
-        local_authority = self.client.get_local_authority_by_name(local_authority_name)
+        local_authority = await self.client.get_local_authority_by_name_async(local_authority_name)
         
         if not local_authority:
             raise FSAAPIError(f"Local authority '{local_authority_name}' not found")
         
         local_authority_id = local_authority.get('LocalAuthorityId')
         
-        return self.client.search_establishments(
+        return await self.client.search_establishments_async(
             name=name,
             postcode=postcode,
             local_authority_id=local_authority_id,
@@ -105,19 +146,33 @@ class FSAService:
             page_size=page_size,
         )
     
-    def get_establishment_details(self, fhrsid: int) -> Dict[str, Any]:
+    @single_flight
+    async def get_establishment_details(self, fhrsid: int) -> Dict[str, Any]:
         """
         Get full establishment details.
         
+        Kept in Redis for cache_ttl_live seconds, so a burst of requests
+        for one establishment (across workers too) makes a single upstream
+        call while the data stays effectively live.
+        
         Args:
             fhrsid: Food Hygiene Rating Scheme ID
             
         Returns:
             Establishment details
         """
-        return self.client.get_establishment(fhrsid)
+        cache_key = f"fsa:live:establishment:{fhrsid}"
+        if settings.enable_caching:
+            cached = await self.redis.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        details = await self.client.get_establishment_async(fhrsid)
+        if settings.enable_caching:
+            await self.redis.set(cache_key, details, ttl=settings.cache_ttl_live)
+        return details
     
-    def get_nearby_establishments(
+    async def get_nearby_establishments(
         self,
         latitude: float,
         longitude: float,
@@ -142,7 +197,7 @@ class FSAService:
         Returns:
             Dictionary with nearby establishments
         """
-        return self.client.get_nearby_establishments(
+        return await self.client.get_nearby_establishments_async(
             latitude=latitude,
             longitude=longitude,
             max_distance_limit=max_distance_miles,
@@ -152,22 +207,16 @@ class FSAService:
             page_size=page_size,
         )
     
-    def get_all_local_authorities(self) -> List[Dict[str, Any]]:
+    async def get_all_local_authorities(self) -> List[Dict[str, Any]]:
         """Get list of all local authorities."""
-        return self.client.get_local_authorities()
+        return await self.client.get_local_authorities_async()
     
-    def get_all_business_types(self) -> List[Dict[str, Any]]:
+    async def get_all_business_types(self) -> List[Dict[str, Any]]:
         """Get list of all business types."""
-        return self.client.get_business_types()
-
-
-# Singleton instance
-_fsa_service: Optional[FSAService] = None
+        return await self.client.get_business_types_async()
 
 
+@lru_cache(maxsize=1)
 def get_fsa_service() -> FSAService:
     """Get singleton FSA service instance."""
-    global _fsa_service
-    if _fsa_service is None:
-        _fsa_service = FSAService()
-    return _fsa_service
\ No newline at end of file
+    return FSAService()
\ No newline at end of file
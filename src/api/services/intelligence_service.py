@@ -6,8 +6,12 @@ This is the "Brain" that combines hygiene ratings with eco-scores.
 import logging
 from typing import Dict, Any, List, Optional
 
-from sqlalchemy.orm import Session
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.config import settings
+from api.database.session import get_db
+from api.repositories.cache import CachedRepository, cached
 from api.repositories.fsa_repository import FSARepository
 from api.repositories.off_repository import OFFRepository
 from src.api.services.fsa_service import get_fsa_service
@@ -18,12 +22,12 @@ logger = logging.getLogger(__name__)
 class IntelligenceService:
     """Service for aggregated intelligence and insights."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
         Initialize intelligence service.
         
         Args:
-            db: Database session
+            db: Async database session
         """
         self.db = db
         self.fsa_repo = FSARepository(db)
@@ -34,7 +38,7 @@ class IntelligenceService:
     # Now you can use self.fsa_service in your methods
     # For example, if you need to fetch fresh data from FSA API:
     
-    def get_district_intelligence(self, postcode: str) -> Dict[str, Any]:
+    async def get_district_intelligence(self, postcode: str) -> Dict[str, Any]:
         """
         Get comprehensive district intelligence by postcode.
         Combines FSA hygiene data with eco-score insights.
@@ -48,8 +52,8 @@ class IntelligenceService:
         logger.info(f"Generating district intelligence for {postcode}")
         
         # OPTION 1: Use repository (from database - EXISTING)
-        hygiene_stats = self.fsa_repo.get_statistics_by_postcode(postcode)
-        establishments = self.fsa_repo.search_establishments(
+        hygiene_stats = await self.fsa_repo.get_statistics_by_postcode(postcode)
+        establishments = await self.fsa_repo.search_establishments(
             postcode=postcode,
             limit=50
         )
@@ -64,13 +68,13 @@ class IntelligenceService:
         #     establishments = fresh_data.get('establishments', [])
         # except Exception as e:
         #     logger.warning(f"Failed to fetch fresh FSA data: {e}, using database")
-        #     establishments = self.fsa_repo.search_establishments(
+        #     establishments = await self.fsa_repo.search_establishments(
         #         postcode=postcode,
         #         limit=50
         #     )
         
         # Get eco-friendly products (sample from database)
-        eco_products = self.off_repo.get_top_eco_products(limit=10)
+        eco_products = await self.off_repo.get_top_eco_products(limit=10)
         
         # Calculate insights
         insights = self._calculate_insights(hygiene_stats, eco_products)
@@ -96,21 +100,29 @@ class IntelligenceService:
 logger = logging.getLogger(__name__)
 
 
-class IntelligenceService:
+class IntelligenceService(CachedRepository):
     """Service for aggregated intelligence and insights."""
 
-    def __init__(self, db: Session):
+    # Aggregated results are cached whole, so repeat requests skip every
+    # underlying query and API call
+    cache_namespace = "intelligence"
+    cache_ttl = settings.cache_ttl_intelligence
+
+    def __init__(self, db: AsyncSession, cache_enabled: bool = None):
         """
         Initialize intelligence service.
         
         Args:
-            db: Database session
+            db: Async database session
+            cache_enabled: Override cache setting (default from config)
         """
         self.db = db
         self.fsa_repo = FSARepository(db)
         self.off_repo = OFFRepository(db)
+        self._init_cache(cache_enabled)
 
-    def get_district_intelligence(self, postcode: str) -> Dict[str, Any]:
+    @cached(prefix="district")
+    async def get_district_intelligence(self, postcode: str) -> Dict[str, Any]:
         """
         Get comprehensive district intelligence by postcode.
         Combines FSA hygiene data with eco-score insights.
@@ -124,16 +136,16 @@ class IntelligenceService:
         logger.info(f"Generating district intelligence for {postcode}")
         
         # Get FSA hygiene statistics
-        hygiene_stats = self.fsa_repo.get_statistics_by_postcode(postcode)
+        hygiene_stats = await self.fsa_repo.get_statistics_by_postcode(postcode)
         
         # Get establishments in area
-        establishments = self.fsa_repo.search_establishments(
+        establishments = await self.fsa_repo.search_establishments(
             postcode=postcode,
             limit=50
         )
         
         # Get eco-friendly products (sample from database)
-        eco_products = self.off_repo.get_top_eco_products(limit=10)
+        eco_products = await self.off_repo.get_top_eco_products(limit=10)
         
         # Calculate insights
         insights = self._calculate_insights(hygiene_stats, eco_products)
@@ -156,7 +168,7 @@ class IntelligenceService:
             "recommendations": self._generate_recommendations(hygiene_stats, eco_products)
         }
 
-    def get_establishment_with_nearby_products(
+    async def get_establishment_with_nearby_products(
         self,
         fhrsid: int,
         product_category: Optional[str] = None
@@ -172,20 +184,20 @@ class IntelligenceService:
             Establishment with product recommendations
         """
         # Get establishment
-        establishment = self.fsa_repo.get_establishment(fhrsid)
+        establishment = await self.fsa_repo.get_establishment(fhrsid)
         
         if not establishment:
             return {"error": "Establishment not found"}
         
         # Get eco-friendly products
         if product_category:
-            products = self.off_repo.search_products(
+            products = await self.off_repo.search_products(
                 category=product_category,
                 ecoscore_grade="a",
                 limit=10
             )
         else:
-            products = self.off_repo.get_top_eco_products(limit=10)
+            products = await self.off_repo.get_top_eco_products(limit=10)
         
         return {
             "establishment": establishment,
@@ -196,7 +208,7 @@ class IntelligenceService:
             )
         }
 
-    def compare_establishments_and_products(
+    async def compare_establishments_and_products(
         self,
         fhrsids: List[int],
         barcodes: List[str]
@@ -211,15 +223,13 @@ class IntelligenceService:
         Returns:
             Comparison data
         """
-        # Get establishments
-        establishments = []
-        for fhrsid in fhrsids[:5]:  # Max 5
-            est = self.fsa_repo.get_establishment(fhrsid)
-            if est:
-                establishments.append(est)
+        # Get establishments (batched: one cache, DB and API round for all)
+        fhrsids = fhrsids[:5]  # Max 5
+        found = await self.fsa_repo.get_establishments(fhrsids) if fhrsids else {}
+        establishments = [found[fhrsid] for fhrsid in fhrsids if fhrsid in found]
         
         # Get products
-        products = self.off_repo.compare_products(barcodes[:5])  # Max 5
+        products = await self.off_repo.compare_products(barcodes[:5])  # Max 5
         
         return {
             "establishments": {
@@ -236,7 +246,8 @@ class IntelligenceService:
             }
         }
 
-    def get_category_insights(self, category: str) -> Dict[str, Any]:
+    @cached(prefix="category_insights")
+    async def get_category_insights(self, category: str) -> Dict[str, Any]:
         """
         Get insights for a product category.
         
@@ -247,10 +258,10 @@ class IntelligenceService:
             Category insights
         """
         # Get category statistics
-        stats = self.off_repo.get_category_statistics(category)
+        stats = await self.off_repo.get_category_statistics(category)
         
         # Get top products
-        top_products = self.off_repo.get_top_eco_products(
+        top_products = await self.off_repo.get_top_eco_products(
             category=category,
             limit=10
         )
@@ -457,4 +468,14 @@ class IntelligenceService:
         elif score >= 20:
             return "d"
         else:
-            return "e"
\ No newline at end of file
+            return "e"
+
+
+def get_intelligence_service(db: AsyncSession = Depends(get_db)) -> IntelligenceService:
+    """
+    Dependency providing an IntelligenceService bound to the request's session.
+
+    Returns:
+        IntelligenceService instance
+    """
+    return IntelligenceService(db)
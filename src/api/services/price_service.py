@@ -1,11 +1,11 @@
 # Placeholder for future price service
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class PriceService:
     """Service layer for price-related operations"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
     # Add price-related methods here when price data is available
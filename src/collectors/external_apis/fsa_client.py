@@ -5,6 +5,7 @@ Documentation: https://api.ratings.food.gov.uk/help
 """
 
 import logging
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 
 import httpx
@@ -12,6 +13,7 @@ from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
+    retry_if_exception,
     retry_if_exception_type,
 )
 
@@ -25,6 +27,16 @@ class FSAAPIError(Exception):
     pass
 
 
+def _is_transient(error: BaseException) -> bool:
+    """
+    Timeouts, dropped keep-alive connections and 5xx responses are worth
+    retrying; an unreachable host or a 4xx fails straight away.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, (httpx.TimeoutException, httpx.RemoteProtocolError))
+
+
 class FSAClient:
     """
     Client for Food Standards Agency API v2.
@@ -60,12 +72,20 @@ class FSAClient:
             "Content-Type": "application/json",
         }
         
-        # Create HTTP client
+        # Create HTTP clients. The async one serves the API; its pool
+        # bounds concurrent upstream requests and keeps connections alive
+        # between them.
         self.client = httpx.Client(
             base_url=self.base_url,
             headers=self.headers,
             timeout=self.timeout,
         )
+        self.async_client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
         
         logger.info(f"FSA Client initialized with base URL: {self.base_url}")
 
@@ -81,6 +101,10 @@ class FSAClient:
         """Close the HTTP client."""
         self.client.close()
 
+    async def aclose(self):
+        """Close the async HTTP client."""
+        await self.async_client.aclose()
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -136,6 +160,65 @@ class FSAClient:
             logger.error(f"FSA API JSON decode error: {str(e)}")
             raise FSAAPIError(f"Invalid JSON response from FSA API: {str(e)}")
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception(_is_transient),
+        reraise=True,
+    )
+    async def _send_async(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """Send one request, raising httpx errors so transient ones are retried."""
+        response = await self.async_client.request(method=method, url=endpoint, params=params)
+        response.raise_for_status()
+        return response
+
+    async def _request_async(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of _request.
+        
+        Timeouts, dropped keep-alive connections and 5xx responses are
+        retried with exponential backoff before giving up.
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path
+            params: Query parameters
+            
+        Returns:
+            Response JSON as dictionary
+            
+        Raises:
+            FSAAPIError: If request fails after retries
+        """
+        try:
+            logger.debug(f"FSA API Request: {method} {endpoint} with params: {params}")
+            response = await self._send_async(method, endpoint, params)
+            data = response.json()
+            logger.debug(f"FSA API Response: Status {response.status_code}")
+            return data
+            
+        except httpx.HTTPStatusError as e:
+            logger.error(f"FSA API HTTP error: {e.response.status_code} - {e.response.text}")
+            raise FSAAPIError(
+                f"FSA API request failed: {e.response.status_code} - {e.response.text}"
+            )
+        except httpx.RequestError as e:
+            logger.error(f"FSA API request error: {str(e)}")
+            raise FSAAPIError(f"FSA API request failed: {str(e)}")
+        except ValueError as e:
+            logger.error(f"FSA API JSON decode error: {str(e)}")
+            raise FSAAPIError(f"Invalid JSON response from FSA API: {str(e)}")
+
     def search_establishments(
         self,
         name: Optional[str] = None,
@@ -163,6 +246,42 @@ class FSAClient:
         Returns:
             Dictionary with establishments and metadata
         """
+        params = self._search_params(
+            name, address, postcode, local_authority_id,
+            business_type_id, rating_key, page_number, page_size,
+        )
+        return self._request("GET", "/Establishments", params=params)
+
+    async def search_establishments_async(
+        self,
+        name: Optional[str] = None,
+        address: Optional[str] = None,
+        postcode: Optional[str] = None,
+        local_authority_id: Optional[int] = None,
+        business_type_id: Optional[int] = None,
+        rating_key: Optional[str] = None,
+        page_number: int = 1,
+        page_size: int = 50,
+    ) -> Dict[str, Any]:
+        """Async variant of search_establishments."""
+        params = self._search_params(
+            name, address, postcode, local_authority_id,
+            business_type_id, rating_key, page_number, page_size,
+        )
+        return await self._request_async("GET", "/Establishments", params=params)
+
+    @staticmethod
+    def _search_params(
+        name: Optional[str],
+        address: Optional[str],
+        postcode: Optional[str],
+        local_authority_id: Optional[int],
+        business_type_id: Optional[int],
+        rating_key: Optional[str],
+        page_number: int,
+        page_size: int,
+    ) -> Dict[str, Any]:
+        """Build /Establishments search query parameters."""
         params = {
             "pageNumber": page_number,
             "pageSize": min(page_size, 5000),  # FSA max is 5000
@@ -180,8 +299,7 @@ class FSAClient:
             params["businessTypeId"] = business_type_id
         if rating_key:
             params["ratingKey"] = rating_key
-            
-        return self._request("GET", "/Establishments", params=params)
+        return params
 
     def get_establishment(self, fhrsid: int) -> Dict[str, Any]:
         """
@@ -195,6 +313,10 @@ class FSAClient:
         """
         return self._request("GET", f"/Establishments/{fhrsid}")
 
+    async def get_establishment_async(self, fhrsid: int) -> Dict[str, Any]:
+        """Async variant of get_establishment."""
+        return await self._request_async("GET", f"/Establishments/{fhrsid}")
+
     def get_nearby_establishments(
         self,
         latitude: float,
@@ -204,6 +326,7 @@ class FSAClient:
         rating_key: Optional[str] = None,
         page_number: int = 1,
         page_size: int = 50,
+        sort_option_key: str = "distance",
     ) -> Dict[str, Any]:
         """
         Find establishments near coordinates.
@@ -216,14 +339,54 @@ class FSAClient:
             rating_key: Filter by rating
             page_number: Page number
             page_size: Results per page
+            sort_option_key: Result order (default nearest first, so a
+                page holds the closest matches)
             
         Returns:
-            Dictionary with nearby establishments
+            Dictionary with nearby establishments, each with a Distance
+            in miles
         """
+        params = self._nearby_params(
+            latitude, longitude, max_distance_limit, business_type_id,
+            rating_key, page_number, page_size, sort_option_key,
+        )
+        return self._request("GET", "/Establishments", params=params)
+
+    async def get_nearby_establishments_async(
+        self,
+        latitude: float,
+        longitude: float,
+        max_distance_limit: int = 1,  # miles
+        business_type_id: Optional[int] = None,
+        rating_key: Optional[str] = None,
+        page_number: int = 1,
+        page_size: int = 50,
+        sort_option_key: str = "distance",
+    ) -> Dict[str, Any]:
+        """Async variant of get_nearby_establishments."""
+        params = self._nearby_params(
+            latitude, longitude, max_distance_limit, business_type_id,
+            rating_key, page_number, page_size, sort_option_key,
+        )
+        return await self._request_async("GET", "/Establishments", params=params)
+
+    @staticmethod
+    def _nearby_params(
+        latitude: float,
+        longitude: float,
+        max_distance_limit: int,
+        business_type_id: Optional[int],
+        rating_key: Optional[str],
+        page_number: int,
+        page_size: int,
+        sort_option_key: str,
+    ) -> Dict[str, Any]:
+        """Build /Establishments coordinate search query parameters."""
         params = {
             "latitude": latitude,
             "longitude": longitude,
             "maxDistanceLimit": max_distance_limit,
+            "sortOptionKey": sort_option_key,
             "pageNumber": page_number,
             "pageSize": min(page_size, 5000),
         }
@@ -232,8 +395,7 @@ class FSAClient:
             params["businessTypeId"] = business_type_id
         if rating_key:
             params["ratingKey"] = rating_key
-            
-        return self._request("GET", "/Establishments", params=params)
+        return params
 
     def get_local_authorities(self) -> List[Dict[str, Any]]:
         """
@@ -245,6 +407,11 @@ class FSAClient:
         response = self._request("GET", "/Authorities")
         return response.get("authorities", [])
 
+    async def get_local_authorities_async(self) -> List[Dict[str, Any]]:
+        """Async variant of get_local_authorities."""
+        response = await self._request_async("GET", "/Authorities")
+        return response.get("authorities", [])
+
     def get_local_authority(self, local_authority_id: int) -> Dict[str, Any]:
         """
         Get details for specific local authority.
@@ -257,6 +424,10 @@ class FSAClient:
         """
         return self._request("GET", f"/Authorities/{local_authority_id}")
 
+    async def get_local_authority_async(self, local_authority_id: int) -> Dict[str, Any]:
+        """Async variant of get_local_authority."""
+        return await self._request_async("GET", f"/Authorities/{local_authority_id}")
+
     def get_business_types(self) -> List[Dict[str, Any]]:
         """
         Get list of all business types.
@@ -267,6 +438,11 @@ class FSAClient:
         response = self._request("GET", "/BusinessTypes")
         return response.get("businessTypes", [])
 
+    async def get_business_types_async(self) -> List[Dict[str, Any]]:
+        """Async variant of get_business_types."""
+        response = await self._request_async("GET", "/BusinessTypes")
+        return response.get("businessTypes", [])
+
     def get_ratings(self) -> List[Dict[str, Any]]:
         """
         Get list of all rating schemes.
@@ -297,7 +473,15 @@ class FSAClient:
         Returns:
             Local authority dictionary or None if not found
         """
-        authorities = self.get_local_authorities()
+        return self._match_authority(self.get_local_authorities(), name)
+
+    async def get_local_authority_by_name_async(self, name: str) -> Optional[Dict[str, Any]]:
+        """Async variant of get_local_authority_by_name."""
+        return self._match_authority(await self.get_local_authorities_async(), name)
+
+    @staticmethod
+    def _match_authority(authorities: List[Dict[str, Any]], name: str) -> Optional[Dict[str, Any]]:
+        """Pick the authority named name, exactly or else by partial match."""
         name_lower = name.lower()
         
         # Try exact match first
@@ -342,11 +526,28 @@ class FSAClient:
             logger.warning(f"Could not determine local authority for postcode {postcode}")
             return None
 
-
-# Singleton instance for convenience
-_fsa_client: Optional[FSAClient] = None
+    async def get_local_authority_from_postcode_async(self, postcode: str) -> Optional[Dict[str, Any]]:
+        """Async variant of get_local_authority_from_postcode."""
+        try:
+            result = await self.search_establishments_async(
+                postcode=postcode,
+                name='',  # Empty string matches all
+                page_size=1
+            )
+            
+            establishments = result.get('establishments', [])
+            if establishments:
+                local_authority_id = establishments[0].get('LocalAuthorityBusinessID')
+                if local_authority_id:
+                    return await self.get_local_authority_async(local_authority_id)
+            
+            return None
+        except FSAAPIError:
+            logger.warning(f"Could not determine local authority for postcode {postcode}")
+            return None
 
 
+@lru_cache(maxsize=1)
 def get_fsa_client() -> FSAClient:
     """
     Get singleton FSA client instance.
@@ -354,7 +555,4 @@ def get_fsa_client() -> FSAClient:
     Returns:
         FSA client instance
     """
-    global _fsa_client
-    if _fsa_client is None:
-        _fsa_client = FSAClient()
-    return _fsa_client
\ No newline at end of file
+    return FSAClient()
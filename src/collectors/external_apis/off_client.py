@@ -5,10 +5,12 @@ Documentation: https://wiki.openfoodfacts.org/API
 """
 
 import logging
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 from urllib.parse import urljoin
 
 import httpx
+import orjson
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -64,13 +66,19 @@ class OFFClient:
             "Accept": "application/json",
         }
         
-        # Create HTTP client
+        # Create HTTP clients (async one for concurrent fetches)
         self.client = httpx.Client(
             base_url=self.base_url,
             headers=self.headers,
             timeout=self.timeout,
             follow_redirects=True,
         )
+        self.async_client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+        )
         
         logger.info(f"OFF Client initialized with base URL: {self.base_url}")
 
@@ -86,6 +94,10 @@ class OFFClient:
         """Close the HTTP client."""
         self.client.close()
 
+    async def aclose(self):
+        """Close the async HTTP client."""
+        await self.async_client.aclose()
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -124,7 +136,62 @@ class OFFClient:
             )
             
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
+            
+            logger.debug(f"OFF API Response: Status {response.status_code}")
+            return data
+            
+        except httpx.HTTPStatusError as e:
+            logger.error(f"OFF API HTTP error: {e.response.status_code} - {e.response.text}")
+            raise OFFAPIError(
+                f"OFF API request failed: {e.response.status_code} - {e.response.text}"
+            )
+        except httpx.RequestError as e:
+            logger.error(f"OFF API request error: {str(e)}")
+            raise OFFAPIError(f"OFF API request failed: {str(e)}")
+        except ValueError as e:
+            logger.error(f"OFF API JSON decode error: {str(e)}")
+            raise OFFAPIError(f"Invalid JSON response from OFF API: {str(e)}")
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type((httpx.RequestError, httpx.TimeoutException)),
+    )
+    async def _request_async(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Async variant of _request, for fetching several resources concurrently.
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path
+            params: Query parameters
+            **kwargs: Additional request arguments
+            
+        Returns:
+            Response JSON as dictionary
+            
+        Raises:
+            OFFAPIError: If request fails after retries
+        """
+        try:
+            logger.debug(f"OFF API Request: {method} {endpoint} with params: {params}")
+            
+            response = await self.async_client.request(
+                method=method,
+                url=endpoint,
+                params=params,
+                **kwargs
+            )
+            
+            response.raise_for_status()
+            data = orjson.loads(response.content)
             
             logger.debug(f"OFF API Response: Status {response.status_code}")
             return data
@@ -166,6 +233,30 @@ class OFFClient:
             
         return response.get("product", {})
 
+    async def get_product_async(self, barcode: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Get product by barcode without blocking the event loop.
+        
+        Args:
+            barcode: Product barcode (EAN-13, UPC, etc.)
+            fields: Specific fields to return (optional)
+            
+        Returns:
+            Product data dictionary
+        """
+        endpoint = f"/api/v2/product/{barcode}"
+        
+        params = {}
+        if fields:
+            params["fields"] = ",".join(fields)
+            
+        response = await self._request_async("GET", endpoint, params=params)
+        
+        if response.get("status") != 1:
+            raise OFFAPIError(f"Product not found: {barcode}")
+            
+        return response.get("product", {})
+
     def search_products(
         self,
         search_terms: Optional[str] = None,
@@ -402,10 +493,7 @@ class OFFClient:
         ]
 
 
-# Singleton instance for convenience
-_off_client: Optional[OFFClient] = None
-
-
+@lru_cache(maxsize=1)
 def get_off_client() -> OFFClient:
     """
     Get singleton OFF client instance.
@@ -413,7 +501,4 @@ def get_off_client() -> OFFClient:
     Returns:
         OFF client instance
     """
-    global _off_client
-    if _off_client is None:
-        _off_client = OFFClient()
-    return _off_client
\ No newline at end of file
+    return OFFClient()
@@ -1,5 +1,9 @@
+import requests
 from sqlalchemy import create_engine, text
 
+from ...core.models.food import DIMS_VIEWS
+from ...database.config import Config
+
 def load_to_postgres(df, table_name, engine):
     with engine.begin() as conn:
         conn.execute(text(f"TRUNCATE TABLE {table_name}"))
@@ -8,4 +12,24 @@ def load_to_postgres(df, table_name, engine):
         engine,
         if_exists="append",
         index=False
-    )
\ No newline at end of file
+    )
+
+
+def refresh_dims_views(engine):
+    """Create (if needed) and refresh the reference-data dimension views."""
+    with engine.begin() as conn:
+        for view_name, (_, statements) in DIMS_VIEWS.items():
+            for statement in statements:
+                conn.execute(text(statement))
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view_name}"))
+
+
+def invalidate_reference_cache():
+    """Ask the API to drop its cached reference data so the new load shows up immediately."""
+    url = f"{Config.API_URL}/cache/invalidate/reference"
+    try:
+        response = requests.post(url, timeout=10)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        # Not fatal: cached results expire on their own (within a day at most)
+        print(f"Warning: reference cache invalidation failed ({url}): {e}")
@@ -13,7 +13,7 @@ from ...core.utils.validators import (
     validate_composite_key, 
     validate_year,
 )
-from .load import load_to_postgres
+from .load import invalidate_reference_cache, load_to_postgres, refresh_dims_views
 from ...database.postgres_connection import get_engine
  
 engine = get_engine()
@@ -49,6 +49,12 @@ def run_government_etl():
     print("Running nutrition quality ETL...")
     run_nutrition_quality_etl(engine)
 
+    print("Refreshing dimension views...")
+    refresh_dims_views(engine)
+
+    print("Invalidating API reference data cache...")
+    invalidate_reference_cache()
+
     print("Government ETL pipeline completed successfully.")
 
 if __name__ == "__main__":
@@ -5,7 +5,7 @@ SQLAlchemy model for FSA establishment data (cached hygiene ratings).
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, Float, Integer, String, Text, Index
+from sqlalchemy import Column, Computed, DateTime, Float, Integer, String, Text, Index, column, table
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -36,6 +36,14 @@ class Establishment(Base):
     address_line_3 = Column(String(255))
     address_line_4 = Column(String(255))
     postcode = Column(String(10), index=True)
+    # Normalized on write (upper case, no spaces) so lookups compare
+    # plainly instead of pattern matching with ILIKE
+    postcode_normalized = Column(
+        String(10), Computed("upper(replace(postcode, ' ', ''))", persisted=True)
+    )
+    postcode_prefix = Column(
+        String(4), Computed("substr(upper(replace(postcode, ' ', '')), 1, 4)", persisted=True)
+    )
     
     # Rating Information
     rating_value = Column(String(10), index=True)  # Can be '0'-'5', 'AwaitingInspection', 'Exempt'
@@ -82,6 +90,15 @@ class Establishment(Base):
         Index('idx_business_name_postcode', 'business_name', 'postcode'),
         Index('idx_local_authority_rating', 'local_authority_name', 'rating_value'),
         Index('idx_establishments_cached_at', 'cached_at'),
+        # Rating summary: group by rating, sum/count hygiene from the index alone
+        Index('idx_establishments_rating_hygiene', 'rating_value', postgresql_include=['hygiene_score']),
+        # Postcode area lookups: equality on the 4-char prefix, or an
+        # anchored LIKE on the normalized postcode for shorter prefixes
+        Index('idx_establishments_postcode_prefix', 'postcode_prefix'),
+        Index(
+            'idx_establishments_postcode_normalized', 'postcode_normalized',
+            postgresql_ops={'postcode_normalized': 'text_pattern_ops'}
+        ),
     )
 
     def __repr__(self) -> str:
@@ -164,4 +181,40 @@ class Establishment(Base):
         ]
         if all(s is not None for s in scores):
             return sum(scores)
-        return None
\ No newline at end of file
+        return None
+
+
+postcode_rating_stats = table(
+    'postcode_rating_stats',
+    column('postcode_prefix'),
+    column('rating_value'),
+    column('establishments'),
+    column('hygiene_sum'),
+    column('hygiene_count'),
+)
+
+# view name -> (source table, DDL); the unique index is what allows
+# REFRESH MATERIALIZED VIEW CONCURRENTLY, the pattern index serves
+# prefixes shorter than four characters
+ESTABLISHMENT_VIEWS = {
+    'postcode_rating_stats': ('establishments', [
+        "CREATE MATERIALIZED VIEW IF NOT EXISTS postcode_rating_stats AS "
+        "SELECT postcode_prefix, rating_value, count(*) AS establishments, "
+        "sum(hygiene_score) AS hygiene_sum, count(hygiene_score) AS hygiene_count "
+        "FROM establishments WHERE postcode_prefix IS NOT NULL "
+        "GROUP BY 1, 2",
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_postcode_rating_stats "
+        "ON postcode_rating_stats (postcode_prefix, rating_value)",
+        "CREATE INDEX IF NOT EXISTS idx_postcode_rating_stats_prefix_pattern "
+        "ON postcode_rating_stats (postcode_prefix text_pattern_ops)",
+    ]),
+}
+
+# Trigram indexes serving the unanchored ILIKE '%term%' searches, as
+# index name -> (table, column). They need the pg_trgm extension, so
+# init_db creates them apart from the table metadata and only where the
+# extension is installed.
+ESTABLISHMENT_TRGM_INDEXES = {
+    'idx_establishments_business_name_trgm': ('establishments', 'business_name'),
+    'idx_establishments_postcode_trgm': ('establishments', 'postcode'),
+}
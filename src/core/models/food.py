@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Numeric, PrimaryKeyConstraint
+from sqlalchemy import Column, String, Integer, Numeric, PrimaryKeyConstraint, Index, column, table
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -14,11 +14,13 @@ class FoodBalance(Base):
     food_label = Column(String, nullable=False, comment="Food category label")
     years = Column(Integer, nullable=False, comment="Year of the data")
     unit = Column(String, nullable=False, comment="Unit of measurement")
-    amount = Column(Numeric, nullable=True, comment="Amount value (can be NULL/NA)")
+    amount = Column(Numeric(asdecimal=False), nullable=True, comment="Amount value (can be NULL/NA)")
     
     # Define composite primary key
     __table_args__ = (
         PrimaryKeyConstraint('food_label', 'years', 'unit', name='food_balance_pk'),
+        # Year/unit filters; amount included for index-only range checks
+        Index('ix_food_balance_years_unit', 'years', 'unit', postgresql_include=['amount']),
     )
     
     def __repr__(self):
@@ -30,7 +32,7 @@ class FoodBalance(Base):
             'food_label': self.food_label,
             'years': self.years,
             'unit': self.unit,
-            'amount': float(self.amount) if self.amount is not None else None
+            'amount': self.amount
         }
 
 
@@ -44,12 +46,14 @@ class HouseholdSpending(Base):
     food_code = Column(String, nullable=False, comment="Food category code")
     units = Column(String, nullable=True, comment="Unit of measurement (can be NULL/NA)")
     years = Column(Integer, nullable=False, comment="Year of the data")
-    amount = Column(Numeric, nullable=True, comment="Spending amount (can be NULL/NA)")
+    amount = Column(Numeric(asdecimal=False), nullable=True, comment="Spending amount (can be NULL/NA)")
     rse_indicator = Column(String, nullable=True, comment="RSE indicator (can be NULL/NA)")
     
     # Define composite primary key
     __table_args__ = (
         PrimaryKeyConstraint('food_code', 'years', name='household_spending_pk'),
+        # Year filters (the primary key leads with food_code)
+        Index('ix_household_spending_years', 'years', postgresql_include=['amount']),
     )
     
     def __repr__(self):
@@ -61,6 +65,53 @@ class HouseholdSpending(Base):
             'food_code': self.food_code,
             'units': self.units,
             'years': self.years,
-            'amount': float(self.amount) if self.amount is not None else None,
+            'amount': self.amount,
             'rse_indicator': self.rse_indicator
-        }
\ No newline at end of file
+        }
+
+# ----------------------------------------------------------------------------
+# Dimension views
+# ----------------------------------------------------------------------------
+# The metadata endpoints only need the distinct label/code/year/unit values,
+# so they read these small materialized views instead of running DISTINCT
+# over the fact tables. The ETL refreshes them after each load.
+
+food_balance_dims = table(
+    'food_balance_dims',
+    column('food_label'),
+    column('years'),
+    column('unit'),
+)
+
+household_spending_dims = table(
+    'household_spending_dims',
+    column('food_code'),
+    column('years'),
+)
+
+# view name -> (source table, DDL); the unique index is what allows
+# REFRESH MATERIALIZED VIEW CONCURRENTLY
+DIMS_VIEWS = {
+    'food_balance_dims': ('food_balance', [
+        "CREATE MATERIALIZED VIEW IF NOT EXISTS food_balance_dims AS "
+        "SELECT DISTINCT food_label, years, unit FROM food_balance",
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_food_balance_dims "
+        "ON food_balance_dims (food_label, years, unit)",
+        "CREATE INDEX IF NOT EXISTS ix_food_balance_dims_years ON food_balance_dims (years)",
+        "CREATE INDEX IF NOT EXISTS ix_food_balance_dims_unit ON food_balance_dims (unit)",
+    ]),
+    'household_spending_dims': ('household_spending', [
+        "CREATE MATERIALIZED VIEW IF NOT EXISTS household_spending_dims AS "
+        "SELECT DISTINCT food_code, years FROM household_spending",
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_household_spending_dims "
+        "ON household_spending_dims (food_code, years)",
+        "CREATE INDEX IF NOT EXISTS ix_household_spending_dims_years ON household_spending_dims (years)",
+    ]),
+}
+
+# Trigram indexes for the ILIKE '%label%' / '%code%' filters; created by
+# init_db only where pg_trgm is installed, as index name -> (table, column)
+FOOD_TRGM_INDEXES = {
+    'ix_food_balance_food_label_trgm': ('food_balance', 'food_label'),
+    'ix_household_spending_food_code_trgm': ('household_spending', 'food_code'),
+}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Double
+from sqlalchemy import Column, String, Double, Index
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -23,6 +23,13 @@ class Nutrition(Base):
     protein_g = Column(Double, nullable=True, comment="Protein in grams per 100g (can be NULL/NA)")
     salt_g = Column(Double, nullable=True, comment="Salt in grams per 100g (can be NULL/NA)")
     
+    __table_args__ = (
+        # High-protein ranking, walked backwards for protein_g DESC
+        Index('ix_nutrition_protein', 'protein_g', 'food_name', postgresql_include=['energy_kcal']),
+        # Low-calorie ranking, walked forwards for energy_kcal ASC
+        Index('ix_nutrition_energy', 'energy_kcal', 'food_name', postgresql_include=['protein_g']),
+    )
+    
     def __repr__(self):
         return f"<Nutrition(food_name='{self.food_name}', energy_kcal={self.energy_kcal}, protein_g={self.protein_g})>"
     
@@ -39,4 +46,11 @@ class Nutrition(Base):
             'fibre_g': self.fibre_g,
             'protein_g': self.protein_g,
             'salt_g': self.salt_g
-        }
\ No newline at end of file
+        }
+
+
+# Trigram index for ILIKE '%name%' searches; created by init_db only where
+# pg_trgm is installed, as index name -> (table, column)
+NUTRITION_TRGM_INDEXES = {
+    'ix_nutrition_food_name_trgm': ('nutrition', 'food_name'),
+}
@@ -5,7 +5,7 @@ SQLAlchemy model for Open Food Facts product eco-score data.
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, Float, Integer, String, Text, Index, JSON
+from sqlalchemy import Column, DateTime, Float, Integer, String, Text, Index, JSON, column, table
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -211,4 +211,42 @@ class ProductEco(Base):
         """Calculate overall score combining eco and nutri scores (0-100)."""
         if self.ecoscore_score is not None and self.nutriscore_score is not None:
             return (self.ecoscore_score + self.nutriscore_score) / 2
-        return None
\ No newline at end of file
+        return None
+
+# ----------------------------------------------------------------------------
+# Category statistics view
+# ----------------------------------------------------------------------------
+# Per-category eco-score counts, one row per (category, grade). Categories
+# are the comma-separated entries of product_eco.categories, trimmed and
+# lower-cased. The API refreshes it periodically, so reads can lag recent
+# product upserts by up to one refresh interval.
+
+product_category_stats = table(
+    'product_category_stats',
+    column('category'),
+    column('ecoscore_grade'),
+    column('products'),
+    column('score_sum'),
+    column('score_count'),
+)
+
+# view name -> (source table, DDL); the unique index is what allows
+# REFRESH MATERIALIZED VIEW CONCURRENTLY
+PRODUCT_VIEWS = {
+    'product_category_stats': ('product_eco', [
+        "CREATE MATERIALIZED VIEW IF NOT EXISTS product_category_stats AS "
+        "SELECT lower(btrim(category)) AS category, ecoscore_grade, "
+        "count(*) AS products, sum(ecoscore_score) AS score_sum, "
+        "count(ecoscore_score) AS score_count "
+        "FROM product_eco, unnest(string_to_array(categories, ',')) AS category "
+        "GROUP BY 1, 2",
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_product_category_stats "
+        "ON product_category_stats (category, ecoscore_grade)",
+    ]),
+}
+
+# Trigram index for the ILIKE '%category%' filters; created by init_db
+# only where pg_trgm is installed (see ESTABLISHMENT_TRGM_INDEXES)
+PRODUCT_TRGM_INDEXES = {
+    'idx_products_categories_trgm': ('product_eco', 'categories'),
+}
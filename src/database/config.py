@@ -25,6 +25,9 @@ class Config:
     CACHE_URL: str = os.getenv('CACHE_URL', 'redis://localhost:6379/0')
     CACHE_TTL: str = 300
 
+    # API the ETL notifies after a load (cache invalidation)
+    API_URL: str = os.getenv('API_URL', 'http://localhost:8000/api/v1')
+
     @classmethod
     def get_sql_url(cls) -> str:
         return (
@@ -1,18 +1,20 @@
 """Test local database connections"""
 
+import asyncio
+
 print("Testing database connections...\n")
 
 # Test PostgreSQL
 print("1. Testing PostgreSQL...")
 try:
-    from sqlalchemy import text
-    from api.database.session import engine
+    from api.database.session import check_connection
     
-    with engine.connect() as conn:
-        result = conn.execute(text("SELECT 1"))
+    if asyncio.run(check_connection()):
         print("   ✅ PostgreSQL: Connected!")
         print(f"   📍 Database: ecodb")
         print(f"   📍 Port: 5433")
+    else:
+        print("   ❌ PostgreSQL: Connection failed")
 except Exception as e:
     print(f"   ❌ PostgreSQL Error: {str(e)}")
 
@@ -21,7 +23,7 @@ print("\n2. Testing Redis...")
 try:
     from api.database.redis_client import get_redis_client
     redis = get_redis_client()
-    if redis.check_connection():
+    if asyncio.run(redis.check_connection()):
         print("   ✅ Redis: Connected!")
         print(f"   📍 Port: 6379")
     else:
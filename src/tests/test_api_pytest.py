@@ -2,28 +2,30 @@
 Pytest test suite for EcoAPI endpoints.
 """
 
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from api.main import app
-from api.database.session import Base, get_db
+from api.database.session import get_db
+from core.models.establishment import Base as EstablishmentBase
+from core.models.product_eco import Base as ProductEcoBase
 
-# Test database URL (use in-memory SQLite for speed)
-TEST_DATABASE_URL = "sqlite:///./test_ecoapi.db"
+# Test database URL (use SQLite for speed)
+TEST_DATABASE_URL = "sqlite+aiosqlite:///./test_ecoapi.db"
 
-engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_async_engine(TEST_DATABASE_URL)
+TestingSessionLocal = async_sessionmaker(
+    bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
 
-def override_get_db():
+async def override_get_db():
     """Override database dependency for testing."""
-    try:
-        db = TestingSessionLocal()
+    async with TestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 app.dependency_overrides[get_db] = override_get_db
@@ -31,12 +33,19 @@ app.dependency_overrides[get_db] = override_get_db
 client = TestClient(app)
 
 
+async def _run_schema(method: str):
+    async with engine.begin() as conn:
+        for base in (EstablishmentBase, ProductEcoBase):
+            await conn.run_sync(getattr(base.metadata, method))
+    await engine.dispose()
+
+
 @pytest.fixture(scope="module", autouse=True)
 def setup_database():
     """Set up test database."""
-    Base.metadata.create_all(bind=engine)
+    asyncio.run(_run_schema("create_all"))
     yield
-    Base.metadata.drop_all(bind=engine)
+    asyncio.run(_run_schema("drop_all"))
 
 
 class TestHealthEndpoints:
@@ -0,0 +1,196 @@
+"""
+Tests for the repository caching layer (@cached and CachedRepository).
+"""
+
+import fnmatch
+
+import pytest
+
+from api.repositories import cache as cache_module
+from api.repositories.cache import CachedRepository, cached
+from core.models.nutrition import Nutrition
+
+
+class InMemoryRedis:
+    """Dict-backed stand-in for RedisClient (only the calls the cache makes)."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+        return True
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def mset(self, mapping, ttl=None):
+        self.data.update(mapping)
+        return True
+
+    async def delete_pattern(self, pattern, batch_size=500):
+        matches = [key for key in self.data if fnmatch.fnmatchcase(key, pattern)]
+        for key in matches:
+            del self.data[key]
+        return len(matches)
+
+
+class SampleRepository(CachedRepository):
+    """Repository with one method per @cached mode; counts real calls."""
+
+    cache_namespace = "sample"
+    cache_ttl = 60
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.cache_enabled = True
+        self.calls = 0
+
+    @cached(prefix="rows", model=Nutrition)
+    async def get_rows(self, name: str, limit: int = 10):
+        self.calls += 1
+        return [Nutrition(food_name=name, energy_kcal=52.0, protein_g=0.3)][:limit]
+
+    @cached(prefix="page", model=Nutrition, paginated=True)
+    async def get_page(self, name: str, skip: int = 0, limit: int = 10):
+        self.calls += 1
+        return [Nutrition(food_name=name, energy_kcal=52.0)], 7
+
+    @cached(prefix="values")
+    async def get_values(self):
+        self.calls += 1
+        return ["a", "b"]
+
+
+@pytest.fixture
+def redis():
+    return InMemoryRedis()
+
+
+@pytest.fixture
+def repo(redis):
+    return SampleRepository(redis)
+
+
+class TestCachedDecorator:
+    """Test @cached hits, misses and key building."""
+
+    async def test_hit_rebuilds_model_instances(self, repo):
+        """A hit returns transient model instances built from to_dict()."""
+        first = await repo.get_rows("apple")
+        second = await repo.get_rows("apple")
+
+        assert repo.calls == 1
+        assert first[0] is not second[0]
+        assert isinstance(second[0], Nutrition)
+        assert second[0].to_dict() == first[0].to_dict()
+
+    async def test_rows_are_stored_as_dicts(self, repo, redis):
+        """Model rows are cached via to_dict(), not as ORM objects."""
+        await repo.get_rows("apple")
+
+        (stored,) = redis.data.values()
+        assert stored == [Nutrition(food_name="apple", energy_kcal=52.0, protein_g=0.3).to_dict()]
+
+    async def test_paginated_round_trip(self, repo):
+        """Paginated results keep their (rows, total) shape on a hit."""
+        rows, total = await repo.get_page("apple", skip=0, limit=5)
+        cached_rows, cached_total = await repo.get_page("apple", skip=0, limit=5)
+
+        assert repo.calls == 1
+        assert cached_total == total == 7
+        assert [row.to_dict() for row in cached_rows] == [row.to_dict() for row in rows]
+        assert isinstance(cached_rows[0], Nutrition)
+
+    async def test_positional_and_keyword_calls_share_a_key(self, repo, redis):
+        """Bound arguments (with defaults applied) make up the key."""
+        await repo.get_page("apple", 0, 10)
+        await repo.get_page(name="apple", limit=10)
+        await repo.get_page("apple")
+
+        assert repo.calls == 1
+        assert len(redis.data) == 1
+
+    async def test_different_arguments_use_different_keys(self, repo, redis):
+        """Changing any argument misses the cache."""
+        await repo.get_page("apple")
+        await repo.get_page("apple", skip=10)
+        await repo.get_page("pear")
+
+        assert repo.calls == 3
+        assert len(redis.data) == 3
+
+    async def test_keys_are_namespaced_by_prefix(self, repo, redis):
+        """Keys have the form namespace:prefix:hash."""
+        await repo.get_rows("apple")
+        await repo.get_values()
+
+        prefixes = sorted(key.rsplit(":", 1)[0] for key in redis.data)
+        assert prefixes == ["sample:rows", "sample:values"]
+
+    async def test_plain_values_are_cached_as_is(self, repo):
+        """Without a model the result is stored and returned unchanged."""
+        assert await repo.get_values() == ["a", "b"]
+        assert await repo.get_values() == ["a", "b"]
+        assert repo.calls == 1
+
+    async def test_disabled_cache_always_calls_through(self, repo, redis):
+        """With caching off nothing is read or written."""
+        repo.cache_enabled = False
+        await repo.get_rows("apple")
+        await repo.get_rows("apple")
+
+        assert repo.calls == 2
+        assert redis.data == {}
+
+
+class TestInvalidate:
+    """Test CachedRepository.invalidate key patterns."""
+
+    @pytest.fixture(autouse=True)
+    def shared_redis(self, monkeypatch, redis):
+        monkeypatch.setattr(cache_module, "get_redis_client", lambda: redis)
+
+    async def _fill(self, repo):
+        await repo.get_rows("apple")
+        await repo.get_page("apple")
+        await repo.get_values()
+
+    async def test_invalidate_all(self, repo, redis):
+        """The default pattern drops the whole namespace."""
+        await self._fill(repo)
+        redis.data["other:rows:abc"] = [1]
+
+        deleted = await SampleRepository.invalidate()
+
+        assert deleted == 3
+        assert list(redis.data) == ["other:rows:abc"]
+
+    async def test_invalidate_prefix(self, repo, redis):
+        """A prefix drops only that method's entries."""
+        await self._fill(repo)
+
+        deleted = await SampleRepository.invalidate("rows")
+
+        assert deleted == 1
+        assert sorted(key.split(":")[1] for key in redis.data) == ["page", "values"]
+
+    async def test_invalidate_prefix_glob(self, repo, redis):
+        """Prefixes are globs, e.g. "p*" for every p-prefixed method."""
+        await self._fill(repo)
+
+        deleted = await SampleRepository.invalidate("p*")
+
+        assert deleted == 1
+        assert sorted(key.split(":")[1] for key in redis.data) == ["rows", "values"]
+
+    async def test_invalidated_entries_are_recomputed(self, repo):
+        """The next call after invalidation goes to the source again."""
+        await repo.get_rows("apple")
+        await SampleRepository.invalidate()
+        await repo.get_rows("apple")
+
+        assert repo.calls == 2
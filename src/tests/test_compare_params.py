@@ -0,0 +1,73 @@
+"""
+Tests for the comma-separated /intelligence/compare query parameters.
+"""
+
+import pytest
+from fastapi.exceptions import RequestValidationError
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.routes.intelligence import BARCODE_LIST, FHRSID_LIST, _parse_csv
+
+client = TestClient(app)
+
+COMPARE_URL = "/api/v1/intelligence/compare"
+
+
+class TestParseCsv:
+    """Test _parse_csv directly."""
+
+    def test_absent_parameter_is_empty(self):
+        """A missing or empty parameter gives an empty list."""
+        assert _parse_csv(FHRSID_LIST, "fhrsids", None) == []
+        assert _parse_csv(FHRSID_LIST, "fhrsids", "") == []
+
+    def test_items_are_stripped_and_converted(self):
+        """Whitespace and empty items are dropped; ids become ints."""
+        assert _parse_csv(FHRSID_LIST, "fhrsids", " 1, 2,,3 ") == [1, 2, 3]
+        assert _parse_csv(BARCODE_LIST, "barcodes", "0123,4567") == ["0123", "4567"]
+
+    def test_five_items_are_allowed(self):
+        """The limit is inclusive."""
+        assert _parse_csv(FHRSID_LIST, "fhrsids", "1,2,3,4,5") == [1, 2, 3, 4, 5]
+
+    def test_six_items_are_rejected(self):
+        """A sixth item fails with a location naming the parameter."""
+        with pytest.raises(RequestValidationError) as exc_info:
+            _parse_csv(FHRSID_LIST, "fhrsids", "1,2,3,4,5,6")
+        (error,) = exc_info.value.errors()
+        assert error["type"] == "too_long"
+        assert error["loc"] == ("query", "fhrsids")
+
+    def test_non_integer_fhrsid_is_located_by_index(self):
+        """A bad item's location is ("query", name, index)."""
+        with pytest.raises(RequestValidationError) as exc_info:
+            _parse_csv(FHRSID_LIST, "fhrsids", "1,abc,3")
+        (error,) = exc_info.value.errors()
+        assert error["type"] == "int_parsing"
+        assert error["loc"] == ("query", "fhrsids", 1)
+
+
+class TestCompareValidation:
+    """Test the 422 responses of /intelligence/compare."""
+
+    def test_six_fhrsids_return_422(self):
+        """Too many ids are rejected before the service runs."""
+        response = client.get(COMPARE_URL, params={"fhrsids": "1,2,3,4,5,6"})
+        assert response.status_code == 422
+        (error,) = response.json()["error"]["details"]
+        assert error["loc"] == ["query", "fhrsids"]
+
+    def test_six_barcodes_return_422(self):
+        """The same limit applies to barcodes."""
+        response = client.get(COMPARE_URL, params={"barcodes": "1,2,3,4,5,6"})
+        assert response.status_code == 422
+        (error,) = response.json()["error"]["details"]
+        assert error["loc"] == ["query", "barcodes"]
+
+    def test_non_integer_fhrsid_returns_422(self):
+        """The failing item is reported by its index."""
+        response = client.get(COMPARE_URL, params={"fhrsids": "123,abc"})
+        assert response.status_code == 422
+        (error,) = response.json()["error"]["details"]
+        assert error["loc"] == ["query", "fhrsids", 1]
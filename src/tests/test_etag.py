@@ -0,0 +1,88 @@
+"""
+Tests for conditional GET support (ETag / If-None-Match).
+"""
+
+from fastapi import Request, Response
+
+from api.etag import check_etag, compute_etag
+
+DATA = {"unique_years": [2019, 2020], "unique_units": ["g", "kcal"]}
+
+
+def _request(if_none_match: str = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def _strong(etag: str) -> str:
+    return etag.removeprefix("W/")
+
+
+class TestComputeEtag:
+    """Test ETag derivation."""
+
+    def test_etag_is_weak_and_quoted(self):
+        """ETags have the form W/"<hex>"."""
+        etag = compute_etag(DATA)
+        assert etag.startswith('W/"') and etag.endswith('"')
+
+    def test_etag_ignores_key_order(self):
+        """Equal data gives the same ETag whatever the dict order."""
+        reordered = {"unique_units": ["g", "kcal"], "unique_years": [2019, 2020]}
+        assert compute_etag(reordered) == compute_etag(DATA)
+
+    def test_etag_changes_with_data(self):
+        """Different data gives a different ETag."""
+        assert compute_etag({**DATA, "unique_years": [2019]}) != compute_etag(DATA)
+
+
+class TestCheckEtag:
+    """Test If-None-Match handling."""
+
+    def test_no_header_tags_response(self):
+        """Without If-None-Match the route proceeds and the ETag is set."""
+        response = Response()
+        assert check_etag(_request(), response, DATA) is None
+        assert response.headers["ETag"] == compute_etag(DATA)
+
+    def test_weak_match_returns_304(self):
+        """The weak ETag sent back verbatim matches."""
+        etag = compute_etag(DATA)
+        not_modified = check_etag(_request(etag), Response(), DATA)
+        assert not_modified is not None
+        assert not_modified.status_code == 304
+
+    def test_strong_form_matches(self):
+        """The same tag without W/ names the same version."""
+        etag = compute_etag(DATA)
+        not_modified = check_etag(_request(_strong(etag)), Response(), DATA)
+        assert not_modified is not None
+        assert not_modified.status_code == 304
+
+    def test_wildcard_matches(self):
+        """If-None-Match: * matches any current version."""
+        not_modified = check_etag(_request("*"), Response(), DATA)
+        assert not_modified is not None
+        assert not_modified.status_code == 304
+
+    def test_comma_separated_list_matches(self):
+        """Any tag in a comma-separated list can match."""
+        etag = compute_etag(DATA)
+        header = f'W/"0000000000000000", {etag} ,"ffffffffffffffff"'
+        not_modified = check_etag(_request(header), Response(), DATA)
+        assert not_modified is not None
+        assert not_modified.status_code == 304
+
+    def test_stale_tag_does_not_match(self):
+        """An ETag of other data lets the route answer normally."""
+        stale = compute_etag({"unique_years": [2019]})
+        response = Response()
+        assert check_etag(_request(f"{stale}, {_strong(stale)}"), response, DATA) is None
+        assert response.headers["ETag"] == compute_etag(DATA)
+
+    def test_304_carries_etag_and_no_body(self):
+        """The 304 repeats the current ETag and has an empty body."""
+        etag = compute_etag(DATA)
+        not_modified = check_etag(_request(etag), Response(), DATA)
+        assert not_modified.headers["ETag"] == etag
+        assert not_modified.body == b""
@@ -0,0 +1,63 @@
+"""
+Tests for establishment persistence in the FSA repository.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from api.repositories.fsa_repository import FSARepository
+from core.models.establishment import Establishment
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Establishment.__table__.create)
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def repo(db):
+    return FSARepository(db, cache_enabled=False)
+
+
+async def _load(db, fhrsid: int) -> Establishment:
+    db.expire_all()
+    return await db.scalar(select(Establishment).where(Establishment.fhrsid == fhrsid))
+
+
+class TestSaveEstablishmentsBulk:
+    """Test the INSERT ... ON CONFLICT upsert of establishments."""
+
+    async def test_upsert_refreshes_cached_at(self, repo, db):
+        """Re-saving a stale row updates its data and cached_at, so it is fresh again."""
+        old = datetime.utcnow() - timedelta(days=3)
+        await repo._save_establishments_bulk([{"fhrsid": 1, "business_name": "Old Name"}], old)
+        assert (await _load(db, 1)).is_stale
+
+        now = datetime.utcnow()
+        await repo._save_establishments_bulk([{"fhrsid": 1, "business_name": "New Name"}], now)
+        establishment = await _load(db, 1)
+
+        assert establishment.business_name == "New Name"
+        assert establishment.cached_at == now
+        assert establishment.updated_at == now
+        assert not establishment.is_stale
+
+    async def test_duplicate_fhrsids_keep_last(self, repo, db):
+        """One statement cannot update a row twice; the last copy wins."""
+        now = datetime.utcnow()
+        await repo._save_establishments_bulk(
+            [{"fhrsid": 2, "business_name": "First"}, {"fhrsid": 2, "business_name": "Second"}],
+            now,
+        )
+
+        assert (await _load(db, 2)).business_name == "Second"
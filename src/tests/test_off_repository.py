@@ -0,0 +1,67 @@
+"""
+Tests for product category statistics in the OFF repository.
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from api.repositories.off_repository import OFFRepository
+from core.models.product_eco import ProductEco
+
+PRODUCTS = [
+    ("1", "Dairies, Milk", "a", 90),
+    ("2", "Dairies,milk ", "b", 70),
+    ("3", "Dairies, Milk", "c", None),
+    ("4", "Dairies, Chocolate milk", "a", 80),
+    ("5", "Beverages, Milks", "d", 30),
+]
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(ProductEco.__table__.create)
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add_all(
+            ProductEco(barcode=barcode, categories=categories, ecoscore_grade=grade, ecoscore_score=score)
+            for barcode, categories, grade, score in PRODUCTS
+        )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def repo(db):
+    return OFFRepository(db, cache_enabled=False)
+
+
+class TestCategoryStatistics:
+    """Test that categories are matched exactly, not as substrings."""
+
+    async def test_exact_category(self, repo):
+        """Entries are trimmed and compared case-insensitively."""
+        stats = await repo.get_category_statistics(" MILK ")
+
+        assert stats["total_products"] == 3
+        assert stats["ecoscore_distribution"] == {"a": 1, "b": 1, "c": 1}
+        assert stats["average_ecoscore"] == 80.0
+
+    async def test_partial_category_does_not_match(self, repo):
+        """A partial name counts neither longer categories nor the name inside them."""
+        stats = await repo.get_category_statistics("choc")
+
+        assert stats["total_products"] == 0
+        assert stats["ecoscore_distribution"] == {}
+        assert stats["average_ecoscore"] is None
+
+    async def test_longer_categories_are_separate(self, repo):
+        """"chocolate milk" and "milks" are their own categories."""
+        chocolate = await repo.get_category_statistics("Chocolate milk")
+        milks = await repo.get_category_statistics("milks")
+
+        assert chocolate["total_products"] == 1
+        assert milks["total_products"] == 1
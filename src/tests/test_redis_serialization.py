@@ -0,0 +1,54 @@
+"""
+Tests for the Redis value encoding (_dumps/_loads).
+"""
+
+import zlib
+
+import orjson
+import pytest
+
+from api.database.redis_client import COMPRESS_MIN_BYTES, COMPRESSED_MARKER, _dumps, _loads
+
+SMALL = {"food_name": "apple", "energy_kcal": 52.0, "protein_g": None}
+LARGE = [{"food_name": f"food {i}", "energy_kcal": float(i), "protein_g": i / 10} for i in range(200)]
+
+
+class TestRedisSerialization:
+    """Test round trips and compatibility of cached values."""
+
+    def test_fixtures_straddle_threshold(self):
+        """SMALL serializes below the threshold, LARGE above it."""
+        assert len(orjson.dumps(SMALL)) < COMPRESS_MIN_BYTES
+        assert len(orjson.dumps(LARGE)) >= COMPRESS_MIN_BYTES
+
+    def test_small_value_round_trip(self):
+        """Values under the threshold are stored as plain JSON."""
+        raw = _dumps(SMALL)
+        assert raw == orjson.dumps(SMALL)
+        assert _loads(raw) == SMALL
+
+    def test_large_value_round_trip(self):
+        """Values over the threshold are compressed behind the marker."""
+        raw = _dumps(LARGE)
+        assert raw[:1] == COMPRESSED_MARKER
+        assert len(raw) < len(orjson.dumps(LARGE))
+        assert _loads(raw) == LARGE
+
+    def test_value_at_threshold_is_compressed(self):
+        """The threshold is inclusive."""
+        value = "x" * (COMPRESS_MIN_BYTES - 2)  # plus two quotes
+        assert len(orjson.dumps(value)) == COMPRESS_MIN_BYTES
+        raw = _dumps(value)
+        assert raw[:1] == COMPRESSED_MARKER
+        assert _loads(raw) == value
+
+    @pytest.mark.parametrize("value", [SMALL, LARGE, [], "text", 0, None])
+    def test_values_written_before_compression_still_load(self, value):
+        """Plain orjson entries (the old format) decode unchanged, whatever their size."""
+        assert _loads(orjson.dumps(value)) == value
+
+    def test_corrupt_compressed_value_raises(self):
+        """A truncated compressed payload raises zlib.error (RedisClient treats it as a miss)."""
+        raw = _dumps(LARGE)
+        with pytest.raises(zlib.error):
+            _loads(raw[:-10])
@@ -0,0 +1,121 @@
+"""
+Tests for single_flight request coalescing in the FSA service.
+"""
+
+import asyncio
+
+import pytest
+
+from api.services.fsa_service import single_flight
+
+
+class Upstream:
+    """Fake service whose lookup blocks until released; counts real calls."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.error = None
+
+    @single_flight
+    async def lookup(self, key: str, page: int = 1):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return {"key": key, "page": page, "call": self.calls}
+
+
+async def _settle():
+    """Let started callers reach their await on the shared task."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+class TestSingleFlight:
+    """Test sharing, error propagation and cleanup of in-flight calls."""
+
+    async def test_concurrent_callers_share_one_call(self):
+        """Equal arguments while in flight join the first call."""
+        upstream = Upstream()
+        callers = [
+            asyncio.create_task(upstream.lookup("SW1A")),
+            asyncio.create_task(upstream.lookup("SW1A", 1)),
+            asyncio.create_task(upstream.lookup(key="SW1A", page=1)),
+        ]
+        await _settle()
+        upstream.release.set()
+
+        results = await asyncio.gather(*callers)
+
+        assert upstream.calls == 1
+        assert results == [{"key": "SW1A", "page": 1, "call": 1}] * 3
+
+    async def test_different_arguments_are_not_shared(self):
+        """Each distinct argument tuple gets its own upstream call."""
+        upstream = Upstream()
+        callers = [
+            asyncio.create_task(upstream.lookup("SW1A")),
+            asyncio.create_task(upstream.lookup("SW1A", page=2)),
+            asyncio.create_task(upstream.lookup("EC1A")),
+        ]
+        await _settle()
+        upstream.release.set()
+
+        await asyncio.gather(*callers)
+
+        assert upstream.calls == 3
+
+    async def test_exception_reaches_every_waiter(self):
+        """All callers of a failed call see its exception."""
+        upstream = Upstream()
+        upstream.error = RuntimeError("upstream down")
+        callers = [asyncio.create_task(upstream.lookup("SW1A")) for _ in range(3)]
+        await _settle()
+        upstream.release.set()
+
+        results = await asyncio.gather(*callers, return_exceptions=True)
+
+        assert upstream.calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert {str(result) for result in results} == {"upstream down"}
+
+    async def test_entry_is_removed_after_completion(self):
+        """A call after the shared one finished goes upstream again."""
+        upstream = Upstream()
+        upstream.release.set()
+
+        first = await upstream.lookup("SW1A")
+        second = await upstream.lookup("SW1A")
+
+        assert upstream.calls == 2
+        assert (first["call"], second["call"]) == (1, 2)
+
+    async def test_entry_is_removed_after_failure(self):
+        """A failed call is not cached; the next call retries upstream."""
+        upstream = Upstream()
+        upstream.release.set()
+        upstream.error = RuntimeError("upstream down")
+
+        with pytest.raises(RuntimeError):
+            await upstream.lookup("SW1A")
+        upstream.error = None
+        result = await upstream.lookup("SW1A")
+
+        assert upstream.calls == 2
+        assert result["call"] == 2
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """The shared task is shielded from one caller's cancellation."""
+        upstream = Upstream()
+        leaving = asyncio.create_task(upstream.lookup("SW1A"))
+        staying = asyncio.create_task(upstream.lookup("SW1A"))
+        await _settle()
+
+        leaving.cancel()
+        await _settle()
+        upstream.release.set()
+
+        assert (await staying)["call"] == 1
+        assert leaving.cancelled()
+        assert upstream.calls == 1